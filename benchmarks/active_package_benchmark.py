@@ -0,0 +1,220 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Benchmarks the active package tracking over a minute of simulated time.
+
+The timers of the PySide2 stand-in run on a virtual clock, so a minute passes
+in no time. Every scenario counts the times the tracker woke up to look at
+the current graph and the context resolutions it triggered, next to the one
+second polling timer the engine used before.
+
+Usage: python benchmarks/active_package_benchmark.py [--repeat 7]
+"""
+
+import os
+import types
+import logging
+
+import harness
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+MINUTE = 60 * 1000
+
+PACKAGE_COUNT = 12
+
+
+def create_graphs():
+    """
+    Returns a graph for every package of the session.
+    """
+    from sd.api.sdpackage import SDPackage
+    from sd.api.sbs.sdsbscompgraph import SDSBSCompGraph
+
+    graphs = []
+    for index in range(PACKAGE_COUNT):
+        pck = SDPackage("/project/package_%03d.sbs" % index, index + 1)
+        graphs.append(SDSBSCompGraph("graph", pck))
+    return graphs
+
+
+def create_panels():
+    """
+    Returns a widget inside a graph view tab and one inside the properties
+    panel, like the ones that get the focus in Designer.
+    """
+    from tank.platform.qt import QtGui
+
+    window = QtGui.QWidget()
+    graph_dock = QtGui.QDockWidget(window)
+    stack = QtGui.QStackedWidget(graph_dock)
+    properties_dock = QtGui.QDockWidget(window)
+
+    graph_views = [QtGui.QWidget(QtGui.QWidget(stack)) for _ in range(PACKAGE_COUNT)]
+    properties = [QtGui.QWidget(properties_dock) for _ in range(10)]
+    return graph_views, properties
+
+
+class Counter(object):
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+
+
+def run_polling(ui_mgr, active_package_module, simulate):
+    """
+    Polls the active package every second, like the engine did before.
+    """
+    from tank.platform.qt import QtCore
+
+    stats = {"wakeups": 0, "resolutions": 0, "package": None}
+
+    def check():
+        stats["wakeups"] += 1
+        active_package = active_package_module.get_active_package_path()
+        if active_package and active_package != stats["package"]:
+            stats["package"] = active_package
+            stats["resolutions"] += 1
+
+    timer = QtCore.QTimer()
+    timer.setInterval(1000)
+    timer.timeout.connect(check)
+    timer.start()
+    QtCore.advance(1000)
+
+    stats["wakeups"] = stats["resolutions"] = 0
+    simulate(None)
+    timer.stop()
+    return stats["wakeups"], stats["resolutions"]
+
+
+def run_watcher(ui_mgr, active_package_module, simulate):
+    """
+    Runs the tracker of the engine over the simulated minute.
+    """
+    from tank.platform.qt import QtCore
+
+    engine = types.SimpleNamespace(logger=logging.getLogger("benchmark"))
+    resolutions = Counter()
+    watcher = active_package_module.ActivePackageWatcher(engine, resolutions)
+    watcher.start()
+    QtCore.advance(1000)
+
+    watcher.wakeups = resolutions.count = 0
+    simulate(watcher)
+    watcher.stop()
+    return watcher.wakeups, resolutions.count
+
+
+def main():
+    args = harness.parse_args(
+        "Benchmarks the active package tracking over a minute of simulated time."
+    )
+    harness.use_fakes()
+
+    import sd
+    from tank.platform.qt import QtCore, QtGui
+
+    active_package = harness.load_module(
+        "active_package",
+        os.path.join(
+            harness.ENGINE_ROOT, "python", "tk_substancedesigner", "active_package.py"
+        ),
+    )
+
+    qt_app = QtGui.QApplication()
+    ui_mgr = sd.getContext().getSDApplication().getQtForPythonUIMgr()
+    graphs = create_graphs()
+    graph_views, properties = create_panels()
+
+    def focus(widget):
+        qt_app.focusChanged.emit(None, widget)
+
+    def idle(watcher):
+        QtCore.advance(MINUTE)
+
+    def editing_properties(watcher):
+        # ten focus changes per second inside the properties panel
+        for index in range(600):
+            focus(properties[index % len(properties)])
+            QtCore.advance(100)
+
+    def switching_graphs(watcher):
+        # every 5 seconds a graph of another package is opened and focused,
+        # which Designer notifies as a burst
+        for index in range(PACKAGE_COUNT):
+            ui_mgr.current_graph = graphs[index]
+            for callback in list(ui_mgr.callbacks.values()):
+                callback("graph_view_%s" % index)
+            focus(graph_views[index])
+            focus(properties[0])
+            focus(graph_views[index])
+            QtCore.advance(5000)
+
+    def toggling(watcher):
+        # the automatic context switch is turned off and on every second
+        for _ in range(60):
+            if watcher:
+                watcher.stop()
+                watcher.start()
+            QtCore.advance(1000)
+
+    def no_notifications(run):
+        def run_without_notifications(ui_mgr, module, simulate):
+            callbacks = module.UI_MGR_CALLBACKS
+            QtCore.QCoreApplication._instance = None
+            module.UI_MGR_CALLBACKS = ()
+            try:
+                return run(ui_mgr, module, simulate)
+            finally:
+                module.UI_MGR_CALLBACKS = callbacks
+                QtCore.QCoreApplication._instance = qt_app
+
+        return run_without_notifications
+
+    scenarios = [
+        ("idle", run_polling, idle),
+        ("idle", run_watcher, idle),
+        ("idle, no notifications", no_notifications(run_watcher), idle),
+        ("editing properties", run_polling, editing_properties),
+        ("editing properties", run_watcher, editing_properties),
+        ("switching graphs", run_polling, switching_graphs),
+        ("switching graphs", run_watcher, switching_graphs),
+        ("toggling the switch", run_watcher, toggling),
+    ]
+
+    rows = []
+    for (name, run, simulate) in scenarios:
+        results = []
+
+        def run_minute():
+            ui_mgr.current_graph = graphs[0]
+            results.append(run(ui_mgr, active_package, simulate))
+
+        median_ms = harness.measure(run_minute, args.repeat)
+
+        (wakeups, resolutions) = results[-1]
+        tracker = "1 s polling" if run is run_polling else "watcher"
+        rows.append(("%s (%s)" % (name, tracker), median_ms, wakeups, resolutions))
+
+    harness.print_table(
+        "Tracking the active package for a minute:",
+        ["scenario", "median ms", "wakeups", "resolutions"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
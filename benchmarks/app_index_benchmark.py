@@ -0,0 +1,138 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Benchmarks finding the app of every command and the favourites of the menu,
+for engines with large commands and menu_favourites tables.
+
+Every command used to look for its app instance name going through all the
+apps of the engine, and every favourite went through all the commands,
+logging every comparison. The menu generator now indexes the apps once per
+rendering, so those are dictionary lookups. Both are timed, along with the
+documentation of every command.
+
+Usage: python benchmarks/app_index_benchmark.py [--repeat 7]
+"""
+
+import harness
+from menu_benchmark import Engine, create_menu_generator
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+# (apps, commands per app, favourites)
+TABLE_SIZES = ((20, 10, 20), (50, 10, 50), (100, 10, 100))
+
+
+def find_favourites_before(menu_generator, engine):
+    """
+    Finds the app of the commands and the favourites like the menu
+    generator did before.
+    """
+    from tk_substancedesigner.menu_generation import AppCommand
+
+    class ScanningAppCommand(AppCommand):
+        def get_app_instance_name(self):
+            if "app" not in self.properties:
+                return None
+
+            app_instance = self.properties["app"]
+            for (app_instance_name, app_instance_obj) in engine.apps.items():
+                if app_instance_obj == app_instance:
+                    return app_instance_name
+
+            return None
+
+    menu_items = []
+    for (cmd_name, cmd_details) in engine.commands.items():
+        engine.log_debug("engine command: %s : %s" % (cmd_name, cmd_details))
+        menu_items.append(
+            ScanningAppCommand(cmd_name, menu_generator, cmd_details, engine.logger)
+        )
+    menu_items.sort(key=lambda x: x.name)
+
+    favourites = []
+    for fav in engine.get_setting("menu_favourites"):
+        for cmd in menu_items:
+            engine.log_debug("cmd: %s" % cmd.name)
+            if (
+                cmd.get_app_instance_name() == fav["app_instance"]
+                and cmd.name == fav["name"]
+            ):
+                favourites.append(cmd)
+
+    for cmd in menu_items:
+        cmd.properties["app"].documentation_url
+
+    return favourites
+
+
+def find_favourites(menu_generator, engine):
+    """
+    Finds the app of the commands and the favourites through the index of
+    the menu generator.
+    """
+    menu_items = menu_generator._get_menu_items()
+
+    commands_by_instance = dict(
+        ((cmd.get_app_instance_name(), cmd.name), cmd) for cmd in menu_items
+    )
+    favourites = []
+    for fav in engine.get_setting("menu_favourites"):
+        cmd = commands_by_instance.get((fav["app_instance"], fav["name"]))
+        if cmd:
+            favourites.append(cmd)
+
+    for cmd in menu_items:
+        cmd.get_documentation_url_str()
+
+    return favourites
+
+
+def main():
+    args = harness.parse_args(
+        "Benchmarks finding the apps of the commands and the menu favourites."
+    )
+    harness.use_fakes()
+
+    rows = []
+    for (app_count, commands_per_app, favourite_count) in TABLE_SIZES:
+        engine = Engine(app_count, commands_per_app, favourite_count)
+        menu_generator = create_menu_generator(engine)
+
+        # both ways must find the same favourites
+        assert len(find_favourites_before(menu_generator, engine)) == len(
+            find_favourites(menu_generator, engine)
+        )
+
+        rows.append(
+            (
+                "%s apps, %s commands, %s favourites"
+                % (app_count, len(engine.commands), favourite_count),
+                harness.measure(
+                    lambda: find_favourites_before(menu_generator, engine),
+                    args.repeat,
+                ),
+                harness.measure(
+                    lambda: find_favourites(menu_generator, engine), args.repeat
+                ),
+            )
+        )
+
+    harness.print_table(
+        "Finding the apps of the commands and the favourites:",
+        ["tables", "scan ms", "index ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
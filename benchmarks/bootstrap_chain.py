@@ -0,0 +1,132 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Runs one step of the engine bootstrap chain against the stand-ins found in
+the fakes folder, and prints how long its import and execution took as JSON.
+
+Meant to be run in a fresh interpreter by run_benchmarks.py, with
+python -X importtime. The imports made by the step are written to stderr
+between the IMPORTS_START and IMPORTS_END markers.
+
+Usage: python -X importtime bootstrap_chain.py <benchmark>
+"""
+
+import os
+import sys
+import time
+import importlib.util
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+BENCHMARKS_ROOT = os.path.dirname(os.path.abspath(__file__))
+ENGINE_ROOT = os.path.dirname(BENCHMARKS_ROOT)
+FAKES_ROOT = os.path.join(BENCHMARKS_ROOT, "fakes")
+PLUGIN_ROOT = os.path.join(ENGINE_ROOT, "resources", "plugins", "shotgun_bridge")
+
+IMPORTS_START = "--- bootstrap chain imports start ---"
+IMPORTS_END = "--- bootstrap chain imports end ---"
+
+
+def mark(marker):
+    # -X importtime writes straight to the stderr file descriptor
+    sys.stderr.flush()
+    os.write(2, (marker + "\n").encode("ascii"))
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def benchmark_shotgun_bridge():
+    """
+    Imports the plugin and lets Designer initialize it, which loads the
+    engine startup script and starts the fake engine.
+    """
+    start = time.perf_counter()
+    import shotgun_bridge
+
+    imported = time.perf_counter()
+    shotgun_bridge.initializeSDPlugin()
+    return imported - start, time.perf_counter() - imported
+
+
+def benchmark_startup_init():
+    """
+    Imports the engine startup script and starts the fake engine.
+    """
+    start = time.perf_counter()
+    engine_startup = load_module(
+        "sgtk_substancedesigner_engine_startup",
+        os.path.join(ENGINE_ROOT, "startup", "init.py"),
+    )
+    imported = time.perf_counter()
+    engine_startup.start_toolkit()
+    return imported - start, time.perf_counter() - imported
+
+
+def benchmark_engine():
+    """
+    Imports the engine module, like toolkit does before creating the engine.
+    """
+    start = time.perf_counter()
+    load_module("tk_substancedesigner_engine", os.path.join(ENGINE_ROOT, "engine.py"))
+    return time.perf_counter() - start, 0.0
+
+
+BENCHMARKS = {
+    "shotgun_bridge": benchmark_shotgun_bridge,
+    "startup_init": benchmark_startup_init,
+    "engine": benchmark_engine,
+}
+
+
+def main(name):
+    sys.path[:0] = [FAKES_ROOT, PLUGIN_ROOT]
+
+    # the environment set up by the launcher
+    os.environ.update(
+        {
+            "SGTK_SUBSTANCEDESIGNER_SGTK_MODULE_PATH": FAKES_ROOT,
+            "SGTK_SUBSTANCEDESIGNER_ENGINE_STARTUP": os.path.join(
+                ENGINE_ROOT, "startup", "init.py"
+            ),
+            "SGTK_ENGINE": "tk-substancedesigner",
+            "SGTK_CONTEXT": "{}",
+        }
+    )
+    for variable in (
+        "SGTK_SUBSTANCEDESIGNER_TRACE",
+        "SGTK_SUBSTANCEDESIGNER_LAZY_STARTUP",
+        "SGTK_FILE_TO_OPEN",
+    ):
+        os.environ.pop(variable, None)
+
+    mark(IMPORTS_START)
+    import_time, execution_time = BENCHMARKS[name]()
+    mark(IMPORTS_END)
+
+    import json
+
+    print(
+        json.dumps(
+            {"import_ms": import_time * 1000.0, "execution_ms": execution_time * 1000.0}
+        )
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
@@ -0,0 +1,196 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Benchmarks the publish collector against a session of 50 packages of 500
+resources each, built with the sd stand-ins.
+
+The first collect walks every package. The next ones reuse the graphs found
+in the packages that did not change, depending on what tells the collector
+so: the dirty state of saved packages, the number of resources of packages
+with unsaved edits, or of packages on Designer versions without a dirty
+state. The calls made into the sd API are counted, since in Designer they
+are the expensive part, along with how many packages were reused.
+
+Usage: python benchmarks/collector_benchmark.py [--repeat 7]
+"""
+
+import os
+import types
+import shutil
+import tempfile
+
+import harness
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+PACKAGE_COUNT = 50
+RESOURCE_COUNT = 500
+
+# the rest of the resources are not graphs, ie. bitmaps or functions
+COMP_GRAPH_COUNT = 400
+MDL_GRAPH_COUNT = 50
+
+
+class Setting(object):
+    def __init__(self, value):
+        self.value = value
+
+
+class Item(object):
+    """
+    Stand-in for the items of the publisher.
+    """
+
+    def __init__(self, item_type, display_type, name):
+        self.type = item_type
+        self.name = name
+        self.properties = {}
+        self.children = []
+
+    def create_item(self, item_type, display_type, name):
+        item = Item(item_type, display_type, name)
+        self.children.append(item)
+        return item
+
+    def set_icon_from_path(self, path):
+        pass
+
+
+class Publisher(object):
+    """
+    Stand-in for the publisher app, as seen by the collector hook.
+    """
+
+    def __init__(self):
+        self.engine = types.SimpleNamespace(get_template_by_name=lambda name: None)
+        self.util = types.SimpleNamespace(
+            get_file_path_components=lambda path: {"filename": os.path.basename(path)}
+        )
+
+
+def create_session(folder):
+    """
+    Creates the packages of the session, with a file for each of them.
+    """
+    import sd
+    from sd.api.sdpackage import SDPackage
+    from sd.api.sdresource import SDResource
+    from sd.api.sbs.sdsbscompgraph import SDSBSCompGraph
+    from sd.api.mdl.sdmdlgraph import SDMDLGraph
+
+    packages = []
+    for pck_index in range(PACKAGE_COUNT):
+        path = os.path.join(folder, "package_%03d.sbs" % pck_index)
+        with open(path, "w") as pck_file:
+            pck_file.write("package")
+
+        pck = SDPackage(path, pck_index + 1)
+        for index in range(RESOURCE_COUNT):
+            identifier = "resource_%03d" % index
+            if index < COMP_GRAPH_COUNT:
+                resource = SDSBSCompGraph(identifier, pck, output_count=index % 4)
+            elif index < COMP_GRAPH_COUNT + MDL_GRAPH_COUNT:
+                resource = SDMDLGraph(identifier, pck)
+            else:
+                resource = SDResource(identifier, pck)
+            pck.resources.append(resource)
+        packages.append(pck)
+
+    sd.getContext().getSDApplication().getPackageMgr().user_packages = packages
+    return packages
+
+
+def main():
+    args = harness.parse_args(
+        "Benchmarks the publish collector against %s packages of %s resources."
+        % (PACKAGE_COUNT, RESOURCE_COUNT)
+    )
+    harness.use_fakes()
+
+    import sd
+
+    # the engine keeps the state shared by the hooks here
+    sd.shotgun = types.SimpleNamespace()
+
+    collector_module = harness.load_module(
+        "collector",
+        os.path.join(harness.HOOKS_ROOT, "tk-multi-publish2", "basic", "collector.py"),
+    )
+    collector = collector_module.SubstanceDesignerSessionCollector(Publisher())
+    settings = {"Collection Mode": Setting(collector_module.ALL_PACKAGES)}
+
+    folder = tempfile.mkdtemp(prefix="sgtk_collector_benchmark_")
+    try:
+        packages = create_session(folder)
+
+        def collect():
+            collector.collect_current_substancedesigner_session(
+                settings, Item("root", "Root", "root")
+            )
+
+        def clear_cache():
+            sd.shotgun.collector_package_cache = {}
+
+        def set_modified(modified):
+            for pck in packages:
+                pck.modified = modified
+
+        def save_one_package():
+            stat = os.stat(packages[0].getFilePath())
+            os.utime(packages[0].getFilePath(), (stat.st_atime, stat.st_mtime + 1))
+
+        scenarios = [
+            ("first collect", False, clear_cache),
+            ("saved packages", False, None),
+            ("unsaved edits", True, None),
+            ("no isModified", None, None),
+            ("one package saved", False, save_one_package),
+        ]
+
+        rows = []
+        for (name, modified, setup) in scenarios:
+            set_modified(modified)
+
+            # the cache is filled for the state of the packages first
+            collect()
+            median_ms = harness.measure(collect, args.repeat, setup)
+
+            # one more collect to count its calls and reused packages
+            if setup:
+                setup()
+            cache = dict(
+                (path, entry["resource_index"])
+                for (path, entry) in sd.shotgun.collector_package_cache.items()
+            )
+            sd.api.reset_calls()
+            collect()
+            api_calls = sd.api.api_calls
+            reused = sum(
+                1
+                for (path, entry) in sd.shotgun.collector_package_cache.items()
+                if cache.get(path) is entry["resource_index"]
+            )
+
+            rows.append((name, median_ms, api_calls, "%s/%s" % (reused, PACKAGE_COUNT)))
+
+        harness.print_table(
+            "Collecting %s packages of %s resources:" % (PACKAGE_COUNT, RESOURCE_COUNT),
+            ["scenario", "median ms", "sd calls", "reused"],
+            rows,
+        )
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Measures how long the main thread, the one running the Designer UI, is
+blocked when the active package changes and its context is resolved.
+
+The toolkit stand-in takes LOOKUP_DELAY seconds for each of sgtk_from_path
+and context_from_path, like the queries they make to the Shotgun site. The
+context is resolved in the main thread, as refresh_engine does unless the
+async_context_resolution setting is on, or in a worker thread, with only the
+result delivered to the main thread. A burst of switches stands in for the artist
+going through a few packages before the first one is resolved.
+
+Usage: python benchmarks/context_resolver_benchmark.py [--repeat 7]
+"""
+
+import time
+import logging
+
+import harness
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+LOOKUP_DELAY = 0.02
+
+BURST_SIZE = 5
+
+
+def get_package_paths(count):
+    return [
+        "/projects/rock/assets/Rock%03d/texture/work/rock_%03d.sbs" % (index, index)
+        for index in range(count)
+    ]
+
+
+def switch_in_main_thread(resolver, paths):
+    """
+    Resolves the context of every package in turn, in the main thread.
+
+    :returns: (time blocked, longest block, contexts applied)
+    """
+    blocks = []
+    for path in paths:
+        start = time.perf_counter()
+        resolver.resolve(path)
+        blocks.append(time.perf_counter() - start)
+
+    return sum(blocks), max(blocks), len(paths)
+
+
+def switch_in_worker_thread(async_resolver, paths):
+    """
+    Requests the context of every package in turn, then runs the event loop
+    of the main thread until the last one is applied.
+
+    :returns: (time blocked, longest block, contexts applied)
+    """
+    from tank.platform.qt import QtCore
+
+    applied = []
+    blocks = []
+    for path in paths:
+        start = time.perf_counter()
+        async_resolver.resolve(path, None, lambda tk, ctx, error: applied.append(ctx))
+        blocks.append(time.perf_counter() - start)
+
+    while not applied or async_resolver._worker is not None:
+        start = time.perf_counter()
+        QtCore.QCoreApplication.processEvents()
+        blocks.append(time.perf_counter() - start)
+
+        # the event loop waits for events without blocking the UI
+        time.sleep(0.001)
+
+    return sum(blocks), max(blocks), len(applied)
+
+
+def main():
+    args = harness.parse_args(
+        "Measures the time the UI is blocked while resolving contexts."
+    )
+    harness.use_fakes()
+
+    import tank
+
+    context_resolver = harness.import_engine_module("context_resolver")
+    logger = logging.getLogger("benchmark")
+
+    tank.api.lookup_delay = LOOKUP_DELAY
+
+    def run(async_mode, paths, cached):
+        resolver = context_resolver.ContextResolver(logger)
+        if cached:
+            for path in paths:
+                resolver.resolve(path)
+
+        if async_mode:
+            async_resolver = context_resolver.AsyncContextResolver(resolver, logger)
+            return switch_in_worker_thread(async_resolver, paths)
+        return switch_in_main_thread(resolver, paths)
+
+    rows = []
+    for (name, paths, cached) in (
+        ("one switch", get_package_paths(1), False),
+        ("one switch, cached", get_package_paths(1), True),
+        ("burst of %s switches" % BURST_SIZE, get_package_paths(BURST_SIZE), False),
+    ):
+        for async_mode in (False, True):
+            results = [run(async_mode, paths, cached) for _ in range(args.repeat)]
+            rows.append(
+                (
+                    "%s (%s)" % (name, "worker" if async_mode else "main thread"),
+                    harness.median([result[0] for result in results]) * 1000.0,
+                    harness.median([result[1] for result in results]) * 1000.0,
+                    results[-1][2],
+                )
+            )
+
+    harness.print_table(
+        "Resolving contexts, %s ms per toolkit lookup:" % int(LOOKUP_DELAY * 1000),
+        ["scenario", "blocked ms", "longest ms", "applied"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
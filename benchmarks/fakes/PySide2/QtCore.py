@@ -0,0 +1,211 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for PySide2.QtCore.
+"""
+
+import threading
+import collections
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+class Qt(object):
+    QueuedConnection = 2
+    NoButton = 0
+
+
+class QEvent(object):
+    ChildAdded = 68
+    Show = 17
+    LayoutRequest = 76
+
+    def __init__(self, event_type):
+        self._type = event_type
+
+    def type(self):
+        return self._type
+
+
+class _BoundSignal(object):
+    """
+    Queued connections are delivered by QCoreApplication.processEvents, in
+    the thread calling it, so slots can be called back in the main thread.
+    """
+
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot, connection_type=None):
+        self._slots.append((slot, connection_type))
+
+    def disconnect(self, slot=None):
+        self._slots = [
+            (connected_slot, connection_type)
+            for (connected_slot, connection_type) in self._slots
+            if slot is not None and connected_slot != slot
+        ]
+
+    def emit(self, *args):
+        for (slot, connection_type) in list(self._slots):
+            if connection_type == Qt.QueuedConnection:
+                _posted_events.append((slot, args))
+            else:
+                slot(*args)
+
+
+# slots of queued connections waiting to be called, appended from any thread
+_posted_events = collections.deque()
+
+
+class Signal(object):
+    def __init__(self, *types):
+        self._name = "_signal_%s" % id(self)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.__dict__.setdefault(self._name, _BoundSignal())
+
+
+class QObject(object):
+    destroyed = Signal()
+
+    def __init__(self, parent=None):
+        self._parent = parent
+        self._children = []
+        self._object_name = ""
+        if parent is not None:
+            parent._children.append(self)
+
+    def parent(self):
+        return self._parent
+
+    def children(self):
+        return list(self._children)
+
+    def objectName(self):
+        return self._object_name
+
+    def setObjectName(self, name):
+        self._object_name = name
+
+    def findChild(self, object_type, name=""):
+        for child in self._children:
+            if isinstance(child, object_type) and (
+                not name or child._object_name == name
+            ):
+                return child
+            found = child.findChild(object_type, name)
+            if found is not None:
+                return found
+        return None
+
+
+class QTimer(QObject):
+    """
+    Timers run on a virtual clock, only moved forward by advance(), so the
+    benchmarks can simulate idle time without waiting for it.
+    """
+
+    timeout = Signal()
+
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        self._interval = 0
+        self._single_shot = False
+        self._active = False
+        self._due = None
+
+    def setInterval(self, interval):
+        self._interval = interval
+
+    def setSingleShot(self, single_shot):
+        self._single_shot = single_shot
+
+    def start(self, interval=None):
+        if interval is not None:
+            self._interval = interval
+        self._active = True
+        self._due = _clock.now + self._interval
+        if self not in _clock.timers:
+            _clock.timers.append(self)
+
+    def stop(self):
+        self._active = False
+        if self in _clock.timers:
+            _clock.timers.remove(self)
+
+    def isActive(self):
+        return self._active
+
+    def _fire(self):
+        if self._single_shot:
+            self.stop()
+        else:
+            self._due = _clock.now + max(self._interval, 1)
+        self.timeout.emit()
+
+    @staticmethod
+    def singleShot(interval, callback):
+        timer = QTimer()
+        timer.setSingleShot(True)
+        timer.timeout.connect(callback)
+        timer.start(interval)
+
+
+class _Clock(object):
+    def __init__(self):
+        self.now = 0
+        self.timers = []
+
+
+_clock = _Clock()
+
+
+def advance(msecs):
+    """
+    Not part of Qt: moves the virtual clock msecs milliseconds forward, firing
+    the timers that are due on the way, in order.
+    """
+    end = _clock.now + msecs
+    while _clock.timers:
+        timer = min(_clock.timers, key=lambda timer: timer._due)
+        if timer._due > end:
+            break
+        _clock.now = max(_clock.now, timer._due)
+        timer._fire()
+    _clock.now = end
+
+
+class QThread(QObject):
+    @classmethod
+    def currentThread(cls):
+        return threading.current_thread()
+
+
+class QCoreApplication(QObject):
+    _instance = None
+
+    def __init__(self, *args):
+        QObject.__init__(self)
+        QCoreApplication._instance = self
+
+    @staticmethod
+    def instance():
+        return QCoreApplication._instance
+
+    @staticmethod
+    def processEvents():
+        while _posted_events:
+            (slot, args) = _posted_events.popleft()
+            slot(*args)
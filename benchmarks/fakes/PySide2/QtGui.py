@@ -0,0 +1,32 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for PySide2.QtGui.
+"""
+
+from .QtCore import QObject
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+class QIcon(object):
+    def __init__(self, *args):
+        pass
+
+
+class QImage(object):
+    def __init__(self, *args):
+        pass
+
+
+class QPixmap(QObject):
+    pass
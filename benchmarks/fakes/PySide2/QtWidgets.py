@@ -0,0 +1,157 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for PySide2.QtWidgets.
+"""
+
+import weakref
+
+from .QtCore import QObject, QCoreApplication, Signal
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+class QApplication(QCoreApplication):
+    focusChanged = Signal(object, object)
+
+    # in creation order, so the last widgets created are found last
+    _widgets = weakref.WeakValueDictionary()
+
+    @staticmethod
+    def allWidgets():
+        return list(QApplication._widgets.values())
+
+
+class QWidget(QObject):
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        QApplication._widgets[id(self)] = self
+
+    def parentWidget(self):
+        return self.parent()
+
+
+class QDockWidget(QWidget):
+    pass
+
+
+class QStackedWidget(QWidget):
+    pass
+
+
+class QAction(QObject):
+    triggered = Signal(bool)
+
+    def __init__(self, *args):
+        (text, parent) = args if len(args) == 2 else ("", args[0] if args else None)
+        QObject.__init__(self, parent)
+        self._text = text
+        self._menu = None
+        self._separator = False
+        self._checkable = False
+        self._checked = False
+        self._enabled = True
+        self._tooltip = ""
+
+    def text(self):
+        return self._text
+
+    def setText(self, text):
+        self._text = text
+
+    def menu(self):
+        return self._menu
+
+    def isSeparator(self):
+        return self._separator
+
+    def setSeparator(self, separator):
+        self._separator = separator
+
+    def setToolTip(self, tooltip):
+        self._tooltip = tooltip
+
+    def setStatusTip(self, tooltip):
+        pass
+
+    def setCheckable(self, checkable):
+        self._checkable = checkable
+
+    def setChecked(self, checked):
+        self._checked = checked
+
+    def isChecked(self):
+        return self._checked
+
+    def setEnabled(self, enabled):
+        self._enabled = enabled
+
+    def isEnabled(self):
+        return self._enabled
+
+
+class QMenu(QWidget):
+    """
+    Clearing a menu also forgets its sub menus, so menus rebuilt over and
+    over do not pile up.
+    """
+
+    aboutToShow = Signal()
+
+    def __init__(self, title="", parent=None):
+        QWidget.__init__(self, parent)
+        self._actions = []
+        self._menu_action = QAction(title, self)
+        self._menu_action._menu = self
+
+    def title(self):
+        return self._menu_action.text()
+
+    def setTitle(self, title):
+        self._menu_action.setText(title)
+
+    def menuAction(self):
+        return self._menu_action
+
+    def actions(self):
+        return list(self._actions)
+
+    def isEmpty(self):
+        return not self._actions
+
+    def addAction(self, action):
+        if not isinstance(action, QAction):
+            action = QAction(action, self)
+        self._actions.append(action)
+        return action
+
+    def addMenu(self, menu):
+        if not isinstance(menu, QMenu):
+            menu = QMenu(menu, self)
+        self._actions.append(menu.menuAction())
+        return menu
+
+    def insertMenu(self, before, menu):
+        self._actions.insert(self._actions.index(before), menu.menuAction())
+        return menu.menuAction()
+
+    def clear(self):
+        del self._actions[:]
+        self._children = [
+            child
+            for child in self._children
+            if not isinstance(child, (QAction, QMenu)) or child is self._menu_action
+        ]
+
+
+class QMessageBox(QWidget):
+    pass
@@ -0,0 +1,82 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for the Substance Designer python API, with just enough of it for
+the engine bootstrap to run outside of the application.
+"""
+
+from . import logger, api
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+class _UIMgr(object):
+    def __init__(self):
+        self.current_graph = None
+        self.menus = {}
+        self.callbacks = {}
+        self._next_callback_id = 1
+
+    def getCurrentGraph(self):
+        api.count_call()
+        return self.current_graph
+
+    def getMainWindow(self):
+        return None
+
+    def findMenuFromObjectName(self, object_name):
+        return self.menus.get(object_name)
+
+    def registerGraphViewCreatedCallback(self, callback):
+        return self._register_callback(callback)
+
+    def registerExplorerSelectionChangedCallback(self, callback):
+        return self._register_callback(callback)
+
+    def unregisterCallback(self, callback_id):
+        del self.callbacks[callback_id]
+
+    def _register_callback(self, callback):
+        callback_id = self._next_callback_id
+        self._next_callback_id += 1
+        self.callbacks[callback_id] = callback
+        return callback_id
+
+
+class _Application(object):
+    def __init__(self):
+        self._ui_mgr = _UIMgr()
+        self._package_mgr = api.sdpackagemgr.SDPackageMgr()
+
+    def getQtForPythonUIMgr(self):
+        return self._ui_mgr
+
+    def getPackageMgr(self):
+        return self._package_mgr
+
+
+class _Context(object):
+    def __init__(self):
+        self._application = _Application()
+
+    def getSDApplication(self):
+        return self._application
+
+    def createRuntimeLogHandler(self):
+        return logger.SDRuntimeLogHandler()
+
+
+_context = _Context()
+
+
+def getContext():
+    return _context
@@ -0,0 +1,34 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for sd.api. Calling into the API of Designer crosses into C++,
+which is what makes walking packages slow, so every call made to the
+stand-ins is counted in api_calls.
+"""
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+api_calls = 0
+
+
+def count_call():
+    global api_calls
+    api_calls += 1
+
+
+def reset_calls():
+    global api_calls
+    api_calls = 0
+
+
+from . import sdarray, sdresource, sdpackage, sdpackagemgr, sbs, mdl
@@ -0,0 +1,30 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for sd.api.mdl.sdmdlgraph.
+"""
+
+from .. import count_call
+from ..sdarray import SDArray
+from ..sdresource import SDResource
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+class SDMDLGraph(SDResource):
+    def __init__(self, identifier, package=None, output_count=1):
+        SDResource.__init__(self, identifier, package)
+        self.output_nodes = [object() for _ in range(output_count)]
+
+    def getOutputNodes(self):
+        count_call()
+        return SDArray(self.output_nodes)
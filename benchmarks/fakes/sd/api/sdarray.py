@@ -0,0 +1,45 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for sd.api.sdarray.
+"""
+
+from . import count_call
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+class SDArray(object):
+    """
+    The items are only wrapped, and counted, as they are read.
+    """
+
+    def __init__(self, items):
+        self._items = list(items)
+
+    def getSize(self):
+        count_call()
+        return len(self._items)
+
+    def getItem(self, index):
+        count_call()
+        return self._items[index]
+
+    def __len__(self):
+        return self.getSize()
+
+    def __getitem__(self, index):
+        return self.getItem(index)
+
+    def __iter__(self):
+        for index in range(len(self._items)):
+            yield self.getItem(index)
@@ -0,0 +1,49 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for sd.api.sdpackage.
+"""
+
+from . import count_call
+from .sdarray import SDArray
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+class SDPackage(object):
+    """
+    A package whose resources are all at its root. Setting modified to None
+    removes isModified, like on the versions of Designer that lack it.
+    """
+
+    def __init__(self, file_path, handle, resources=(), modified=False):
+        self.mHandle = handle
+        self.resources = list(resources)
+        self._file_path = file_path
+        self.modified = modified
+
+    def __getattr__(self, name):
+        if name == "isModified" and self.modified is not None:
+            return self._is_modified
+        raise AttributeError(name)
+
+    def _is_modified(self):
+        count_call()
+        return self.modified
+
+    def getFilePath(self):
+        count_call()
+        return self._file_path
+
+    def getChildrenResources(self, is_recursive):
+        count_call()
+        return SDArray(self.resources)
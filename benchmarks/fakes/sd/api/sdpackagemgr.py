@@ -0,0 +1,28 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for sd.api.sdpackagemgr.
+"""
+
+from . import count_call
+from .sdarray import SDArray
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+class SDPackageMgr(object):
+    def __init__(self):
+        self.user_packages = []
+
+    def getUserPackages(self):
+        count_call()
+        return SDArray(self.user_packages)
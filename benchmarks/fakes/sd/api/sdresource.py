@@ -0,0 +1,32 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for sd.api.sdresource.
+"""
+
+from . import count_call
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+class SDResource(object):
+    def __init__(self, identifier, package=None):
+        self._identifier = identifier
+        self._package = package
+
+    def getIdentifier(self):
+        count_call()
+        return self._identifier
+
+    def getPackage(self):
+        count_call()
+        return self._package
@@ -0,0 +1,26 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for the sgtk alias of toolkit.
+"""
+
+import sys
+
+import tank
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+# like toolkit does, sgtk and its modules are the tank ones
+for (name, module) in list(sys.modules.items()):
+    if name == "tank" or name.startswith("tank."):
+        sys.modules["sgtk" + name[len("tank") :]] = module
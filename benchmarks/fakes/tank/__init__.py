@@ -0,0 +1,23 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for toolkit, with just enough of it for the engine bootstrap to run
+outside of a toolkit environment.
+"""
+
+from . import log, util, context, platform, api, pipelineconfig_utils
+from .api import sgtk_from_path
+from .log import LogManager
+from .errors import TankError
+from .hook import Hook, get_hook_baseclass
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
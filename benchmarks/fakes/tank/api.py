@@ -0,0 +1,49 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for tank.api. The lookups take lookup_delay seconds, standing in
+for the queries toolkit makes to the Shotgun site.
+"""
+
+import os
+import time
+
+from .context import Context
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+lookup_delay = 0.0
+
+
+class PipelineConfiguration(object):
+    def __init__(self, config_location):
+        self._config_location = config_location
+
+    def get_config_location(self):
+        return self._config_location
+
+
+class Sgtk(object):
+    def __init__(self, project_root):
+        self.pipeline_configuration = PipelineConfiguration(
+            os.path.join(project_root, "config")
+        )
+
+    def context_from_path(self, path, previous_context=None):
+        time.sleep(lookup_delay)
+        return Context(os.path.dirname(path))
+
+
+def sgtk_from_path(path):
+    time.sleep(lookup_delay)
+    return Sgtk(os.path.dirname(os.path.dirname(path)))
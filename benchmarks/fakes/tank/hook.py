@@ -0,0 +1,35 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for tank.hook. The hooks of the engine are loaded on top of the
+hooks of the apps, so the base class given to them is a bare hook whose
+settings are empty.
+"""
+
+import logging
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+class Hook(object):
+    def __init__(self, parent, disk_location=""):
+        self.parent = parent
+        self.disk_location = disk_location
+        self.logger = logging.getLogger("sgtk.hook")
+
+    @property
+    def settings(self):
+        return {}
+
+
+def get_hook_baseclass():
+    return Hook
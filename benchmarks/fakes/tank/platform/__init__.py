@@ -0,0 +1,45 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for tank.platform. start_engine creates a fake engine that does
+nothing, so only the cost of the bootstrap itself is measured.
+"""
+
+from . import framework, qt
+from .software_launcher import (
+    SoftwareLauncher,
+    SoftwareVersion,
+    LaunchInformation,
+)
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+_current_engine = None
+
+
+class Engine(object):
+    def __init__(self, tk, context, engine_instance_name, env=None):
+        self.tk = tk
+        self.context = context
+        self.name = engine_instance_name
+
+
+def current_engine():
+    return _current_engine
+
+
+def start_engine(engine_name, tk, context):
+    global _current_engine
+
+    _current_engine = Engine(tk, context, engine_name)
+    return _current_engine
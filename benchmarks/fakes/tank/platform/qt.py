@@ -0,0 +1,26 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for tank.platform.qt, backed by the PySide2 stand-in.
+"""
+
+import types
+
+from PySide2 import QtCore, QtGui as _QtGui, QtWidgets
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+# like toolkit, QtGui also holds the widgets, as it did in Qt4
+QtGui = types.ModuleType("QtGui")
+QtGui.__dict__.update(vars(_QtGui))
+QtGui.__dict__.update(vars(QtWidgets))
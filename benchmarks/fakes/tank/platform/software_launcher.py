@@ -0,0 +1,73 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for tank.platform.software_launcher.
+"""
+
+import os
+import re
+import glob
+import inspect
+import logging
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+class SoftwareVersion(object):
+    def __init__(self, version, product, path, icon=None, args=None):
+        self.version = version
+        self.product = product
+        self.path = path
+        self.icon = icon
+        self.args = args or []
+
+
+class LaunchInformation(object):
+    def __init__(self, path=None, args=None, environ=None):
+        self.path = path
+        self.args = args or ""
+        self.environment = environ or {}
+
+
+class SoftwareLauncher(object):
+    def __init__(self, tk, context, engine_name, env_name):
+        self.tk = tk
+        self.context = context
+        self.engine_name = engine_name
+        self.logger = logging.getLogger("sgtk.%s" % engine_name)
+
+    @property
+    def disk_location(self):
+        # the folder of the engine, where its startup.py is
+        return os.path.dirname(os.path.abspath(inspect.getfile(type(self))))
+
+    def _glob_and_match(self, match_template, template_key_expressions):
+        """
+        Globs the paths matching a template, with its keys as wildcards, and
+        returns them along with the values of the keys, like toolkit does.
+        """
+        glob_pattern = re.sub(r"\{[^}]*\}", "*", match_template)
+
+        regex_pattern = ""
+        for (index, part) in enumerate(re.split(r"\{([^}]*)\}", match_template)):
+            if index % 2:
+                regex_pattern += "(?P<%s>%s)" % (part, template_key_expressions[part])
+            else:
+                regex_pattern += re.escape(part)
+
+        matches = []
+        for matching_path in glob.glob(glob_pattern):
+            match = re.match(regex_pattern + "$", matching_path, re.IGNORECASE)
+            if match:
+                matches.append((matching_path, match.groupdict()))
+
+        return matches
@@ -0,0 +1,33 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for tank.util.
+"""
+
+import sys
+
+from . import filesystem
+from .local_file_storage import LocalFileStorageManager
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+def is_windows():
+    return sys.platform == "win32"
+
+
+def is_macos():
+    return sys.platform == "darwin"
+
+
+def is_linux():
+    return sys.platform.startswith("linux")
@@ -0,0 +1,28 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for tank.util.filesystem.
+"""
+
+import os
+import re
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+def ensure_folder_exists(path, permissions=0o775, create_placeholder_file=False):
+    if not os.path.exists(path):
+        os.makedirs(path, permissions)
+
+
+def create_valid_filename(value):
+    return re.sub(r"[^\w\-\.]", "_", value)
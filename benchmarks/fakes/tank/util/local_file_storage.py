@@ -0,0 +1,32 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for tank.util.local_file_storage. The global folders are created
+under root, which the benchmarks point to a temporary folder.
+"""
+
+import os
+import tempfile
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+class LocalFileStorageManager(object):
+    CACHE = "cache"
+    PERSISTENT = "persistent"
+    LOGGING = "logging"
+
+    root = os.path.join(tempfile.gettempdir(), "sgtk_benchmarks")
+
+    @classmethod
+    def get_global_root(cls, root_type):
+        return os.path.join(cls.root, root_type)
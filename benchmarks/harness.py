@@ -0,0 +1,137 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Helpers shared by the benchmarks of the engine components.
+
+The component benchmarks run the engine code against the stand-ins of sd,
+PySide2 and toolkit found in the fakes folder, like the bootstrap ones, and
+print their results. They are meant to compare two versions of the code on
+the same machine, so nothing is stored or compared against a baseline.
+"""
+
+import os
+import sys
+import time
+import types
+import argparse
+import importlib
+import importlib.util
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+BENCHMARKS_ROOT = os.path.dirname(os.path.abspath(__file__))
+ENGINE_ROOT = os.path.dirname(BENCHMARKS_ROOT)
+FAKES_ROOT = os.path.join(BENCHMARKS_ROOT, "fakes")
+HOOKS_ROOT = os.path.join(ENGINE_ROOT, "hooks")
+
+
+def use_fakes():
+    """
+    Makes the stand-ins and the engine python modules importable.
+    """
+    for path in (os.path.join(ENGINE_ROOT, "python"), FAKES_ROOT):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    # toolkit aliases its modules as sgtk
+    import sgtk  # noqa: F401
+
+
+def load_module(name, path):
+    """
+    Imports a python file that is not in a package, like the hooks.
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def import_engine_module(name):
+    """
+    Imports a module of the tk_substancedesigner package of the engine
+    without running the package __init__, which imports every other module.
+    """
+    if "tk_substancedesigner" not in sys.modules:
+        package = types.ModuleType("tk_substancedesigner")
+        package.__path__ = [os.path.join(ENGINE_ROOT, "python", "tk_substancedesigner")]
+        sys.modules["tk_substancedesigner"] = package
+
+    return importlib.import_module("tk_substancedesigner.%s" % name)
+
+
+def parse_args(description, argv=None):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--repeat", type=int, default=7, help="Runs of every benchmark (default 7)."
+    )
+    return parser.parse_args(argv)
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def measure(func, repeat, setup=None):
+    """
+    Calls func repeat times, calling setup before every call if given, and
+    returns the median time of a call in milliseconds.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000.0)
+
+    return median(times)
+
+
+def print_table(title, headers, rows):
+    """
+    Prints rows of values under their headers, the first column being the
+    name of the row.
+    """
+    widths = [
+        max(len(str(value)) for value in column)
+        for column in zip(headers, *[[_format(v) for v in row] for row in rows])
+    ]
+
+    print("\n%s" % title)
+    print(
+        "  ".join(
+            header.ljust(width) if index == 0 else header.rjust(width)
+            for (index, (header, width)) in enumerate(zip(headers, widths))
+        )
+    )
+    for row in rows:
+        print(
+            "  ".join(
+                _format(value).ljust(width)
+                if index == 0
+                else _format(value).rjust(width)
+                for (index, (value, width)) in enumerate(zip(row, widths))
+            )
+        )
+
+
+def _format(value):
+    if isinstance(value, float):
+        return "%.2f" % value
+    return str(value)
@@ -0,0 +1,119 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Benchmarks logging 100000 records to the Designer console stand-in, like a
+publish with verbose debug logging does.
+
+The records are handled by the console straight away, as the engine did
+before, or go through the queue of the engine. The time spent logging is
+what the code producing the records waits for, the time spent flushing is
+the main thread forwarding what is left in the queue to the console. The
+main thread never gets to run the timer of the queue while logging, so
+records are dropped once the queue is full, unless an error flushes it.
+
+Usage: python benchmarks/logging_benchmark.py [--repeat 7]
+"""
+
+import os
+import time
+import logging
+
+import harness
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+RECORD_COUNT = 100000
+
+# every how many records an error is logged in the scenario with errors
+ERROR_INTERVAL = 1000
+
+
+def main():
+    args = harness.parse_args(
+        "Benchmarks logging %s records to the Designer console." % RECORD_COUNT
+    )
+    harness.use_fakes()
+
+    from sd.logger import SDRuntimeLogHandler
+
+    engine = harness.load_module(
+        "tk_substancedesigner_engine", os.path.join(harness.ENGINE_ROOT, "engine.py")
+    )
+
+    class Console(SDRuntimeLogHandler):
+        def __init__(self):
+            SDRuntimeLogHandler.__init__(self)
+            self.records = 0
+            self.dropped = 0
+
+        def emit(self, record):
+            SDRuntimeLogHandler.emit(self, record)
+            if record.getMessage().endswith("to keep up with the logging rate."):
+                self.dropped += int(record.getMessage().split()[0])
+            else:
+                self.records += 1
+
+    logger = logging.getLogger("benchmark.publish")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+
+    def log_records(errors):
+        for index in range(RECORD_COUNT):
+            if errors and index % ERROR_INTERVAL == ERROR_INTERVAL - 1:
+                logger.error("Resource %s of package %s is broken.", index, "rock")
+            else:
+                logger.debug("Validating resource %s of package %s.", index, "rock")
+
+    def run(queued, errors):
+        console = Console()
+        handler = engine.QueuedLogHandler(console) if queued else console
+        logger.addHandler(handler)
+        try:
+            start = time.perf_counter()
+            log_records(errors)
+            logging_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            handler.flush()
+            flush_time = time.perf_counter() - start
+        finally:
+            logger.removeHandler(handler)
+
+        return logging_time, flush_time, console.records, console.dropped
+
+    rows = []
+    for (name, queued, errors) in (
+        ("console (before)", False, False),
+        ("queue", True, False),
+        ("queue, an error every %s" % ERROR_INTERVAL, True, True),
+    ):
+        results = [run(queued, errors) for _ in range(args.repeat)]
+        rows.append(
+            (
+                name,
+                harness.median([result[0] for result in results]) * 1000.0,
+                harness.median([result[1] for result in results]) * 1000.0,
+                results[-1][2],
+                results[-1][3],
+            )
+        )
+
+    harness.print_table(
+        "Logging %s records:" % RECORD_COUNT,
+        ["scenario", "logging ms", "flush ms", "shown", "dropped"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Benchmarks rendering the Shotgun menu for an engine with 120 commands, built
+with the Qt stand-ins.
+
+A context change registers the commands of the apps again, with new
+callbacks. The menu is then rendered again from scratch, as it always was
+before, or updated in place when the same commands are in the same places.
+Every sub menu is shown after rendering, since their entries are only added
+and enabled the first time they are.
+
+Usage: python benchmarks/menu_benchmark.py [--repeat 7]
+"""
+
+import logging
+
+import harness
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+MENU_NAME = "Shotgun"
+
+APP_COUNT = 30
+COMMANDS_PER_APP = 4
+FAVOURITE_COUNT = 10
+
+
+class App(object):
+    """
+    Stand-in for the apps of the engine.
+    """
+
+    def __init__(self, engine, display_name):
+        self.engine = engine
+        self.display_name = display_name
+        self.documentation_url = "https://support.shotgunsoftware.com/%s" % (
+            display_name.replace(" ", "_")
+        )
+
+
+class Context(object):
+    def __init__(self, name):
+        self._name = name
+        self.filesystem_locations = ["/project/%s" % name]
+        self.shotgun_url = "https://example.shotgunstudio.com"
+
+    def __str__(self):
+        return self._name
+
+
+class Engine(object):
+    """
+    Stand-in for the engine, as seen by the menu generator.
+    """
+
+    def __init__(self, app_count, commands_per_app, favourite_count):
+        self.logger = logging.getLogger("benchmark")
+        self.active_package_context_switch = True
+        self.apps = {}
+        self.commands = {}
+        self.context = None
+        self._command_names = []
+
+        for app_index in range(app_count):
+            app_instance_name = "tk-multi-app%03d" % app_index
+            app = App(self, "App %03d" % app_index)
+            self.apps[app_instance_name] = app
+
+            for cmd_index in range(commands_per_app):
+                # some commands live in sub menus, like the ones of the apps
+                if cmd_index % 3 == 2:
+                    name = "Tools/Command %03d-%d" % (app_index, cmd_index)
+                else:
+                    name = "Command %03d-%d" % (app_index, cmd_index)
+                self._command_names.append((name, app, cmd_index))
+
+        self._favourites = [
+            {
+                "app_instance": "tk-multi-app%03d" % index,
+                "name": "Command %03d-0" % index,
+            }
+            for index in range(favourite_count)
+        ]
+
+        self.change_context("Asset Rock, Model")
+
+    def change_context(self, name):
+        """
+        Registers the commands again, like the apps do on a context change.
+        """
+        self.context = Context(name)
+        self.commands = {}
+        for (name, app, cmd_index) in self._command_names:
+            properties = {"app": app, "tooltip": name}
+            if cmd_index == 3:
+                properties["type"] = "context_menu"
+            if cmd_index == 1:
+                properties["enable_callback"] = lambda: True
+            self.commands[name] = {
+                "callback": lambda: None,
+                "properties": properties,
+            }
+
+    def get_setting(self, name):
+        return self._favourites
+
+    def log_debug(self, msg):
+        self.logger.debug(msg)
+
+
+def create_menu_generator(engine):
+    """
+    Returns a menu generator for the engine, rendering in a menu of the sd
+    UI manager stand-in.
+    """
+    import sd
+    from tank.platform.qt import QtGui
+
+    menu_generation = harness.import_engine_module("menu_generation")
+
+    ui_mgr = sd.getContext().getSDApplication().getQtForPythonUIMgr()
+    ui_mgr.menus["Pfx.Editor.Menu.%s" % MENU_NAME] = QtGui.QMenu(MENU_NAME)
+
+    return menu_generation.MenuGenerator(engine, MENU_NAME)
+
+
+def show_all_menus(menu):
+    """
+    Shows a menu and every sub menu in it, like a user going through them.
+    """
+    menu.aboutToShow.emit()
+    for action in menu.actions():
+        if action.menu():
+            show_all_menus(action.menu())
+
+
+def count_actions(menu):
+    count = 0
+    for action in menu.actions():
+        count += 1
+        if action.menu():
+            count += count_actions(action.menu())
+    return count
+
+
+def main():
+    args = harness.parse_args(
+        "Benchmarks rendering the Shotgun menu for an engine with %s commands."
+        % (APP_COUNT * COMMANDS_PER_APP)
+    )
+    harness.use_fakes()
+
+    engine = Engine(APP_COUNT, COMMANDS_PER_APP, FAVOURITE_COUNT)
+    menu_generator = create_menu_generator(engine)
+    contexts = ["Asset Rock, Model", "Asset Rock, Texture"]
+
+    def render(rebuild):
+        # alternate between two contexts of the same project
+        contexts.reverse()
+        engine.change_context(contexts[0])
+        if rebuild:
+            # forget the layout rendered, so the menu is built from scratch
+            menu_generator._layout = None
+        menu_generator.create_menu()
+        show_all_menus(menu_generator._handle)
+
+    rows = []
+    for (name, rebuild) in (
+        ("context change, rebuilt", True),
+        ("context change, in place", False),
+    ):
+        # render once so there is a menu to update
+        render(True)
+        median_ms = harness.measure(lambda: render(rebuild), args.repeat)
+        rows.append((name, median_ms, count_actions(menu_generator._handle)))
+
+    harness.print_table(
+        "Rendering the menu of %s commands:" % len(engine.commands),
+        ["scenario", "median ms", "entries"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
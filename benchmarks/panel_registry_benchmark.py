@@ -0,0 +1,140 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Benchmarks finding the widgets of a panel shown before, in synthetic widget
+trees of growing size built with the PySide2 stand-in.
+
+The panel is looked up the way show_panel used to, scanning every widget of
+the application for the widget instance, the way it falls back to when the
+registry lost track of it, searching the children of the main window, and
+through the panel registry. The panel is the last widget added to the tree,
+so the searches visit every other widget.
+
+Usage: python benchmarks/panel_registry_benchmark.py [--repeat 7]
+"""
+
+import gc
+import os
+
+import harness
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+WIDGET_COUNTS = (1000, 10000, 50000)
+
+# children of every widget of the tree
+BRANCHING = 10
+
+# lookups timed in every run, the time shown is for a single one
+LOOKUPS = 10
+
+PANEL_ID = "tk_multi_shotgunpanel_main"
+
+
+def create_widget_tree(widget_count):
+    """
+    Returns the main window of a tree of widget_count widgets, the dock of the
+    panel and its widget instance being the last ones.
+    """
+    from tank.platform.qt import QtGui
+
+    main_window = QtGui.QWidget()
+    level = [main_window]
+    created = 1
+    while created < widget_count:
+        next_level = []
+        for parent in level:
+            for _ in range(BRANCHING):
+                next_level.append(QtGui.QWidget(parent))
+                created += 1
+                if created >= widget_count:
+                    break
+            if created >= widget_count:
+                break
+        level = next_level
+
+    dock_widget_id = "sgtk_dock_widget_" + PANEL_ID
+    dock_widget = QtGui.QDockWidget(main_window)
+    dock_widget.setObjectName(dock_widget_id)
+    widget_instance = QtGui.QWidget(dock_widget)
+    widget_instance.setObjectName(dock_widget_id + "_widget_instance")
+
+    return main_window, dock_widget, widget_instance
+
+
+def main():
+    args = harness.parse_args(
+        "Benchmarks finding a panel in widget trees of %s widgets."
+        % ", ".join(str(count) for count in WIDGET_COUNTS)
+    )
+    harness.use_fakes()
+
+    from tank.platform.qt import QtGui
+
+    panel_registry = harness.load_module(
+        "panel_registry",
+        os.path.join(
+            harness.ENGINE_ROOT, "python", "tk_substancedesigner", "panel_registry.py"
+        ),
+    )
+
+    dock_widget_id = "sgtk_dock_widget_" + PANEL_ID
+    widget_id = dock_widget_id + "_widget_instance"
+
+    rows = []
+    for widget_count in WIDGET_COUNTS:
+        (main_window, dock_widget, widget_instance) = create_widget_tree(widget_count)
+
+        registry = panel_registry.PanelRegistry()
+        registry.register_dock_widget(PANEL_ID, dock_widget)
+        registry.register_widget_instance(PANEL_ID, widget_instance)
+
+        def scan_all_widgets():
+            for _ in range(LOOKUPS):
+                main_window.findChild(QtGui.QWidget, dock_widget_id)
+                for widget in QtGui.QApplication.allWidgets():
+                    if widget.objectName() == widget_id:
+                        break
+
+        def find_children():
+            for _ in range(LOOKUPS):
+                main_window.findChild(QtGui.QWidget, dock_widget_id)
+                main_window.findChild(QtGui.QWidget, widget_id)
+
+        def use_registry():
+            for _ in range(LOOKUPS):
+                registry.get_dock_widget(PANEL_ID)
+                registry.get_widget_instance(PANEL_ID)
+
+        rows.append(
+            (
+                "%s widgets" % widget_count,
+                harness.measure(scan_all_widgets, args.repeat) * 1000.0 / LOOKUPS,
+                harness.measure(find_children, args.repeat) * 1000.0 / LOOKUPS,
+                harness.measure(use_registry, args.repeat) * 1000.0 / LOOKUPS,
+            )
+        )
+
+        # the next tree is measured on its own
+        del main_window, dock_widget, widget_instance, registry
+        gc.collect()
+
+    harness.print_table(
+        "Finding a panel shown before, microseconds per lookup:",
+        ["widget tree", "all widgets", "findChild", "registry"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
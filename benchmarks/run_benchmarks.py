@@ -0,0 +1,312 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Headless benchmarks of the engine bootstrap chain.
+
+Every step of the chain (the shotgun_bridge plugin, startup/init.py and the
+engine module) is run several times, each in a fresh interpreter, against
+the stand-ins of sd, PySide2 and sgtk found in the fakes folder, so it runs
+on any machine with python. The median import and execution times, along
+with the -X importtime breakdown of the modules imported by each step, are
+written as JSON and compared against a stored baseline. The comparison fails
+when a step got slower than the baseline by more than both the relative
+tolerance and the absolute margin, so noise does not fail the build but a
+hook change adding hundreds of milliseconds to every launch does. Timings
+taken with another version of python or on another platform than the
+baseline are not comparable, so they are only reported.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --save-baseline
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import platform
+import subprocess
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+BENCHMARKS_ROOT = os.path.dirname(os.path.abspath(__file__))
+BOOTSTRAP_CHAIN = os.path.join(BENCHMARKS_ROOT, "bootstrap_chain.py")
+BASELINE_PATH = os.path.join(BENCHMARKS_ROOT, "baseline.json")
+RESULTS_PATH = os.path.join(BENCHMARKS_ROOT, "results.json")
+
+BENCHMARKS = ["shotgun_bridge", "startup_init", "engine"]
+
+# bump whenever the format of the results changes
+RESULTS_VERSION = 1
+
+IMPORTS_START = "--- bootstrap chain imports start ---"
+IMPORTS_END = "--- bootstrap chain imports end ---"
+
+IMPORT_TIME_REGEX = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def parse_import_times(stderr):
+    """
+    Returns the imports written by -X importtime between the markers, as a
+    list of dictionaries in the order python reported them.
+    """
+    imports = []
+    recording = False
+    for line in stderr.splitlines():
+        if line == IMPORTS_START:
+            recording = True
+        elif line == IMPORTS_END:
+            break
+        elif recording:
+            match = IMPORT_TIME_REGEX.match(line)
+            if match:
+                imports.append(
+                    {
+                        "module": match.group(4),
+                        "depth": (len(match.group(3)) - 1) // 2,
+                        "self_us": int(match.group(1)),
+                        "cumulative_us": int(match.group(2)),
+                    }
+                )
+    return imports
+
+
+def run_once(name):
+    """
+    Runs a benchmark in a fresh interpreter.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", BOOTSTRAP_CHAIN, name],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        cwd=BENCHMARKS_ROOT,
+    )
+    if process.returncode:
+        raise RuntimeError(
+            "Benchmark '%s' failed:\n%s" % (name, process.stderr.strip())
+        )
+
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    result["total_ms"] = result["import_ms"] + result["execution_ms"]
+    result["imports"] = parse_import_times(process.stderr)
+    return result
+
+
+def run_benchmark(name, repeat):
+    """
+    Runs a benchmark several times, returning the median times and the
+    imports of the median run.
+    """
+    # the first run compiles the bytecode, it is not what artists get
+    run_once(name)
+    runs = sorted((run_once(name) for _ in range(repeat)), key=lambda r: r["total_ms"])
+    median_run = runs[(len(runs) - 1) // 2]
+
+    return {
+        "import_ms": round(median([run["import_ms"] for run in runs]), 3),
+        "execution_ms": round(median([run["execution_ms"] for run in runs]), 3),
+        "total_ms": round(median([run["total_ms"] for run in runs]), 3),
+        "min_total_ms": round(runs[0]["total_ms"], 3),
+        "max_total_ms": round(runs[-1]["total_ms"], 3),
+        "imports": median_run["imports"],
+    }
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """
+    Prints how every benchmark compares with the baseline, returning the
+    names of the ones that regressed.
+    """
+    regressions = []
+    print("%-16s %12s %12s %9s" % ("benchmark", "baseline ms", "current ms", "change"))
+    for (name, result) in sorted(results["benchmarks"].items()):
+        baseline_result = baseline.get("benchmarks", {}).get(name)
+        if not baseline_result:
+            print("%-16s %12s %12.1f %9s" % (name, "-", result["total_ms"], "new"))
+            continue
+
+        before = baseline_result["total_ms"]
+        after = result["total_ms"]
+        change = (after - before) / before if before else 0.0
+        regressed = after > before * (1.0 + tolerance) and after - before > min_delta_ms
+        if regressed:
+            regressions.append(name)
+
+        print(
+            "%-16s %12.1f %12.1f %+8.0f%%%s"
+            % (name, before, after, change * 100.0, "  REGRESSION" if regressed else "")
+        )
+
+    return regressions
+
+
+def get_environment_differences(results, baseline):
+    """
+    Returns how the environment the results were taken in differs from the
+    one of the baseline, as a list of strings.
+    """
+    differences = []
+
+    # patch releases of python do not change the import machinery
+    python = results["python"].split(".")[:2]
+    baseline_python = str(baseline.get("python", "")).split(".")[:2]
+    if python != baseline_python:
+        differences.append(
+            "python %s (baseline %s)" % (results["python"], baseline.get("python"))
+        )
+
+    if results["platform"] != baseline.get("platform"):
+        differences.append(
+            "platform %s (baseline %s)"
+            % (results["platform"], baseline.get("platform"))
+        )
+
+    return differences
+
+
+def get_baseline(results):
+    """
+    Returns the results to store as baseline, which are only compared by
+    their median times, so the imports are left out.
+    """
+    baseline = dict(results)
+    baseline["benchmarks"] = dict(
+        (name, dict((k, v) for (k, v) in result.items() if k != "imports"))
+        for (name, result) in results["benchmarks"].items()
+    )
+    return baseline
+
+
+def print_slowest_imports(results, count):
+    for (name, result) in sorted(results["benchmarks"].items()):
+        print("\nSlowest imports of %s:" % name)
+        imports = sorted(result["imports"], key=lambda i: i["self_us"], reverse=True)
+        for module_import in imports[:count]:
+            print(
+                "  %8.1f ms self %8.1f ms cumulative  %s"
+                % (
+                    module_import["self_us"] / 1000.0,
+                    module_import["cumulative_us"] / 1000.0,
+                    module_import["module"],
+                )
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the engine bootstrap chain against stand-ins "
+        "of Substance Designer, PySide2 and toolkit."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=7, help="Runs of every benchmark (default 7)."
+    )
+    parser.add_argument(
+        "--output", default=RESULTS_PATH, help="Where to write the results."
+    )
+    parser.add_argument(
+        "--baseline", default=BASELINE_PATH, help="Results to compare against."
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write the results as the new baseline instead of comparing.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="Relative slowdown allowed before failing (default 0.5, ie. 50%%).",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=50.0,
+        help="Absolute slowdown allowed before failing (default 50 ms).",
+    )
+    parser.add_argument(
+        "--slowest-imports",
+        type=int,
+        default=5,
+        help="Slowest imports listed for every benchmark (default 5).",
+    )
+    args = parser.parse_args(argv)
+
+    results = {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "repeat": args.repeat,
+        "benchmarks": dict(
+            (name, run_benchmark(name, args.repeat)) for name in BENCHMARKS
+        ),
+    }
+
+    if args.save_baseline:
+        output = args.baseline
+        output_results = get_baseline(results)
+    else:
+        output = args.output
+        output_results = results
+
+    with open(output, "w") as output_file:
+        json.dump(output_results, output_file, indent=2, sort_keys=True)
+        output_file.write("\n")
+    print("Results written to %s" % output)
+
+    print_slowest_imports(results, args.slowest_imports)
+
+    if args.save_baseline:
+        return 0
+
+    try:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    except (IOError, OSError):
+        print("\nNo baseline found at %s, nothing to compare with." % args.baseline)
+        return 0
+
+    if baseline.get("version") != RESULTS_VERSION:
+        print("\nThe baseline was written by another version of the benchmarks.")
+        return 0
+
+    print("")
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+
+    differences = get_environment_differences(results, baseline)
+    if differences:
+        print(
+            "\nThe results were taken with %s, so the comparison is only "
+            "informative. Record a baseline in this environment with "
+            "--save-baseline to compare with it." % ", ".join(differences)
+        )
+        return 0
+
+    if regressions:
+        print("\nThe bootstrap got slower: %s" % ", ".join(regressions))
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Benchmarks scanning for Substance Designer installations in a synthetic
+install tree with many candidate installations, next to the folders of other
+applications and of installations that were removed.
+
+Every scan is done by a new launcher, like Shotgun Desktop does when it
+refreshes its launchers. The scans search the file system every time, with
+the cache disabled, or go through the per user cache: the first time, once
+it is filled, and after a new installation was added.
+
+Usage: python benchmarks/software_cache_benchmark.py [--repeat 7]
+"""
+
+import os
+import shutil
+import tempfile
+
+import harness
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+INSTALL_COUNT = 200
+OTHER_APP_COUNT = 1000
+REMOVED_INSTALL_COUNT = 100
+
+
+def create_install_tree(root):
+    """
+    Creates INSTALL_COUNT side by side installations, half of them with
+    their version in a version.txt file, the folders of other apps and the
+    folders left behind by removed installations.
+    """
+    apps_folder = os.path.join(root, "opt", "Allegorithmic")
+    for index in range(INSTALL_COUNT):
+        version = "2019.%s.%s" % (index // 10, index % 10)
+        add_install(apps_folder, version, with_version_file=index % 2 == 0)
+
+    for index in range(OTHER_APP_COUNT):
+        os.makedirs(os.path.join(apps_folder, "Substance_Painter-%04d" % index))
+
+    for index in range(REMOVED_INSTALL_COUNT):
+        os.makedirs(os.path.join(apps_folder, "Substance_Designer-2018.%s" % index))
+
+    return apps_folder
+
+
+def add_install(apps_folder, version, with_version_file=False):
+    install_folder = os.path.join(apps_folder, "Substance_Designer-%s" % version)
+    os.makedirs(install_folder)
+    with open(os.path.join(install_folder, "Substance Designer"), "w") as exe:
+        exe.write("#!/bin/sh\n")
+    if with_version_file:
+        with open(os.path.join(install_folder, "version.txt"), "w") as version_file:
+            version_file.write(version)
+
+
+def main():
+    args = harness.parse_args(
+        "Benchmarks scanning a synthetic tree of %s installations." % INSTALL_COUNT
+    )
+    harness.use_fakes()
+
+    import sgtk
+
+    startup = harness.load_module(
+        "tk_substancedesigner_startup", os.path.join(harness.ENGINE_ROOT, "startup.py")
+    )
+
+    root = tempfile.mkdtemp(prefix="sgtk_software_cache_benchmark_")
+    try:
+        sgtk.util.LocalFileStorageManager.root = os.path.join(root, "shotgun")
+        apps_folder = create_install_tree(root)
+        cache_path = startup.SoftwareCache.get_default_path()
+
+        templates = [
+            apps_folder + "/Substance_Designer{install_suffix}/Substance Designer",
+            os.path.join(root, "usr", "Allegorithmic", "Substance Designer"),
+        ]
+
+        class Launcher(startup.SubstanceDesignerLauncher):
+            EXECUTABLE_TEMPLATES = {
+                "darwin": templates,
+                "win32": templates,
+                "linux2": templates,
+            }
+
+        def scan():
+            launcher = Launcher(None, None, "tk-substancedesigner", None)
+            return launcher.scan_software()
+
+        def remove_cache():
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+
+        added = []
+
+        def add_new_install():
+            version = "2020.0.%s" % len(added)
+            add_install(apps_folder, version)
+            added.append(version)
+
+        scenarios = [
+            ("cache disabled", "0", None),
+            ("first scan", "1", remove_cache),
+            ("cached", "1", None),
+            ("new installation", "1", add_new_install),
+        ]
+
+        rows = []
+        for (name, cache_setting, setup) in scenarios:
+            os.environ[startup.SOFTWARE_CACHE_ENV] = cache_setting
+
+            # the cache is filled for the install tree first
+            scan()
+            median_ms = harness.measure(scan, args.repeat, setup)
+            rows.append((name, median_ms, len(scan())))
+
+        harness.print_table(
+            "Scanning %s installations among %s other apps and %s removed ones:"
+            % (INSTALL_COUNT, OTHER_APP_COUNT, REMOVED_INSTALL_COUNT),
+            ["scenario", "median ms", "found"],
+            rows,
+        )
+    finally:
+        os.environ.pop(startup.SOFTWARE_CACHE_ENV, None)
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Benchmarks loading the engine startup script from the shotgun_bridge plugin,
+the first time and when Designer reloads the plugin.
+
+The plugin used imp.load_source, which executes the script again every time
+it is called, into the module loaded before if there is one. imp is gone
+from recent versions of python, so that is done here with the same source
+loader it used. The plugin now loads the script through importlib and
+reuses the module loaded before.
+
+Usage: python benchmarks/startup_loader_benchmark.py [--repeat 7]
+"""
+
+import os
+import sys
+import importlib.util
+
+import harness
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+PLUGIN_ROOT = os.path.join(
+    harness.ENGINE_ROOT, "resources", "plugins", "shotgun_bridge"
+)
+ENGINE_STARTUP_PATH = os.path.join(harness.ENGINE_ROOT, "startup", "init.py")
+
+RELOAD_COUNT = 10
+
+
+def load_source(name, path):
+    """
+    Loads a python file like imp.load_source did, executing it every time.
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = sys.modules.get(name)
+    if module is None:
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    args = harness.parse_args(
+        "Benchmarks loading the engine startup script from the plugin."
+    )
+    harness.use_fakes()
+    sys.path.insert(0, PLUGIN_ROOT)
+
+    import shotgun_bridge
+
+    shotgun_bridge.tracing.stop_tracing_imports()
+    module_name = shotgun_bridge.ENGINE_STARTUP_MODULE
+
+    loaders = (
+        lambda: load_source(module_name, ENGINE_STARTUP_PATH),
+        lambda: shotgun_bridge.load_engine_startup(ENGINE_STARTUP_PATH),
+    )
+
+    def forget_startup():
+        sys.modules.pop(module_name, None)
+
+    def reload_plugin(load):
+        for _ in range(RELOAD_COUNT):
+            load()
+
+    rows = []
+    for (name, func, setup) in (
+        ("first load", lambda load: load(), forget_startup),
+        ("plugin reloaded %s times" % RELOAD_COUNT, reload_plugin, None),
+    ):
+        row = [name]
+        for load in loaders:
+            # load the script once, so its bytecode is cached for both
+            forget_startup()
+            load()
+            row.append(harness.measure(lambda: func(load), args.repeat, setup))
+        rows.append(row)
+
+    harness.print_table(
+        "Loading the engine startup script:",
+        ["scenario", "load_source ms", "importlib ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
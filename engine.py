@@ -15,10 +15,15 @@ https://www.substance3d.com/products/substance-designer/
 
 import os
 import sys
+import copy
 import time
+import atexit
 import inspect
 import logging
+import threading
 import traceback
+import contextlib
+import collections
 
 # enable cool tracebacks
 import cgitb
@@ -34,6 +39,16 @@ import tank.platform.framework
 
 import sd
 
+# the log handler forwards the records from the main thread
+from PySide2 import QtCore
+
+# the startup tracer lives in the shotgun_bridge plugin, which is not
+# available when the engine is started by other means.
+try:
+    from shotgun_bridge import tracing
+except ImportError:
+    tracing = None
+
 __author__ = "Diego Garcia Huerta"
 __contact__ = "https://www.linkedin.com/in/diegogh/"
 
@@ -61,12 +76,248 @@ if not hasattr(sd, "shotgun"):
 logger = LogManager.get_logger(__name__)
 
 
-# let's log directly to substance designer logs
-SUBSTANCEDESIGNER_LOG_HANDLER = sd.getContext().createRuntimeLogHandler()
-# tk loggers require this so we patch the substance designer logger
-# otherwise we would have to forward message by message to the
-# substancedesigner logger.
-SUBSTANCEDESIGNER_LOG_HANDLER.inside_dispatch = False
+class QueuedLogHandler(logging.Handler):
+    """
+    Logging handler that queues the records and forwards them to another
+    handler from the main thread, so the code producing the records does not
+    wait for them to be displayed, and the target handler, which belongs to
+    the Substance Designer API, is never called from other threads.
+
+    Records are sent in batches by a timer of the main thread. When the queue
+    is full, records below warning level are dropped and a count of the
+    dropped records is reported instead. Consecutive identical records are
+    coalesced into one. Error records flush the queue straight away when they
+    are logged from the main thread, and as soon as the main thread gets to it
+    otherwise, so they are never lost.
+    """
+
+    def __init__(self, target, max_queue_size=10000, batch_size=200, interval=0.05):
+        """
+        :param target: Handler the records are forwarded to.
+        :param int max_queue_size: Maximum number of records waiting.
+        :param int batch_size: Maximum number of records forwarded at once.
+        :param float interval: Seconds to wait between batches.
+        """
+        logging.Handler.__init__(self)
+
+        self._target = target
+        self._max_queue_size = max_queue_size
+        self._batch_size = batch_size
+
+        # appending to and popping from a deque is thread safe, so the
+        # records are queued without taking any lock.
+        self._queue = collections.deque()
+        # only guards the count of dropped records
+        self._dropped_lock = threading.Lock()
+        self._dropped = 0
+
+        # created in the main thread, so the timer and the queued signal
+        # forward the records there.
+        self._dispatcher = _LogDispatcher(self)
+        self._timer = QtCore.QTimer(self._dispatcher)
+        self._timer.setInterval(int(interval * 1000))
+        self._timer.timeout.connect(self._dispatch_batch)
+        self._timer.start()
+
+    @property
+    def queue_size(self):
+        """
+        Number of records waiting to be forwarded.
+        """
+        return len(self._queue)
+
+    def emit(self, record):
+        """
+        Queues a record, or forwards it straight away if it is an error.
+        """
+        # records dropped are not worth rendering
+        if len(self._queue) >= self._max_queue_size:
+            if record.levelno < logging.WARNING:
+                self._count_dropped()
+                return
+            try:
+                self._queue.popleft()
+                self._count_dropped()
+            except IndexError:
+                pass
+
+        try:
+            # the arguments might change before the record is forwarded, so
+            # render the message now, in a copy since the other handlers get
+            # the same record.
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = self.formatException(record.exc_info)
+                record.exc_info = None
+        except Exception:
+            self.handleError(record)
+            return
+
+        self._queue.append(record)
+
+        if record.levelno >= logging.ERROR:
+            if self._in_main_thread():
+                self.flush()
+            else:
+                self._dispatcher.flush_requested.emit()
+
+    def flush(self):
+        """
+        Forwards all the queued records. Does nothing when called from
+        another thread than the main one, the timer forwards them soon enough.
+        """
+        if not self._in_main_thread():
+            return
+        while self._queue:
+            self._dispatch_batch()
+
+    def close(self):
+        """
+        Forwards the queued records and stops the timer.
+        """
+        # the timer and the Designer console are gone along with the
+        # application when python exits
+        if QtCore.QCoreApplication.instance():
+            if self._in_main_thread():
+                self._timer.stop()
+            self.flush()
+        logging.Handler.close(self)
+
+    def _in_main_thread(self):
+        """
+        Returns True if called from the main thread, or if there is no
+        application anymore, ie. when python exits.
+        """
+        app = QtCore.QCoreApplication.instance()
+        return not app or QtCore.QThread.currentThread() is app.thread()
+
+    def _count_dropped(self):
+        """
+        Counts a record that was dropped because the queue was full.
+        """
+        with self._dropped_lock:
+            self._dropped += 1
+
+    def _dispatch_batch(self):
+        """
+        Forwards the next batch of queued records to the target handler, in
+        the main thread.
+        """
+        records = []
+        while len(records) < self._batch_size:
+            try:
+                record = self._queue.popleft()
+            except IndexError:
+                break
+
+            if records:
+                last = records[-1]
+                if (
+                    last.levelno == record.levelno
+                    and last.name == record.name
+                    and last.msg == record.msg
+                ):
+                    last.repeated = getattr(last, "repeated", 1) + 1
+                    continue
+            records.append(record)
+
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+
+        if dropped:
+            dropped_record = logging.LogRecord(
+                "sgtk",
+                logging.WARNING,
+                __file__,
+                0,
+                "%s log records were dropped to keep up with the logging rate."
+                % dropped,
+                None,
+                None,
+            )
+            records.insert(0, dropped_record)
+
+        for record in records:
+            repeated = getattr(record, "repeated", 1)
+            if repeated > 1:
+                record.msg = "%s (repeated %s times)" % (record.msg, repeated)
+            try:
+                self._target.handle(record)
+            except Exception:
+                self.handleError(record)
+
+
+class _LogDispatcher(QtCore.QObject):
+    """
+    Lives in the main thread, so the records logged in other threads can ask
+    it to flush the log queue there.
+    """
+
+    flush_requested = QtCore.Signal()
+
+    def __init__(self, handler):
+        """
+        :param handler: QueuedLogHandler flushed when requested.
+        """
+        QtCore.QObject.__init__(self)
+        self._handler = handler
+        self.flush_requested.connect(self._flush, QtCore.Qt.QueuedConnection)
+
+    def _flush(self):
+        """
+        Flushes the log queue, in the main thread.
+        """
+        self._handler.flush()
+
+
+def _flush_log_handler_at_exit():
+    """
+    Forwards the records still queued when python exits, unless Designer and
+    its console are gone already.
+    """
+    if QtCore.QCoreApplication.instance():
+        sd.shotgun.log_handler.flush()
+
+
+# let's log directly to substance designer logs, through a queue so the code
+# logging is not slowed down by the console. The handler is kept between
+# engine restarts so it is only created once.
+if not hasattr(sd.shotgun, "log_handler"):
+    substancedesigner_runtime_log_handler = sd.getContext().createRuntimeLogHandler()
+    # tk loggers require this so we patch the substance designer logger
+    # otherwise we would have to forward message by message to the
+    # substancedesigner logger.
+    substancedesigner_runtime_log_handler.inside_dispatch = False
+
+    sd.shotgun.log_handler = QueuedLogHandler(substancedesigner_runtime_log_handler)
+    atexit.register(_flush_log_handler_at_exit)
+
+SUBSTANCEDESIGNER_LOG_HANDLER = sd.shotgun.log_handler
+
+# the display_* functions below log through this logger, so make sure their
+# messages reach the Designer console as well.
+if SUBSTANCEDESIGNER_LOG_HANDLER not in logger.handlers:
+    logger.addHandler(SUBSTANCEDESIGNER_LOG_HANDLER)
+
+
+def trace(name, **args):
+    """
+    Records the code wrapped by this context manager in the startup trace.
+    """
+    if tracing:
+        return tracing.trace(name, **args)
+    return contextlib.nullcontext()
+
+
+def traced(name):
+    """
+    Records every call to the decorated function in the startup trace.
+    """
+    if tracing:
+        return tracing.traced(name)
+    return lambda func: func
 
 
 # logging functionality
@@ -89,40 +340,20 @@ def show_info(msg):
 
 
 def display_error(msg):
-    # Add a handler to redirect logging to Designer's console panel.
-    ctx = sd.getContext()
-    logger.addHandler(ctx.createRuntimeLogHandler())
-
-    substancedesigner.qCritical(msg)
-    t = time.asctime(time.localtime())
-    message = "%s - Shotgun Error | %s engine | %s " % (t, APPLICATION_NAME, msg)
-    print(message)
+    logger.error("Shotgun Error | %s engine | %s", APPLICATION_NAME, msg)
 
 
 def display_warning(msg):
-    substancedesigner.qWarning(msg)
-    t = time.asctime(time.localtime())
-    message = "%s - Shotgun Warning | %s engine | %s " % (t, APPLICATION_NAME, msg)
-    print(message)
+    logger.warning("Shotgun Warning | %s engine | %s", APPLICATION_NAME, msg)
 
 
 def display_info(msg):
-    # SubstanceDesigner 4.0.0 did not have qInfo yet, so use debug instead
-    if hasattr(substancedesigner, "qInfo"):
-        substancedesigner.qInfo(msg)
-    else:
-        substancedesigner.qDebug(msg)
-    t = time.asctime(time.localtime())
-    message = "%s - Shotgun Information | %s engine | %s " % (t, APPLICATION_NAME, msg)
-    print(message)
+    logger.info("Shotgun Information | %s engine | %s", APPLICATION_NAME, msg)
 
 
 def display_debug(msg):
     if os.environ.get("TK_DEBUG") == "1":
-        substancedesigner.qDebug(msg)
-        t = time.asctime(time.localtime())
-        message = "%s - Shotgun Debug | %s engine | %s " % (t, APPLICATION_NAME, msg)
-        print(message)
+        logger.debug("Shotgun Debug | %s engine | %s", APPLICATION_NAME, msg)
 
 
 # methods to support the state when the engine cannot start up
@@ -173,32 +404,61 @@ def refresh_engine():
     # active document
     current_context = tank.platform.current_engine().context
 
-    ctx = current_context
+    # the toolkit lookups can take a while, so optionally do them in a
+    # worker thread and only change the context back in the main thread.
+    start = time.time()
+    if engine.get_setting("async_context_resolution", False):
+        engine.async_context_resolver.resolve(
+            current_package_filename,
+            current_context,
+            lambda tk, ctx, error: _apply_resolved_context(
+                engine, current_package_filename, tk, ctx, error, start
+            ),
+        )
+        return
 
     # this file could be in another project altogether, so create a new
-    # API instance.
+    # API instance. Resolved contexts are cached by the engine, so going
+    # back and forth between packages does not query toolkit every time.
     try:
         # and construct the new context for this path:
-        tk = tank.sgtk_from_path(current_package_filename)
-        logger.debug(
-            "Extracted sgtk instance: '%r' from path: '%r'",
-            tk,
-            current_package_filename,
+        tk, ctx = engine.context_resolver.resolve(
+            current_package_filename, current_context
         )
+    except tank.TankError as e:
+        _apply_resolved_context(engine, current_package_filename, None, None, e, start)
+    else:
+        _apply_resolved_context(engine, current_package_filename, tk, ctx, None, start)
+
+
+def _apply_resolved_context(
+    engine, current_package_filename, tk, ctx, error, start=None
+):
+    """
+    Changes the engine context to the one resolved for the active package.
+
+    :param float start: Time the refresh started, used to record how long
+                        the context switch took.
+    """
+    current_context = engine.context
 
-    except tank.TankError:
+    if error:
         # could not detect context from path, will use the project context
         # for menus if it exists
         message = (
             "Shotgun %s Engine could not detect the context\n"
             "from the active document. Shotgun menus will be  \n"
             "stay in the current context '%s' "
-            "\n" % (APPLICATION_NAME, ctx)
+            "\n" % (APPLICATION_NAME, current_context)
         )
         display_warning(message)
         return
 
-    ctx = tk.context_from_path(current_package_filename, current_context)
+    logger.debug(
+        "Extracted sgtk instance: '%r' from path: '%r'",
+        tk,
+        current_package_filename,
+    )
     logger.debug(
         "Given the path: '%s' the following context was extracted: '%r'",
         current_package_filename,
@@ -231,6 +491,9 @@ def refresh_engine():
             display_warning(message)
             engine.create_shotgun_menu(disabled=True)
 
+        if start is not None:
+            engine.metrics.record("context_switch", time.time() - start)
+
 
 class SubstanceDesignerEngine(Engine):
     """
@@ -246,13 +509,20 @@ class SubstanceDesignerEngine(Engine):
         # __init__() because the initialization may need those
         # variables.
         self._dock_widgets = []
+        self._menu_bar_watcher = None
+        self._menu_generator = None
+        self._menu_disabled = False
+
+        # timings of the engine startup, in seconds
+        self.startup_metrics = {}
 
         tank.platform.Engine.__init__(self, *args, **kwargs)
 
         # this is where we connect the engine logger to the application
         # logger
         handler_types = [
-            isinstance(handler, sd.logger.SDRuntimeLogHandler)
+            handler is SUBSTANCEDESIGNER_LOG_HANDLER
+            or isinstance(handler, sd.logger.SDRuntimeLogHandler)
             for handler in self.logger.handlers
         ]
         has_substancedesigner_handler = any(handler_types)
@@ -301,25 +571,7 @@ class SubstanceDesignerEngine(Engine):
             pass
         return host_info
 
-    def _on_active_package_timer(self):
-        """
-        Refresh the engine if the current package has changed since the last
-        time we checked.
-        """
-        ctx = sd.getContext()
-        app = ctx.getSDApplication()
-        uiMgr = app.getQtForPythonUIMgr()
-
-        active_package = None
-        current_graph = uiMgr.getCurrentGraph()
-        if current_graph:
-            pck = current_graph.getPackage()
-            active_package = pck.getFilePath()
-
-        if active_package and self.active_package != active_package:
-            self.active_package = active_package
-            refresh_engine()
-
+    @traced("SubstanceDesignerEngine.pre_app_init")
     def pre_app_init(self):
         """
         Runs after the engine is set up but before any apps have been
@@ -334,17 +586,52 @@ class SubstanceDesignerEngine(Engine):
         QtCore.QTextCodec.setCodecForCStrings(utf8)
         self.logger.debug("set utf-8 codec for widget text")
 
-        # We use a timer to know when the user changes graph/package
-        # selection.
+        # record the import and initialization time of every app
+        if tracing and tracing.is_enabled():
+            self._trace_app_initialization()
+
+        # We watch the Substance Designer UI to know when the user changes
+        # graph/package selection.
         #
         # Since the restart of the engine every time a view is chosen is an
         # expensive operation, we will offer this functionality as an option
         # inside the context menu.
         #
-        self.active_package = None
-        self.active_package_timer = QtCore.QTimer()
-        self.active_package_timer.timeout.connect(self._on_active_package_timer)
+        tk_substancedesigner = self.import_module("tk_substancedesigner")
+        self._panel_registry = tk_substancedesigner.PanelRegistry()
+        self._startup_scheduler = tk_substancedesigner.StartupCommandScheduler(
+            self.logger
+        )
+        self.context_resolver = tk_substancedesigner.ContextResolver(self.logger)
+        self.async_context_resolver = tk_substancedesigner.AsyncContextResolver(
+            self.context_resolver, self.logger
+        )
+        self._active_package_watcher = tk_substancedesigner.ActivePackageWatcher(
+            self, refresh_engine
+        )
 
+        # timings and values displayed in the performance panel
+        self.metrics = tk_substancedesigner.PerformanceMetrics()
+        self.metrics.add_gauge(
+            "log_queue_depth", lambda: SUBSTANCEDESIGNER_LOG_HANDLER.queue_size
+        )
+        self.metrics.add_gauge(
+            "process_rss",
+            tk_substancedesigner.get_process_rss,
+            tk_substancedesigner.format_bytes,
+        )
+
+        # thumbnails of the graphs collected by the publisher
+        self.thumbnail_generator = tk_substancedesigner.ThumbnailGenerator(
+            os.path.join(self.cache_location, "thumbnails"), self.logger
+        )
+
+        # copies the publish exports to their publish location in background
+        self.export_scheduler = tk_substancedesigner.ExportScheduler(
+            self.logger, self.get_setting("export_workers", 4)
+        )
+
+    @traced("SubstanceDesignerEngine.init_engine")
     def init_engine(self):
         """
         Initializes the SubstanceDesigner engine.
@@ -456,9 +743,9 @@ class SubstanceDesignerEngine(Engine):
         self.log_info("set_active_package_context_switch: %s" % value)
 
         if not value:
-            self.active_package_timer.stop()
+            self._active_package_watcher.stop()
         else:
-            self.active_package_timer.start(1000)
+            self._active_package_watcher.start()
 
     active_package_context_switch = property(
         __get_active_package_context_switch, __set_active_package_context_switch
@@ -474,6 +761,7 @@ class SubstanceDesignerEngine(Engine):
 
         return self.active_package_context_switch
 
+    @traced("SubstanceDesignerEngine.create_shotgun_menu")
     def create_shotgun_menu(self, disabled=False):
         """
         Creates the main shotgun menu in SubstanceDesigner.
@@ -488,25 +776,56 @@ class SubstanceDesignerEngine(Engine):
             tk_substancedesigner = self.import_module("tk_substancedesigner")
             if tk_substancedesigner.can_create_menu():
                 self.logger.debug("Creating shotgun menu...")
-                self._menu_generator = tk_substancedesigner.MenuGenerator(
-                    self, self._menu_name
-                )
-                self._menu_generator.create_menu(disabled=disabled)
+                # keep the same generator, so it can update the menu it
+                # rendered last time instead of building it again
+                if not self._menu_generator:
+                    self._menu_generator = tk_substancedesigner.MenuGenerator(
+                        self, self._menu_name
+                    )
+                with self.metrics.timed("menu_rebuild"):
+                    self._menu_generator.create_menu(disabled=disabled)
             else:
+                # create the menu as soon as the menu bar is available
                 self.logger.debug("Waiting for menu to be created...")
-                from sgtk.platform.qt import QtCore
-
-                QtCore.QTimer.singleShot(200, self.create_shotgun_menu)
+                self._menu_disabled = disabled
+                if not self._menu_bar_watcher:
+                    self._menu_bar_watcher = tk_substancedesigner.MenuBarWatcher(
+                        self._on_menu_bar_available, self.logger
+                    )
+                self._menu_bar_watcher.start()
             return True
 
         return False
 
+    def _on_menu_bar_available(self, elapsed):
+        """
+        Creates the menu once the menu bar is available, recording how long
+        we had to wait for it.
+
+        :param float elapsed: Seconds waited for the menu bar.
+        """
+        self.startup_metrics["menu_wait"] = elapsed
+        self.metrics.record("menu_wait", elapsed)
+
+        if tracing and tracing.is_enabled():
+            now = time.time()
+            event = tracing.create_event(
+                "SubstanceDesignerEngine.menu_wait", "startup", now - elapsed, now, 0
+            )
+            tracing.add_event(event)
+            self._write_startup_trace()
+
+        self.create_shotgun_menu(disabled=self._menu_disabled)
+
+    @traced("SubstanceDesignerEngine.post_app_init")
     def post_app_init(self):
         """
         Called when all apps have initialized
         """
         tank.platform.engine.set_current_engine(self)
 
+        self._register_performance_command()
+
         # create the shotgun menu
         self.create_shotgun_menu()
 
@@ -525,6 +844,78 @@ class SubstanceDesignerEngine(Engine):
         # Run a series of app instance commands at startup.
         self._run_app_instance_commands()
 
+        if tracing and tracing.is_enabled():
+            self._stop_tracing_app_initialization()
+            tracing.stop_tracing_imports()
+            self._write_startup_trace()
+
+    def _register_performance_command(self):
+        """
+        Registers the command that shows the performance panel.
+        """
+        self.register_command(
+            "Toolkit Performance...",
+            self._show_performance_panel,
+            {"type": "context_menu", "short_name": "toolkit_performance"},
+        )
+
+    def _show_performance_panel(self):
+        """
+        Shows the panel displaying the performance metrics of the engine.
+        """
+        tk_substancedesigner = self.import_module("tk_substancedesigner")
+        panel_id = self.register_panel(self._show_performance_panel)
+        self.show_panel(
+            panel_id,
+            "Toolkit Performance",
+            self,
+            tk_substancedesigner.PerformanceHud,
+            self.metrics,
+        )
+
+    def _write_startup_trace(self):
+        """
+        Writes the startup trace next to the toolkit log file.
+        """
+        trace_path = tracing.write(LogManager().log_folder)
+        self.logger.debug("Startup trace written to: %s", trace_path)
+
+        for event in tracing.get_slowest_events("import"):
+            self.logger.debug(
+                "Startup trace | %8.1f ms | %s", event["dur"] / 1000.0, event["name"]
+            )
+
+    def _trace_app_initialization(self):
+        """
+        Wraps the loading of apps by toolkit core so the import and the
+        initialization of each app is recorded in the startup trace.
+        """
+        get_application = tank.platform.application.get_application
+
+        def traced_get_application(
+            engine, app_folder, descriptor, settings, instance_name, env
+        ):
+            with trace("app.%s.import" % instance_name):
+                app = get_application(
+                    engine, app_folder, descriptor, settings, instance_name, env
+                )
+            app.init_app = tracing.traced("app.%s.init_app" % instance_name)(
+                app.init_app
+            )
+            return app
+
+        self._untraced_get_application = get_application
+        tank.platform.application.get_application = traced_get_application
+
+    def _stop_tracing_app_initialization(self):
+        """
+        Restores the loading of apps by toolkit core.
+        """
+        get_application = getattr(self, "_untraced_get_application", None)
+        if get_application:
+            tank.platform.application.get_application = get_application
+            self._untraced_get_application = None
+
     def post_context_change(self, old_context, new_context):
         """
         Runs after a context change. The SubstanceDesigner event watching will be stopped
@@ -539,11 +930,15 @@ class SubstanceDesignerEngine(Engine):
         # if pythonconsole_app:
         #     _fix_tk_multi_pythonconsole(self.logger)
 
+        # the commands are reset when the context changes
+        self._register_performance_command()
+
         if self.get_setting("automatic_context_switch", True):
             # finally create the menu with the new context if needed
             if old_context != new_context:
                 self.create_shotgun_menu()
 
+    @traced("SubstanceDesignerEngine.run_app_instance_commands")
     def _run_app_instance_commands(self):
         """
         Runs the series of app instance commands listed in the
@@ -572,6 +967,11 @@ class SubstanceDesignerEngine(Engine):
             # given app instance.
             setting_cmd_name = app_setting_dict["name"]
 
+            # When to run the commands: right away (blocking), once the
+            # application is idle (idle) or once control is back in the
+            # event loop (background), always in the main thread.
+            mode = app_setting_dict.get("mode") or "blocking"
+
             # Retrieve the command dictionary of the given app instance.
             cmd_dict = app_instance_commands.get(app_instance_name)
 
@@ -594,7 +994,11 @@ class SubstanceDesignerEngine(Engine):
                         )
                         self.logger.debug(msg)
 
-                        command_function()
+                        self._startup_scheduler.schedule(
+                            "%s/%s" % (app_instance_name, cmd_name),
+                            command_function,
+                            mode,
+                        )
                 else:
                     # Run the command whose name is listed in the
                     # 'run_at_startup' setting.
@@ -608,7 +1012,11 @@ class SubstanceDesignerEngine(Engine):
                         )
                         self.logger.debug(msg)
 
-                        command_function()
+                        self._startup_scheduler.schedule(
+                            "%s/%s" % (app_instance_name, setting_cmd_name),
+                            command_function,
+                            mode,
+                        )
                     else:
                         known_commands = ", ".join("'%s'" % name for name in cmd_dict)
                         self.logger.warning(
@@ -627,7 +1035,15 @@ class SubstanceDesignerEngine(Engine):
         application
         """
         self.logger.debug("%s: Destroying...", self)
+        self._active_package_watcher.stop()
+        self.async_context_resolver.cancel()
+        self._startup_scheduler.cancel()
+        self.thumbnail_generator.cancel()
+        self.export_scheduler.shutdown()
+        if self._menu_bar_watcher:
+            self._menu_bar_watcher.stop()
         self.close_windows()
+        SUBSTANCEDESIGNER_LOG_HANDLER.flush()
 
     def _init_pyside(self):
         """
@@ -681,7 +1097,13 @@ class SubstanceDesignerEngine(Engine):
         dock_widget_id = "sgtk_dock_widget_" + panel_id
         widget_id = dock_widget_id + "_widget_instance"
 
-        dock_widget = main_window.findChild(QtGui.QWidget, dock_widget_id)
+        # panels shown before are found in the registry, only search the
+        # main window if the registry lost track of them.
+        dock_widget = self._panel_registry.get_dock_widget(panel_id)
+        if dock_widget:
+            self.logger.debug("Dock widget %s found in the registry." % dock_widget_id)
+        else:
+            dock_widget = main_window.findChild(QtGui.QWidget, dock_widget_id)
 
         # create the dock widget if it does not exists
         if not dock_widget:
@@ -693,21 +1115,24 @@ class SubstanceDesignerEngine(Engine):
         else:
             self.logger.debug("Found Dock widget with id: %s" % dock_widget_id)
 
-        # get the shotgun widget if it already exists
-        widget_instance = None
-        for widget in QtGui.QApplication.allWidgets():
-            if widget.objectName() == widget_id:
-                self.logger.debug("Found shotgun widget with id: %s" % widget_id)
-                widget_instance = widget
-                break
+        self._panel_registry.register_dock_widget(panel_id, dock_widget)
 
-        # or create it if it does not
+        # get the shotgun widget if it already exists
+        widget_instance = self._panel_registry.get_widget_instance(panel_id)
         if not widget_instance:
+            widget_instance = main_window.findChild(QtGui.QWidget, widget_id)
+
+        if widget_instance:
+            self.logger.debug("Found shotgun widget with id: %s" % widget_id)
+        else:
+            # or create it if it does not
             self.logger.debug("Creating shotgun widget with id: %s" % widget_id)
             widget_instance = widget_class(*args, **kwargs)
             widget_instance.setObjectName(widget_id)
             self._apply_external_styleshet(bundle, widget_instance)
 
+        self._panel_registry.register_widget_instance(panel_id, widget_instance)
+
         # reparent the shotgun toolkit widget under the application
         # to prevent it from being deleted.
         parent = self._get_dialog_parent()
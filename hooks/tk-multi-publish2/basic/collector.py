@@ -13,6 +13,7 @@ from functools import partial
 import sgtk
 from sgtk import TankError
 from sgtk.util.filesystem import create_valid_filename
+from sgtk.platform.qt import QtCore
 
 
 __author__ = "Diego Garcia Huerta"
@@ -24,6 +25,15 @@ HookBaseClass = sgtk.get_hook_baseclass()
 
 import sd
 
+# types of graphs found in the packages
+COMP_GRAPH = "comp_graph"
+MDL_GRAPH = "mdl_graph"
+
+# collection modes
+ALL_PACKAGES = "all"
+ACTIVE_PACKAGE = "active_package"
+LAZY = "lazy"
+
 
 class SubstanceDesignerSessionCollector(HookBaseClass):
     """
@@ -66,7 +76,21 @@ class SubstanceDesignerSessionCollector(HookBaseClass):
                 "templates.yml. If configured, is made available"
                 "to publish plugins via the collected item's "
                 "properties. ",
-            }
+            },
+            "Collection Mode": {
+                "type": "str",
+                "default": ALL_PACKAGES,
+                "description": "Which packages are collected: 'all' the "
+                "open packages with their graphs, only the "
+                "'active_package' being edited, or 'lazy' to collect "
+                "all the packages but only the graphs of the active "
+                "package and of the packages indexed already. The "
+                "rest of the packages are indexed while Designer is "
+                "idle, so their graphs show the next time the "
+                "publisher is refreshed. Packages that were never "
+                "saved cannot be indexed, so in 'lazy' mode their "
+                "graphs only show while they are the active package.",
+            },
         }
 
         # update the base settings with these settings
@@ -128,6 +152,36 @@ class SubstanceDesignerSessionCollector(HookBaseClass):
         pck_man = app.getPackageMgr()
         user_pcks = pck_man.getUserPackages()
 
+        collection_mode = settings.get("Collection Mode")
+        collection_mode = collection_mode.value if collection_mode else ALL_PACKAGES
+        if collection_mode not in (ALL_PACKAGES, ACTIVE_PACKAGE, LAZY):
+            self.logger.warning(
+                "Unknown collection mode '%s', collecting all the packages."
+                % collection_mode
+            )
+            collection_mode = ALL_PACKAGES
+
+        # unsaved packages have no file path, so the packages are told apart
+        # by their handle
+        active_pck_handle = None
+        current_graph = uiMgr.getCurrentGraph()
+        if current_graph:
+            active_pck_handle = _get_package_handle(current_graph.getPackage())
+
+        thumbnail_generator = getattr(publisher.engine, "thumbnail_generator", None)
+
+        package_cache = _get_package_cache()
+        open_paths = set(pck.getFilePath() for pck in user_pcks)
+        pending_pcks = []
+
+        if collection_mode == ACTIVE_PACKAGE:
+            user_pcks = [
+                pck
+                for pck in user_pcks
+                if active_pck_handle is not None
+                and _get_package_handle(pck) == active_pck_handle
+            ]
+
         for pck in user_pcks:
             pck_filepath = pck.getFilePath()
             pck_file_info = publisher.util.get_file_path_components(pck_filepath)
@@ -145,13 +199,33 @@ class SubstanceDesignerSessionCollector(HookBaseClass):
             pck_item.properties["publish_type"] = "Substance Designer File"
             items.append(pck_item)
 
+            # the graphs of the packages not indexed yet are left for later
+            lazy = (
+                collection_mode == LAZY
+                and _get_package_handle(pck) != active_pck_handle
+            )
+            resource_index, token = self._get_resource_index(
+                pck, pck_filepath, package_cache, build=not lazy
+            )
+            if resource_index is None:
+                # the packages never saved cannot be cached, so indexing
+                # them would be for nothing
+                if token is not None:
+                    pending_pcks.append(pck)
+                continue
+
+            # the publish plugins only trust the index while the package
+            # token is the same
+            pck_item.properties["resource_index"] = resource_index
+            pck_item.properties["resource_index_token"] = token
+
             has_mdl_graphs = False
             has_comp_graphs = False
-            for resource in pck.getChildrenResources(True):
-                self.logger.info("Resource <%s> %s" % (type(resource), resource))
+            for graph_info in resource_index:
+                graph_id = graph_info["identifier"]
+                resource = graph_info["resource"]
 
-                if isinstance(resource, sd.api.sbs.sdsbscompgraph.SDSBSCompGraph):
-                    graph_id = resource.getIdentifier()
+                if graph_info["type"] == COMP_GRAPH:
                     graph_item = pck_item.create_item(
                         "substancedesigner.graph.textures",
                         "Textures",
@@ -165,15 +239,26 @@ class SubstanceDesignerSessionCollector(HookBaseClass):
                     graph_item.properties["resource"] = resource
                     graph_item.properties["work_template"] = work_template
                     graph_item.properties["publish_type"] = "Texture Folder"
+                    graph_item.properties["graph_info"] = graph_info
+                    graph_item.properties["resource_index_token"] = token
                     graph_item.properties["extra_fields"] = {
                         "substancedesigner.graph.name": graph_id
                     }
                     items.append(graph_item)
                     has_comp_graphs = True
 
-                if isinstance(resource, sd.api.mdl.sdmdlgraph.SDMDLGraph):
+                    # the icon stays until the thumbnail is rendered
+                    if thumbnail_generator and graph_info["output_count"]:
+                        thumbnail_generator.request(
+                            resource,
+                            graph_id,
+                            pck_filepath,
+                            graph_item.set_thumbnail_from_path,
+                            _get_package_handle(pck),
+                        )
+
+                if graph_info["type"] == MDL_GRAPH:
                     has_mdl_graphs = True
-                    graph_id = resource.getIdentifier()
                     graph_item = pck_item.create_item(
                         "substancedesigner.graph.mdle",
                         "Graph as MDLE",
@@ -190,13 +275,13 @@ class SubstanceDesignerSessionCollector(HookBaseClass):
                     graph_item.properties["resource"] = resource
                     graph_item.properties["work_template"] = work_template
                     graph_item.properties["publish_type"] = "MDLE File"
+                    graph_item.properties["graph_info"] = graph_info
+                    graph_item.properties["resource_index_token"] = token
                     graph_item.properties["extra_fields"] = {
                         "substancedesigner.graph.name": graph_id
                     }
                     items.append(graph_item)
 
-                    has_mdl_graphs = True
-                    graph_id = resource.getIdentifier()
                     graph_item = pck_item.create_item(
                         "substancedesigner.graph.preset",
                         "Graph as preset",
@@ -213,6 +298,8 @@ class SubstanceDesignerSessionCollector(HookBaseClass):
                     graph_item.properties["resource"] = resource
                     graph_item.properties["work_template"] = work_template
                     graph_item.properties["publish_type"] = "MDL File"
+                    graph_item.properties["graph_info"] = graph_info
+                    graph_item.properties["resource_index_token"] = token
                     graph_item.properties["extra_fields"] = {
                         "substancedesigner.graph.name": graph_id
                     }
@@ -234,6 +321,8 @@ class SubstanceDesignerSessionCollector(HookBaseClass):
                 pck_mdl_item.properties["package"] = pck
                 pck_mdl_item.properties["work_template"] = work_template
                 pck_mdl_item.properties["publish_type"] = "MDL File"
+                pck_mdl_item.properties["resource_index"] = resource_index
+                pck_mdl_item.properties["resource_index_token"] = token
                 items.append(pck_mdl_item)
 
             if has_comp_graphs:
@@ -254,12 +343,169 @@ class SubstanceDesignerSessionCollector(HookBaseClass):
                 pck_archive_item.properties[
                     "publish_type"
                 ] = "Substance Designer Archive"
+                pck_archive_item.properties["resource_index"] = resource_index
+                pck_archive_item.properties["resource_index_token"] = token
                 items.append(pck_archive_item)
 
+        # forget the packages that are not open anymore
+        for pck_filepath in list(package_cache):
+            if pck_filepath not in open_paths:
+                del package_cache[pck_filepath]
+
+        if pending_pcks:
+            self.logger.info(
+                "Graphs of %s packages will be collected once indexed."
+                % len(pending_pcks)
+            )
+            self._index_on_idle(pending_pcks, package_cache)
+
         self.logger.info("Collected %s items from the session" % len(items))
 
         return items
 
+    def _get_resource_index(self, pck, pck_filepath, package_cache, build=True):
+        """
+        Returns the index of the graphs of a package that can be published
+        and the token of the package it was built for, reusing the index
+        built the last time if the package did not change since. If build is
+        False and there is no index to reuse, None is returned instead of the
+        index.
+
+        The index is attached to the items so the publish plugins do not
+        have to walk the package again. It is a list of dictionaries with the
+        keys:
+
+            - type: COMP_GRAPH or MDL_GRAPH
+            - identifier: Identifier of the graph.
+            - resource: The graph itself.
+            - output_count: Number of output nodes of a COMP_GRAPH, None for
+              MDL graphs.
+        """
+        token = _get_package_token(pck, pck_filepath)
+        entry = package_cache.get(pck_filepath)
+        if token is not None and entry and entry["token"] == token:
+            self.logger.debug("Reusing the graphs found in %s" % pck_filepath)
+            return entry["resource_index"], token
+
+        if not build:
+            return None, token
+
+        resource_index = []
+        for resource in pck.getChildrenResources(True):
+            self.logger.debug("Resource <%s> %s" % (type(resource), resource))
+
+            if isinstance(resource, sd.api.sbs.sdsbscompgraph.SDSBSCompGraph):
+                graph_type = COMP_GRAPH
+            elif isinstance(resource, sd.api.mdl.sdmdlgraph.SDMDLGraph):
+                graph_type = MDL_GRAPH
+            else:
+                continue
+
+            output_count = None
+            if graph_type == COMP_GRAPH:
+                output_count = len(resource.getOutputNodes())
+
+            resource_index.append(
+                {
+                    "type": graph_type,
+                    "identifier": resource.getIdentifier(),
+                    "resource": resource,
+                    "output_count": output_count,
+                }
+            )
+
+        if token is None:
+            package_cache.pop(pck_filepath, None)
+        else:
+            package_cache[pck_filepath] = {
+                "token": token,
+                "resource_index": resource_index,
+            }
+
+        return resource_index, token
+
+    def _index_on_idle(self, packages, package_cache):
+        """
+        Indexes the given packages one at a time whenever Designer is idle,
+        so the graphs they contain are collected straight away next time.
+        """
+
+        def index_next():
+            if not packages:
+                return
+
+            pck = packages.pop(0)
+            try:
+                # an index that cannot be cached would be thrown away
+                pck_filepath = pck.getFilePath()
+                if _get_package_token(pck, pck_filepath) is not None:
+                    self._get_resource_index(pck, pck_filepath, package_cache)
+            except Exception as e:
+                # the package was probably closed in the meantime
+                self.logger.debug("Could not index package %s: %s" % (pck, e))
+
+            QtCore.QTimer.singleShot(0, index_next)
+
+        QtCore.QTimer.singleShot(0, index_next)
+
+
+def _get_package_cache():
+    """
+    Returns the resource index built for every package the last time the
+    session was collected. It is kept by the engine since hooks are reloaded
+    every time the publisher opens.
+    """
+    engine_state = getattr(sd, "shotgun", None)
+    if engine_state is None:
+        return {}
+
+    if not hasattr(engine_state, "collector_package_cache"):
+        engine_state.collector_package_cache = {}
+
+    return engine_state.collector_package_cache
+
+
+def _get_package_handle(pck):
+    """
+    Returns the handle of the package in Designer, which identifies it even
+    if it was never saved. Every call to the API returns a new python object
+    for the same package, so they cannot be compared themselves.
+    """
+    handle = getattr(pck, "mHandle", None)
+    return getattr(handle, "value", handle)
+
+
+def _get_package_token(pck, pck_filepath):
+    """
+    Returns a value that changes whenever the resources of a package could
+    have changed, or None if the package cannot be cached, ie. when it was
+    never saved.
+
+    A package that SD reports as unmodified is identified by its file. With
+    unsaved edits, or on SD versions without isModified, the number of
+    resources of the package is added to it, which is a single call instead
+    of a walk of the package. Unsaved edits inside the graphs, like output
+    nodes added, do not change that number, so they only show once the
+    package is saved.
+    """
+    if not pck_filepath:
+        return None
+
+    try:
+        stat = os.stat(pck_filepath)
+    except OSError:
+        return None
+
+    # a package closed and opened again is a different object, whose
+    # resources are different objects as well
+    token = (stat.st_mtime, stat.st_size, _get_package_handle(pck))
+
+    is_modified = getattr(pck, "isModified", None)
+    if is_modified and not is_modified():
+        return token
+
+    return token + (len(pck.getChildrenResources(True)),)
+
 
 def _session_path():
     """
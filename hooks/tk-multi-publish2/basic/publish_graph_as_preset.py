@@ -24,7 +24,6 @@ HookBaseClass = sgtk.get_hook_baseclass()
 
 
 import sd
-import sd.api.mdl.sdmdlexporter as sdmdlexporter
 
 
 class SubstanceDesignerGraphPresetMDLPlugin(HookBaseClass):
@@ -41,6 +40,8 @@ class SubstanceDesignerGraphPresetMDLPlugin(HookBaseClass):
 
     """
 
+    EXPORTER_MODULES = ["sd.api.mdl.sdmdlexporter"]
+
     # NOTE: The plugin icon and name are defined by the base file plugin.
     @property
     def type_description(self):
@@ -63,4 +64,5 @@ class SubstanceDesignerGraphPresetMDLPlugin(HookBaseClass):
 
     def _export(self, settings, item, path):
         graph = item.properties["resource"]
+        sdmdlexporter = self._import_exporter("sd.api.mdl.sdmdlexporter")
         sdmdlexporter.SDMDLExporter.sExportPreset(graph, path)
@@ -23,11 +23,6 @@ __contact__ = "https://www.linkedin.com/in/diegogh/"
 HookBaseClass = sgtk.get_hook_baseclass()
 
 
-import sd
-import sd.tools.export
-import sd.api.mdl.sdmdleexporter as sdmdleexporter
-
-
 class SubstanceDesignerGraphAsMDLE(HookBaseClass):
     """
     Plugin for publishing Substance Designer Graphs MDLE Export (encapsulated MDL).
@@ -41,6 +36,8 @@ class SubstanceDesignerGraphAsMDLE(HookBaseClass):
 
     """
 
+    EXPORTER_MODULES = ["sd.api.mdl.sdmdleexporter"]
+
     @property
     def type_description(self):
         return "Graph in MDLE format"
@@ -62,4 +59,5 @@ class SubstanceDesignerGraphAsMDLE(HookBaseClass):
 
     def _export(self, settings, item, path):
         graph = item.properties["resource"]
+        sdmdleexporter = self._import_exporter("sd.api.mdl.sdmdleexporter")
         sdmdleexporter.SDMDLEExporter.sExportGraph(graph, path)
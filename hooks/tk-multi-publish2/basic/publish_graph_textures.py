@@ -23,10 +23,6 @@ __contact__ = "https://www.linkedin.com/in/diegogh/"
 HookBaseClass = sgtk.get_hook_baseclass()
 
 
-import sd
-import sd.tools.export
-
-
 class SubstanceDesignerTexturesPublishPlugin(HookBaseClass):
     """
     Plugin for publishing Substance Designer Graphs output textures.
@@ -40,6 +36,8 @@ class SubstanceDesignerTexturesPublishPlugin(HookBaseClass):
 
     """
 
+    EXPORTER_MODULES = ["sd.tools.export"]
+
     @property
     def type_description(self):
         return "Graph Output Textures"
@@ -110,4 +108,5 @@ class SubstanceDesignerTexturesPublishPlugin(HookBaseClass):
         publish_format_setting = settings.get("Texture Format")
         extension = publish_format_setting.value
         graph = item.properties["resource"]
-        sd.tools.export.exportSDGraphOutputs(graph, aOutputDir=path, aFileExt=extension)
+        export = self._import_exporter("sd.tools.export")
+        export.exportSDGraphOutputs(graph, aOutputDir=path, aFileExt=extension)
@@ -40,6 +40,9 @@ class SubstanceDesignerPackagePublishPlugin(HookBaseClass):
         hook: "{self}/publish_file.py:{engine}/tk-multi-publish2/basic/publish_package_base.py:{engine}/tk-multi-publish2/basic/publish_package.py"
     """
 
+    # saving the package under another path makes it point to that path
+    STAGED_EXPORT = False
+
     @property
     def type_description(self):
         return "Package"
@@ -24,7 +24,6 @@ HookBaseClass = sgtk.get_hook_baseclass()
 
 
 import sd
-import sd.api.sbs.sdsbsarexporter as sbsarexporter
 
 
 class SubstanceDesignerPackageArchivePublishPlugin(HookBaseClass):
@@ -40,6 +39,8 @@ class SubstanceDesignerPackageArchivePublishPlugin(HookBaseClass):
 
     """
 
+    EXPORTER_MODULES = ["sd.api.sbs.sdsbsarexporter"]
+
     @property
     def type_description(self):
         return "Package Archive"
@@ -71,6 +72,7 @@ class SubstanceDesignerPackageArchivePublishPlugin(HookBaseClass):
 
     def _export(self, settings, item, path):
         pck = item.properties["package"]
+        sbsarexporter = self._import_exporter("sd.api.sbs.sdsbsarexporter")
         sdSBSARExporter = sbsarexporter.SDSBSARExporter.sNew()
         sdSBSARExporter.setExposeRandomSeed(False)
         sdSBSARExporter.setCompressionMode(sbsarexporter.SDCompressionMode.Auto)
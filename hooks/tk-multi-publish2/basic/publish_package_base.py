@@ -9,12 +9,14 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import shutil
 import tempfile
+import importlib
 import contextlib
 import traceback
 
 import sgtk
-from sgtk.util.filesystem import ensure_folder_exists
+from sgtk.util.filesystem import ensure_folder_exists, copy_file, copy_folder
 from sgtk.util.version import is_version_older
 
 __author__ = "Diego Garcia Huerta"
@@ -39,6 +41,17 @@ class SubstanceDesignerPackageBasePublishPlugin(HookBaseClass):
 
     """
 
+    # Exporter modules used by the plugin. They are slow to import and the
+    # publisher loads every plugin when it opens, so they are only imported
+    # when an item of the plugin is validated.
+    EXPORTER_MODULES = []
+
+    # Whether the plugin can export to a temporary location, that is then
+    # copied to the publish location in the background by the engine export
+    # scheduler. Plugins whose export changes the package itself, ie. saving
+    # it under a different path, must export in place.
+    STAGED_EXPORT = True
+
     # NOTE: The plugin icon and name are defined by the base file plugin.
     @property
     def type_description(self):
@@ -407,21 +420,32 @@ class SubstanceDesignerPackageBasePublishPlugin(HookBaseClass):
         # of the graphs in the package
         pck = item.properties["package"]
 
-        self.logger.info("Packages Resources: %s" % pck.getChildrenResources(True))
-
         # seems like only one graph needs to have outputs for the pck to be
-        # got to export
-        for resource in pck.getChildrenResources(True):
-            self.logger.info("Resource <%s> %s" % (type(resource), resource))
-
-            if isinstance(resource, sd.api.sbs.sdsbscompgraph.SDSBSCompGraph):
-                output_nodes = resource.getOutputNodes()
-                if len(output_nodes) > 0:
+        # got to export. The index collected already tells, unless the
+        # package changed since.
+        if _is_resource_index_current(item):
+            graphs = [
+                graph_info
+                for graph_info in item.properties["resource_index"]
+                if graph_info["type"] == "comp_graph"
+            ]
+            if any(graph_info["output_count"] for graph_info in graphs):
+                return True
+
+            # outputs added without saving do not change the token
+            for graph_info in graphs:
+                if _has_output_nodes(graph_info["resource"]):
+                    return True
+        else:
+            for resource in pck.getChildrenResources(True):
+                if isinstance(
+                    resource, sd.api.sbs.sdsbscompgraph.SDSBSCompGraph
+                ) and _has_output_nodes(resource):
                     return True
 
         error_msg = (
-            "Cannot find outputs to cook in the graph %s. Invalid package to publish (%s). Please deselect this from the publisher if you want to continue."
-            % (resource.getIdentifier(), self.type_description)
+            "Cannot find outputs to cook in the package %s. Invalid package to publish (%s). Please deselect this from the publisher if you want to continue."
+            % (pck.getFilePath(), self.type_description)
         )
         self.logger.error(error_msg)
         return False
@@ -442,17 +466,31 @@ class SubstanceDesignerPackageBasePublishPlugin(HookBaseClass):
         # of the graphs in the package
         resource = item.properties["resource"]
 
-        self.logger.info("Resource <%s> %s" % (type(resource), resource))
+        graph_info = item.properties.get("graph_info")
+        if graph_info is not None and _is_resource_index_current(item):
+            is_comp_graph = graph_info["type"] == "comp_graph"
+            graph_id = graph_info["identifier"]
+            # outputs added without saving do not change the token
+            has_outputs = bool(graph_info["output_count"]) or _has_output_nodes(
+                resource
+            )
+        else:
+            # the item was not collected by this engine collector, or the
+            # package changed since
+            self.logger.debug("Resource <%s> %s" % (type(resource), resource))
+            is_comp_graph = isinstance(
+                resource, sd.api.sbs.sdsbscompgraph.SDSBSCompGraph
+            )
+            graph_id = resource.getIdentifier()
+            has_outputs = is_comp_graph and _has_output_nodes(resource)
 
-        if isinstance(resource, sd.api.sbs.sdsbscompgraph.SDSBSCompGraph):
-            output_nodes = resource.getOutputNodes()
-            if len(output_nodes) == 0:
-                error_msg = (
-                    "Cannot find outputs to cook in the graph %s. Invalid package to publish (%s). Please deselect this from the publisher if you want to continue."
-                    % (resource.getIdentifier(), self.type_description)
-                )
-                self.logger.error(error_msg)
-                return False
+        if is_comp_graph and not has_outputs:
+            error_msg = (
+                "Cannot find outputs to cook in the graph %s. Invalid package to publish (%s). Please deselect this from the publisher if you want to continue."
+                % (graph_id, self.type_description)
+            )
+            self.logger.error(error_msg)
+            return False
 
         return True
 
@@ -470,18 +508,85 @@ class SubstanceDesignerPackageBasePublishPlugin(HookBaseClass):
 
         publisher = self.parent
 
-        valid = self.session_validate(settings, item)
-        valid = valid and self.templates_validate(settings, item)
-        valid = valid and self.version_validate(settings, item)
+        with self._timed("validate"):
+            valid = self._import_exporters()
+            valid = valid and self.session_validate(settings, item)
+            valid = valid and self.templates_validate(settings, item)
+            valid = valid and self.version_validate(settings, item)
 
-        # run the base class validation
-        return valid and super(
-            SubstanceDesignerPackageBasePublishPlugin, self
-        ).validate(settings, item)
+            # run the base class validation
+            return valid and super(
+                SubstanceDesignerPackageBasePublishPlugin, self
+            ).validate(settings, item)
+
+    def publish(self, settings, item):
+        """
+        Executes the publish logic for the given item and settings.
+
+        :param settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        """
+        with self._timed("publish"):
+            super(SubstanceDesignerPackageBasePublishPlugin, self).publish(
+                settings, item
+            )
+
+    def finalize(self, settings, item):
+        """
+        Execute the finalization pass. This pass executes once all the publish
+        tasks have completed, and can for example be used to version up files.
+
+        :param settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        """
+        with self._timed("finalize"):
+            self._wait_for_export(item)
+            super(SubstanceDesignerPackageBasePublishPlugin, self).finalize(
+                settings, item
+            )
+
+    def _timed(self, phase):
+        """
+        Returns a context manager recording how long a publish phase took in
+        the engine performance metrics, if the engine keeps any.
+        """
+        metrics = getattr(self.parent.engine, "metrics", None)
+        if metrics is None:
+            return contextlib.nullcontext()
+
+        name = "publish.%s.%s" % (self.type_description or "package", phase)
+        return metrics.timed(name)
 
     def _export(self, settings, item, path):
         raise NotImplementedError
 
+    def _import_exporter(self, module_name):
+        """
+        Returns an exporter module, importing it if it was not imported yet.
+        """
+        return importlib.import_module(module_name)
+
+    def _import_exporters(self):
+        """
+        Imports the exporter modules of this plugin, returning False if one
+        of them is not available in this version of Substance Designer.
+        """
+        for module_name in self.EXPORTER_MODULES:
+            try:
+                self._import_exporter(module_name)
+            except ImportError as e:
+                self.logger.error(
+                    "Cannot export a %s, %s could not be imported: %s"
+                    % (self.type_description, module_name, e)
+                )
+                return False
+
+        return True
+
     def _copy_work_to_publish(self, settings, item):
         """
         This method handles the exporting of the .sbsar archive into the
@@ -546,19 +651,100 @@ class SubstanceDesignerPackageBasePublishPlugin(HookBaseClass):
             # copy the file
             try:
                 ensure_folder_exists(publish_folder)
-                self._export(settings, item, publish_file)
+                self._schedule_export(settings, item, publish_file)
             except Exception:
-                raise Exception(
-                    "Failed to export to '%s'.\n%s"
-                    % (publish_file, traceback.format_exc()),
+                error_msg = "Failed to export to '%s'.\n%s" % (
+                    publish_file,
+                    traceback.format_exc(),
+                )
+                self.logger.error(
+                    error_msg,
                     extra={"action_show_folder": {"path": publish_folder}},
                 )
+                raise Exception(error_msg)
 
             self.logger.debug(
                 "Exported to '%s'." % (publish_file),
                 extra={"action_show_folder": {"path": publish_folder}},
             )
 
+    def _schedule_export(self, settings, item, path):
+        """
+        Exports the item to a temporary location, leaving the copy to the
+        publish location to the engine export scheduler, so the exports of the
+        rest of the items do not have to wait for it. Exports in place if
+        there is no scheduler or the plugin cannot stage its exports.
+        """
+        scheduler = getattr(self.parent.engine, "export_scheduler", None)
+        if scheduler is None or not self.STAGED_EXPORT:
+            self._export(settings, item, path)
+            return
+
+        # the export itself needs Designer, so it happens right here
+        staging_folder = tempfile.mkdtemp(prefix="sgtk_export_")
+        staged_path = os.path.join(staging_folder, os.path.basename(path))
+        try:
+            self._export(settings, item, staged_path)
+        except Exception:
+            shutil.rmtree(staging_folder, ignore_errors=True)
+            raise
+
+        item.properties["export_job"] = scheduler.submit(
+            path, _copy_staged_export, staging_folder, os.path.dirname(path)
+        )
+
+    def _wait_for_export(self, item):
+        """
+        Waits for the scheduled export of an item to be copied to the publish
+        location. If the copy failed, the publish registered for the item is
+        removed, so it never points to a missing file, and the error is raised
+        for the item.
+        """
+        export_job = item.properties.get("export_job")
+        if not export_job:
+            return
+
+        item.properties["export_job"] = None
+        try:
+            self.parent.engine.export_scheduler.wait(export_job)
+        except Exception:
+            error_msg = "Failed to export to '%s'.\n%s" % (
+                export_job,
+                traceback.format_exc(),
+            )
+            self._unregister_publish(item)
+            self.logger.error(
+                error_msg,
+                extra={"action_show_folder": {"path": os.path.dirname(export_job)}},
+            )
+            raise Exception(error_msg)
+
+        self.logger.debug(
+            "Copied export to '%s'." % export_job,
+            extra={"action_show_folder": {"path": os.path.dirname(export_job)}},
+        )
+
+    def _unregister_publish(self, item):
+        """
+        Removes the publish registered for the item in Shotgun, if any.
+        """
+        sg_publish_data = item.properties.get("sg_publish_data")
+        if not sg_publish_data:
+            return
+
+        try:
+            self.parent.shotgun.delete(sg_publish_data["type"], sg_publish_data["id"])
+        except Exception as e:
+            self.logger.warning(
+                "Could not remove the publish of '%s': %s" % (item.name, e)
+            )
+            return
+
+        item.properties["sg_publish_data"] = None
+        self.logger.info(
+            "Removed the publish of '%s', its file could not be copied." % item.name
+        )
+
     def get_publish_dependencies(self, settings, item):
         """
         Get publish dependencies for the supplied settings and item.
@@ -587,6 +773,86 @@ class SubstanceDesignerPackageBasePublishPlugin(HookBaseClass):
         return []
 
 
+def _has_output_nodes(graph):
+    """
+    Returns True if the graph has output nodes, False if it does not or it
+    was deleted since it was collected.
+    """
+    try:
+        return len(graph.getOutputNodes()) > 0
+    except Exception:
+        return False
+
+
+def _is_resource_index_current(item):
+    """
+    Returns True if the item has the resource index built by the collector
+    and its package did not change since, so the index can be trusted.
+    """
+    token = item.properties.get("resource_index_token")
+    if token is None:
+        return False
+
+    pck = item.properties["package"]
+    try:
+        return _get_package_token(pck, pck.getFilePath()) == token
+    except Exception:
+        # the package was closed in the meantime
+        return False
+
+
+# TODO: method duplicated in the collector hook
+def _get_package_handle(pck):
+    """
+    Returns the handle of the package in Designer, which identifies it even
+    if it was never saved.
+    """
+    handle = getattr(pck, "mHandle", None)
+    return getattr(handle, "value", handle)
+
+
+# TODO: method duplicated in the collector hook
+def _get_package_token(pck, pck_filepath):
+    """
+    Returns a value that changes whenever the resources of a package could
+    have changed, or None if the package cannot be cached.
+    """
+    if not pck_filepath:
+        return None
+
+    try:
+        stat = os.stat(pck_filepath)
+    except OSError:
+        return None
+
+    token = (stat.st_mtime, stat.st_size, _get_package_handle(pck))
+
+    is_modified = getattr(pck, "isModified", None)
+    if is_modified and not is_modified():
+        return token
+
+    return token + (len(pck.getChildrenResources(True)),)
+
+
+def _copy_staged_export(staging_folder, publish_folder):
+    """
+    Copies an export from its temporary location to the publish location,
+    removing the temporary location afterwards. Everything in the temporary
+    location is copied, since some exporters write other files next to the
+    exported one, ie. the bitmaps of an mdl.
+    """
+    try:
+        for name in os.listdir(staging_folder):
+            staged_path = os.path.join(staging_folder, name)
+            path = os.path.join(publish_folder, name)
+            if os.path.isdir(staged_path):
+                copy_folder(staged_path, path, skip_list=[])
+            else:
+                copy_file(staged_path, path)
+    finally:
+        shutil.rmtree(staging_folder, ignore_errors=True)
+
+
 # TODO: method duplicated in all the substancedesigner hooks
 def _get_save_as_action():
     """
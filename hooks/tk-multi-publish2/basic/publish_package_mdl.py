@@ -24,7 +24,6 @@ HookBaseClass = sgtk.get_hook_baseclass()
 
 
 import sd
-import sd.api.mdl.sdmdlexporter as sdmdlexporter
 
 
 class SubstanceDesignerPackageMDLPublishPlugin(HookBaseClass):
@@ -41,6 +40,8 @@ class SubstanceDesignerPackageMDLPublishPlugin(HookBaseClass):
 
     """
 
+    EXPORTER_MODULES = ["sd.api.mdl.sdmdlexporter"]
+
     @property
     def type_description(self):
         return "NVIDIA Material Definition Language .mdl"
@@ -62,4 +63,5 @@ class SubstanceDesignerPackageMDLPublishPlugin(HookBaseClass):
 
     def _export(self, settings, item, path):
         pck = item.properties["package"]
+        sdmdlexporter = self._import_exporter("sd.api.mdl.sdmdlexporter")
         sdmdlexporter.SDMDLExporter.sExportPackage(pck, str(path))
@@ -8,4 +8,17 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-from .menu_generation import MenuGenerator, can_create_menu
+from .menu_generation import MenuGenerator, MenuBarWatcher, can_create_menu
+from .active_package import ActivePackageWatcher, get_active_package_path
+from .context_resolver import ContextResolver, AsyncContextResolver
+from .panel_registry import PanelRegistry
+from .filesystem_launcher import FileSystemLauncher
+from .startup_scheduler import StartupCommandScheduler
+from .thumbnails import ThumbnailGenerator
+from .export_scheduler import ExportScheduler
+from .performance import (
+    PerformanceMetrics,
+    PerformanceHud,
+    get_process_rss,
+    format_bytes,
+)
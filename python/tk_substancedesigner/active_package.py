@@ -0,0 +1,262 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Active package tracking for this engine
+
+"""
+
+from tank.platform.qt import QtGui, QtCore
+
+import sd
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+# Substance Designer UI manager callbacks that tell us that the current graph
+# might have changed. Not all of them exist in every version of the
+# application, so only the available ones are registered.
+UI_MGR_CALLBACKS = (
+    "registerGraphViewCreatedCallback",
+    "registerExplorerSelectionChangedCallback",
+)
+
+# time in ms to wait for a burst of notifications to settle before checking
+# the active package.
+DEBOUNCE_INTERVAL = 250
+
+# fallback polling intervals in ms, used only when no notification is
+# available. The interval doubles every time nothing changed.
+POLL_MIN_INTERVAL = 1000
+POLL_MAX_INTERVAL = 16000
+
+
+def get_active_package_path():
+    """
+    Returns the file path of the package the current graph belongs to, or None
+    if there is no current graph or its package was never saved.
+    """
+    ctx = sd.getContext()
+    app = ctx.getSDApplication()
+    uiMgr = app.getQtForPythonUIMgr()
+
+    current_graph = uiMgr.getCurrentGraph()
+    if current_graph:
+        pck = current_graph.getPackage()
+        return pck.getFilePath() or None
+
+    return None
+
+
+def get_panel(widget):
+    """
+    Returns the panel a widget belongs to: the page of the tab or stacked
+    widget it is in, ie. a graph view tab, or else its dock widget or window.
+    """
+    while widget is not None:
+        parent = widget.parentWidget()
+        if (
+            parent is None
+            or isinstance(widget, QtGui.QDockWidget)
+            or isinstance(parent, QtGui.QStackedWidget)
+        ):
+            return widget
+        widget = parent
+
+    return None
+
+
+class ActivePackageWatcher(QtCore.QObject):
+    """
+    Calls a callback every time the package of the current graph changes.
+
+    Changes are detected from Substance Designer UI manager callbacks and Qt
+    focus changes, so nothing runs while the application is idle. Only focus
+    changes that move to another panel are considered, since that is how the
+    user switches to another graph, ie. clicking from the explorer into a
+    graph view. Bursts of notifications are debounced into a single check. If
+    no notification source is available, it falls back to polling with an
+    adaptive back-off.
+
+    The last active package is kept while stopped, so starting again only
+    calls the callback if the active package changed in the meantime.
+    """
+
+    def __init__(self, engine, callback, parent=None):
+        super(ActivePackageWatcher, self).__init__(parent)
+
+        self._engine = engine
+        self._callback = callback
+        self._active_package = None
+        self._running = False
+        self._callback_ids = []
+        self._focus_connected = False
+        self._focused_panel = None
+
+        self._debounce_timer = QtCore.QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(DEBOUNCE_INTERVAL)
+        self._debounce_timer.timeout.connect(self._check)
+
+        self._poll_interval = POLL_MIN_INTERVAL
+        self._poll_timer = QtCore.QTimer(self)
+        self._poll_timer.setSingleShot(True)
+        self._poll_timer.timeout.connect(self._on_poll_timer)
+
+        # statistics, mostly useful to make sure we are not waking up
+        # when nothing happens.
+        self.wakeups = 0
+        self.changes = 0
+
+    @property
+    def is_running(self):
+        return self._running
+
+    def start(self):
+        """
+        Starts watching for active package changes.
+        """
+        if self._running:
+            return
+
+        self._running = True
+        self._focused_panel = None
+
+        ctx = sd.getContext()
+        app = ctx.getSDApplication()
+        uiMgr = app.getQtForPythonUIMgr()
+
+        for callback_name in UI_MGR_CALLBACKS:
+            register_callback = getattr(uiMgr, callback_name, None)
+            if not register_callback:
+                continue
+            try:
+                self._callback_ids.append(register_callback(self._on_changed))
+            except Exception as e:
+                self._engine.logger.debug(
+                    "Could not register '%s' callback: %s", callback_name, e
+                )
+
+        qt_app = QtGui.QApplication.instance()
+        if qt_app:
+            qt_app.focusChanged.connect(self._on_focus_changed)
+            self._focus_connected = True
+
+        if self._callback_ids or self._focus_connected:
+            self._engine.logger.debug(
+                "Watching the active package through %s UI callbacks%s.",
+                len(self._callback_ids),
+                " and focus changes" if self._focus_connected else "",
+            )
+        else:
+            self._engine.logger.debug(
+                "No notifications available, polling the active package."
+            )
+            self._poll_interval = POLL_MIN_INTERVAL
+            self._poll_timer.start(self._poll_interval)
+
+        # pick up the package that is active right now
+        self._debounce_timer.start()
+
+    def stop(self):
+        """
+        Stops watching for active package changes.
+        """
+        if not self._running:
+            return
+
+        self._running = False
+        self._debounce_timer.stop()
+        self._poll_timer.stop()
+
+        if self._callback_ids:
+            ctx = sd.getContext()
+            app = ctx.getSDApplication()
+            uiMgr = app.getQtForPythonUIMgr()
+            for callback_id in self._callback_ids:
+                try:
+                    uiMgr.unregisterCallback(callback_id)
+                except Exception as e:
+                    self._engine.logger.debug(
+                        "Could not unregister callback %s: %s", callback_id, e
+                    )
+            self._callback_ids = []
+
+        if self._focus_connected:
+            qt_app = QtGui.QApplication.instance()
+            if qt_app:
+                qt_app.focusChanged.disconnect(self._on_focus_changed)
+            self._focus_connected = False
+            self._focused_panel = None
+
+        self._engine.logger.debug(
+            "Stopped watching the active package (%s wakeups, %s changes).",
+            self.wakeups,
+            self.changes,
+        )
+
+    def _on_changed(self, *_):
+        """
+        Called for every notification, restarts the debounce timer so only
+        the last notification of a burst triggers a check.
+        """
+        if self._running:
+            self._debounce_timer.start()
+
+    def _on_focus_changed(self, old, new):
+        """
+        Called for every focus change in the application, only checks the
+        active package when the focus moved to another panel, so moving
+        around a panel, ie. editing properties, costs nothing.
+        """
+        if not self._running or new is None:
+            return
+
+        panel = get_panel(new)
+        if panel is self._focused_panel:
+            return
+
+        self._focused_panel = panel
+        self._debounce_timer.start()
+
+    def _on_poll_timer(self):
+        """
+        Fallback polling, backing off while the active package stays the same.
+        """
+        if not self._running:
+            return
+
+        if self._check():
+            self._poll_interval = POLL_MIN_INTERVAL
+        else:
+            self._poll_interval = min(self._poll_interval * 2, POLL_MAX_INTERVAL)
+
+        self._poll_timer.start(self._poll_interval)
+
+    def _check(self):
+        """
+        Calls the callback if the active package changed since the last check.
+
+        :returns: True if the active package changed, False otherwise.
+        """
+        if not self._running:
+            return False
+
+        self.wakeups += 1
+
+        active_package = get_active_package_path()
+        if active_package and active_package != self._active_package:
+            self._active_package = active_package
+            self.changes += 1
+            self._callback()
+            return True
+
+        return False
@@ -0,0 +1,277 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Package path to context resolution for this engine
+
+"""
+
+import os
+import time
+import threading
+import collections
+
+import tank
+from tank.platform.qt import QtCore
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+# pipeline configuration files that, when changed on disk, invalidate the
+# contexts resolved with that configuration.
+CONFIG_FILES = (
+    os.path.join("core", "templates.yml"),
+    os.path.join("core", "roots.yml"),
+)
+
+# maximum number of package paths to remember
+DEFAULT_MAX_SIZE = 64
+
+# time in seconds during which a pipeline configuration is considered
+# unchanged without checking its files on disk again.
+REVALIDATE_INTERVAL = 2.0
+
+
+class ContextResolver(object):
+    """
+    Memoizes the sgtk instance and context resolved for a package path.
+
+    Entries are kept in LRU order up to a maximum size, and are discarded when
+    the templates or roots of the pipeline configuration they were resolved
+    with change on disk.
+    """
+
+    def __init__(self, logger, max_size=DEFAULT_MAX_SIZE):
+        self._logger = logger
+        self._max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        # config location -> (config token, time of the last validation)
+        self._config_tokens = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """
+        Forgets all resolved contexts.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._config_tokens.clear()
+
+    def resolve(self, path, current_context=None):
+        """
+        Returns the sgtk instance and the context for a package path.
+
+        :param str path: Full path to the package file.
+        :param current_context: Context to use as the previous context when
+                                extracting a new one from the path.
+        :returns: tuple of (sgtk instance, context)
+        :raises: TankError if no sgtk instance could be found for the path.
+        """
+        key = _get_cache_key(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                tk, ctx, config_location = entry
+                if self._is_config_valid(config_location):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self._logger.debug(
+                        "Context cache hit for '%s' (hits: %s, misses: %s)",
+                        path,
+                        self.hits,
+                        self.misses,
+                    )
+                    return tk, ctx
+
+            self.misses += 1
+            self._logger.debug(
+                "Context cache miss for '%s' (hits: %s, misses: %s)",
+                path,
+                self.hits,
+                self.misses,
+            )
+
+        # toolkit lookups happen outside of the lock, they are the slow part
+        tk = tank.sgtk_from_path(path)
+        ctx = tk.context_from_path(path, current_context)
+
+        config_location = tk.pipeline_configuration.get_config_location()
+        config_token = _get_config_token(config_location)
+
+        with self._lock:
+            if config_location not in self._config_tokens:
+                self._config_tokens[config_location] = (config_token, time.time())
+
+            self._entries[key] = (tk, ctx, config_location)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+        return tk, ctx
+
+    def _is_config_valid(self, config_location):
+        """
+        Checks that the pipeline configuration did not change on disk since
+        the contexts were resolved. Stale entries are discarded.
+
+        Must be called with the lock held.
+        """
+        token, validated = self._config_tokens.get(config_location, (None, 0))
+
+        now = time.time()
+        if now - validated < REVALIDATE_INTERVAL:
+            return True
+
+        new_token = _get_config_token(config_location)
+        if new_token == token:
+            self._config_tokens[config_location] = (token, now)
+            return True
+
+        self._logger.debug(
+            "Pipeline configuration '%s' changed on disk, discarding cached contexts.",
+            config_location,
+        )
+        self._config_tokens.pop(config_location, None)
+        for key, entry in list(self._entries.items()):
+            if entry[2] == config_location:
+                del self._entries[key]
+
+        return False
+
+
+class AsyncContextResolver(QtCore.QObject):
+    """
+    Resolves contexts on a worker thread and calls back on the main thread.
+
+    Only the most recent request is honoured: requests made while the worker
+    is busy replace each other, and results of requests that were superseded
+    by a newer one are discarded.
+    """
+
+    # request id, (sgtk instance, context) or None, exception or None
+    _resolved = QtCore.Signal(int, object, object)
+
+    def __init__(self, resolver, logger, parent=None):
+        super(AsyncContextResolver, self).__init__(parent)
+
+        self._resolver = resolver
+        self._logger = logger
+        self._lock = threading.Lock()
+        self._request_id = 0
+        self._pending = None
+        self._callbacks = {}
+        self._worker = None
+
+        # emitted from the worker thread, so delivered in the main thread
+        self._resolved.connect(self._on_resolved, QtCore.Qt.QueuedConnection)
+
+    def resolve(self, path, current_context, callback):
+        """
+        Requests the context for a package path.
+
+        :param str path: Full path to the package file.
+        :param current_context: Context to use as the previous context when
+                                extracting a new one from the path.
+        :param callback: Called in the main thread with the arguments
+                         (sgtk instance, context, exception). The exception
+                         is None when the resolution succeeded.
+        """
+        with self._lock:
+            self._request_id += 1
+            request_id = self._request_id
+            self._pending = (request_id, path, current_context)
+            self._callbacks = {request_id: callback}
+
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="tk-substancedesigner context resolver"
+                )
+                self._worker.daemon = True
+                self._worker.start()
+
+        self._logger.debug(
+            "Requested context resolution #%s for '%s'", request_id, path
+        )
+
+    def cancel(self):
+        """
+        Discards the result of any request in flight.
+        """
+        with self._lock:
+            self._request_id += 1
+            self._pending = None
+            self._callbacks = {}
+
+    def _run(self):
+        """
+        Worker thread, resolves the latest pending request until none is left.
+        """
+        while True:
+            with self._lock:
+                request = self._pending
+                self._pending = None
+                if request is None:
+                    self._worker = None
+                    return
+
+            request_id, path, current_context = request
+            try:
+                result = self._resolver.resolve(path, current_context)
+                error = None
+            except Exception as e:
+                result = None
+                error = e
+
+            self._resolved.emit(request_id, result, error)
+
+    def _on_resolved(self, request_id, result, error):
+        """
+        Main thread, calls back with the result if it is still current.
+        """
+        with self._lock:
+            callback = self._callbacks.pop(request_id, None)
+
+        if callback is None:
+            self._logger.debug(
+                "Discarding context resolution #%s, a newer one was requested.",
+                request_id,
+            )
+            return
+
+        tk, ctx = result if result else (None, None)
+        callback(tk, ctx, error)
+
+
+def _get_cache_key(path):
+    """
+    Returns the normalized package directory and file name for a path.
+    """
+    path = os.path.normcase(os.path.abspath(path))
+    return os.path.dirname(path), os.path.basename(path)
+
+
+def _get_config_token(config_location):
+    """
+    Returns a value that changes when the configuration files change on disk.
+    """
+    token = []
+    for config_file in CONFIG_FILES:
+        try:
+            stat = os.stat(os.path.join(config_location, config_file))
+            token.append((config_file, stat.st_mtime, stat.st_size))
+        except OSError:
+            token.append((config_file, None, None))
+
+    return tuple(token)
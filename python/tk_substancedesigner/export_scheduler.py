@@ -0,0 +1,110 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Background jobs for the file only part of the publish exports
+
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+# default number of exports running at the same time
+EXPORT_WORKERS = 4
+
+
+class ExportScheduler(object):
+    """
+    Runs export jobs in a pool of threads.
+
+    Only the part of an export that does not need Designer, ie. copying the
+    exported files to the publish location, can run here, since its API can
+    only be used from the main thread.
+
+    Every job declares the path it writes to. Jobs writing to different paths
+    run at the same time, while a job writing to the same path as a previous
+    one waits for it first. The publish plugins wait for the job of each item
+    in turn when finalizing it, so errors are reported for the item that
+    failed and in the order the publisher processes them.
+    """
+
+    def __init__(self, logger, max_workers=EXPORT_WORKERS):
+        """
+        :param logger: Logger to report the jobs to.
+        :param max_workers: Number of jobs running at the same time.
+        """
+        self._logger = logger
+        self._max_workers = max(1, max_workers)
+        self._executor = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, output_path, func, *args):
+        """
+        Schedules func to be called with args in the background, writing to
+        output_path. Returns the output path, that identifies the job.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+
+            previous_job = self._jobs.get(output_path)
+            self._jobs[output_path] = self._executor.submit(
+                self._run, previous_job, output_path, func, args
+            )
+
+        self._logger.debug("Scheduled export to %s", output_path)
+        return output_path
+
+    def wait(self, output_path):
+        """
+        Waits for the job writing to output_path to finish, raising the error
+        it failed with if any.
+        """
+        with self._lock:
+            job = self._jobs.get(output_path)
+
+        if job is None:
+            return
+
+        try:
+            job.result()
+        finally:
+            with self._lock:
+                if self._jobs.get(output_path) is job:
+                    del self._jobs[output_path]
+
+    def shutdown(self):
+        """
+        Waits for the scheduled jobs to finish and stops the threads.
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._jobs = {}
+
+        if executor:
+            executor.shutdown(wait=True)
+
+    def _run(self, previous_job, output_path, func, args):
+        # never write to the same path at the same time, whatever the outcome
+        # of the previous job was, it is reported to its own item.
+        if previous_job is not None:
+            try:
+                previous_job.result()
+            except Exception:
+                pass
+
+        func(*args)
+        self._logger.debug("Finished export to %s", output_path)
@@ -0,0 +1,140 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Opening of file system locations in the file browser of the OS
+
+"""
+
+import os
+import sys
+import threading
+import subprocess
+
+from tank.util import is_windows, is_linux, is_macos
+from tank.platform.qt import QtCore
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+# time in seconds to wait for a location to answer before giving up on it,
+# ie. a network mount that is not reachable.
+STAT_TIMEOUT = 2.0
+
+
+def get_file_browser_args(path):
+    """
+    Returns the command line that opens a folder in the file browser of the
+    current OS.
+    """
+    if is_linux():
+        return ["xdg-open", path]
+    elif is_macos():
+        return ["open", path]
+    elif is_windows():
+        return ["explorer", path]
+
+    raise Exception("Platform '%s' is not supported." % sys.platform)
+
+
+def stat_with_timeout(path, timeout=STAT_TIMEOUT):
+    """
+    Returns the real path of a folder if it exists and answers in time, None
+    otherwise.
+    """
+    result = {}
+
+    def stat():
+        real_path = os.path.realpath(path)
+        if os.path.isdir(real_path):
+            result["path"] = real_path
+
+    # the stat itself can hang on an unreachable mount, so it runs in its own
+    # thread that is simply abandoned if it does not answer in time.
+    worker = threading.Thread(target=stat)
+    worker.daemon = True
+    worker.start()
+    worker.join(timeout)
+
+    return result.get("path")
+
+
+class FileSystemLauncher(QtCore.QObject):
+    """
+    Opens folders in the file browser without blocking the application.
+
+    The locations are checked and the file browsers started in a worker
+    thread, as detached processes nobody waits for. Locations that do not
+    exist, do not answer or are repeated are skipped, and failures are
+    reported back in the main thread.
+    """
+
+    _failed = QtCore.Signal(str)
+
+    def __init__(self, logger, args_callback=get_file_browser_args, parent=None):
+        """
+        :param logger: Logger to report failures to.
+        :param args_callback: Callable returning the command line that opens
+                              a given folder.
+        """
+        super(FileSystemLauncher, self).__init__(parent)
+
+        self._logger = logger
+        self._args_callback = args_callback
+        self._failed.connect(self._on_failed, QtCore.Qt.QueuedConnection)
+
+    def open(self, paths):
+        """
+        Opens the given folders, returning right away.
+        """
+        worker = threading.Thread(target=self._open, args=(list(paths),))
+        worker.daemon = True
+        worker.start()
+
+    def _open(self, paths):
+        opened = set()
+        for path in paths:
+            real_path = stat_with_timeout(path)
+            if not real_path:
+                self._failed.emit("'%s' does not exist or is not reachable." % path)
+                continue
+
+            key = os.path.normcase(real_path)
+            if key in opened:
+                continue
+            opened.add(key)
+
+            try:
+                self._start_detached(self._args_callback(path))
+            except Exception as e:
+                self._failed.emit("Failed to open '%s': %s" % (path, e))
+
+    def _start_detached(self, args):
+        """
+        Starts a process without waiting for it or keeping its handles.
+        """
+        kwargs = {
+            "stdin": subprocess.DEVNULL,
+            "stdout": subprocess.DEVNULL,
+            "stderr": subprocess.DEVNULL,
+            "close_fds": True,
+        }
+        if is_windows():
+            kwargs["creationflags"] = (
+                subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+            )
+        else:
+            kwargs["start_new_session"] = True
+
+        subprocess.Popen(args, **kwargs)
+
+    def _on_failed(self, message):
+        self._logger.error("Jump to File System | %s", message)
@@ -14,16 +14,17 @@ Menu handling for this engine
 """
 
 import tank
-import sys
 import os
-import subprocess
+import time
 import unicodedata
+from functools import partial
 
-from tank.util import is_windows, is_linux, is_macos
 from tank.platform.qt import QtGui, QtCore
 
 import sd
 
+from .filesystem_launcher import FileSystemLauncher
+
 __author__ = "Diego Garcia Huerta"
 __contact__ = "https://www.linkedin.com/in/diegogh/"
 
@@ -32,17 +33,158 @@ def can_create_menu():
     """
     This is used to indicate if the menu can be created in this DCC app.
     Only when there is a menu bar available we can create the menu.
+
+    The menu bar is looked for instead of calling menuBar(), since that
+    creates an empty one when the window does not have it yet.
     """
     ctx = sd.getContext()
     app = ctx.getSDApplication()
     uiMgr = app.getQtForPythonUIMgr()
 
     main_window = uiMgr.getMainWindow()
-    menu_bar = main_window.menuBar()
+    if main_window is None:
+        return False
+
+    menu_bar = main_window.findChild(QtGui.QMenuBar)
 
     return menu_bar is not None
 
 
+class MenuBarWatcher(QtCore.QObject):
+    """
+    Calls a callback once the menu bar is available to create the menu.
+
+    Instead of checking periodically, it listens to the events of the main
+    window, which changes when the application builds its UI. A few checks
+    with an exponential back-off are still done in case those events are
+    missed or the main window does not exist yet. After BACKOFF_MAX_CHECKS
+    only the events of the main window are listened to, or it gives up if
+    there is no main window to listen to.
+    """
+
+    # the events of the main window that can mean that the menu bar is ready
+    EVENT_TYPES = (
+        QtCore.QEvent.ChildAdded,
+        QtCore.QEvent.Show,
+        QtCore.QEvent.LayoutRequest,
+    )
+
+    # back-off checks in ms, the interval doubles every check
+    BACKOFF_MIN_INTERVAL = 200
+    BACKOFF_MAX_INTERVAL = 6400
+    BACKOFF_MAX_CHECKS = 12
+
+    def __init__(self, callback, logger, parent=None):
+        """
+        :param callback: Called with the number of seconds waited once the
+                         menu can be created.
+        :param logger: Logger to report progress to.
+        """
+        super(MenuBarWatcher, self).__init__(parent)
+
+        self._callback = callback
+        self._logger = logger
+        self._main_window = None
+        self._start_time = None
+        self._checks = 0
+        self._interval = self.BACKOFF_MIN_INTERVAL
+
+        self._backoff_timer = QtCore.QTimer(self)
+        self._backoff_timer.setSingleShot(True)
+        self._backoff_timer.timeout.connect(self._on_backoff_timer)
+
+    @property
+    def is_waiting(self):
+        return self._start_time is not None
+
+    def start(self):
+        """
+        Starts waiting for the menu bar, calling back right away if it is
+        already available.
+        """
+        if self.is_waiting:
+            return
+
+        self._start_time = time.time()
+        self._checks = 0
+        self._interval = self.BACKOFF_MIN_INTERVAL
+
+        if self._check():
+            return
+
+        self._logger.debug("Waiting for the menu bar to be available...")
+        self._watch_main_window()
+        self._backoff_timer.start(self._interval)
+
+    def stop(self):
+        """
+        Stops waiting for the menu bar.
+        """
+        self._start_time = None
+        self._backoff_timer.stop()
+        if self._main_window is not None:
+            self._main_window.removeEventFilter(self)
+            self._main_window = None
+
+    def eventFilter(self, obj, event):
+        if event.type() in self.EVENT_TYPES:
+            self._check()
+        return False
+
+    def _watch_main_window(self):
+        if self._main_window is not None:
+            return
+
+        ctx = sd.getContext()
+        app = ctx.getSDApplication()
+        uiMgr = app.getQtForPythonUIMgr()
+
+        main_window = uiMgr.getMainWindow()
+        if main_window is not None:
+            main_window.installEventFilter(self)
+            self._main_window = main_window
+
+    def _on_backoff_timer(self):
+        if not self.is_waiting or self._check():
+            return
+
+        self._checks += 1
+
+        # the main window might have been created in the meantime
+        self._watch_main_window()
+
+        if self._checks >= self.BACKOFF_MAX_CHECKS:
+            if self._main_window is None:
+                self._logger.warning(
+                    "Gave up waiting for the main window to create the Shotgun menu."
+                )
+                self.stop()
+            else:
+                self._logger.debug(
+                    "Menu bar not available after %s checks, waiting for the "
+                    "main window events only.",
+                    self._checks,
+                )
+            return
+
+        self._interval = min(self._interval * 2, self.BACKOFF_MAX_INTERVAL)
+        self._backoff_timer.start(self._interval)
+
+    def _check(self):
+        """
+        Calls back if the menu bar is available.
+        """
+        if not self.is_waiting or not can_create_menu():
+            return False
+
+        elapsed = time.time() - self._start_time
+        self.stop()
+
+        self._logger.debug("Menu bar available after %.3f seconds.", elapsed)
+        self._callback(elapsed)
+        return True
+
+
 def get_or_create_shotgun_menu(menu_name):
     """
     Creates or retrieves the Shotgun Menu entry in the Menu bar.
@@ -69,6 +211,19 @@ def get_or_create_shotgun_menu(menu_name):
     return menu
 
 
+def apply_action_properties(action, properties):
+    """
+    Applies the properties of a command to its menu action. Whether it is
+    enabled is evaluated when its menu is shown.
+    """
+    if "tooltip" in properties:
+        action.setToolTip(properties["tooltip"])
+        action.setStatusTip(properties["tooltip"])
+    if "checkable" in properties:
+        action.setCheckable(True)
+        action.setChecked(properties.get("checkable"))
+
+
 # borrowed from tk-maya, needed to remove the args from the QAction callbacks
 class Callback(object):
     def __init__(self, callback):
@@ -115,12 +270,37 @@ class MenuGenerator(object):
         self._engine = engine
         self._menu_name = menu_name
         self._handle = None
+        self._connected_handle = None
+        self._filesystem_launcher = None
+        self._context_menu = None
+        self._context_switch_action = None
+
+        # structure of the menu last rendered, the current commands and the
+        # actions created for each one of them, keyed by
+        # (app instance, command name, type)
+        self._layout = None
+        self._commands = {}
+        self._command_actions = {}
+
+        # sub menus only get their entries the first time they are shown,
+        # and the commands of every menu are enabled or disabled every time
+        # it is shown.
+        self._pending_menus = {}
+        self._menu_commands = {}
+
+        # index of the apps of the engine, rebuilt every time the menu is
+        # rendered
+        self._app_instance_names = {}
+        self._documentation_urls = {}
 
     def create_menu(self, disabled=False):
         """
         Render the entire Shotgun menu.
-        In order to have commands enable/disable themselves based on the
-        enable_callback, re-create the menu items every time.
+
+        If the menu already shows the same commands in the same places, the
+        existing entries are updated instead, so changing the context does
+        not rebuild the whole menu every time. The sub menus are only filled
+        in when they are first shown.
         """
         self._handle = get_or_create_shotgun_menu(self._menu_name)
 
@@ -129,22 +309,69 @@ class MenuGenerator(object):
         if not self._handle:
             return
 
-        self._handle.clear()
+        if self._connected_handle is not self._handle:
+            self._connected_handle = self._handle
+            self._connect_about_to_show(self._handle)
 
         if disabled:
+            self._clear_menu()
             self._handle.addMenu("Sgtk is disabled.")
             return
 
-        self._handle.setEnabled(False)
-        QtGui.QApplication.processEvents()
+        menu_items = self._get_menu_items()
+        layout = self._get_layout(menu_items)
+        self._commands = dict((cmd.get_key(), cmd) for cmd in menu_items)
 
-        # now add the context item on top of the main menu
-        self._context_menu = self._add_context_menu()
+        if layout == self._layout and not self._handle.isEmpty():
+            self._engine.log_debug("Updating the menu in place.")
+            self._update_menu()
+        else:
+            self._build_menu(menu_items)
+            self._layout = layout
 
-        # add menu divider
-        self._add_divider(self._handle)
+    def _clear_menu(self):
+        """
+        Removes all the entries of the menu.
+        """
+        self._handle.clear()
+        self._context_menu = None
+        self._context_switch_action = None
+        self._layout = None
+        self._command_actions = {}
+        self._pending_menus = {}
+        self._menu_commands = {}
+
+    def get_app_instance_name(self, app):
+        """
+        Returns the instance name of an app of the engine, or None.
+        """
+        return self._app_instance_names.get(app)
+
+    def get_documentation_url(self, app):
+        """
+        Returns the documentation url of an app of the engine.
+        """
+        if app not in self._documentation_urls:
+            self._documentation_urls[app] = app.documentation_url
+        return self._documentation_urls[app]
+
+    def _index_apps(self):
+        """
+        Indexes the apps of the engine, so commands find out about their
+        app without going through all of them.
+        """
+        self._app_instance_names = dict(
+            (app, app_instance_name)
+            for (app_instance_name, app) in self._engine.apps.items()
+        )
+        self._documentation_urls = {}
+
+    def _get_menu_items(self):
+        """
+        Returns the commands registered in the engine, sorted by name.
+        """
+        self._index_apps()
 
-        # now enumerate all items and create menu objects for them
         menu_items = []
         for (cmd_name, cmd_details) in self._engine.commands.items():
             self._engine.log_debug("engine command: %s : %s" % (cmd_name, cmd_details))
@@ -155,22 +382,65 @@ class MenuGenerator(object):
         # sort list of commands in name order
         menu_items.sort(key=lambda x: x.name)
 
+        return menu_items
+
+    def _get_layout(self, menu_items):
+        """
+        Returns a description of where every entry goes in the menu. Two
+        menus with the same layout only differ in their labels, callbacks and
+        enabled state.
+        """
+        return (
+            bool(self._engine.context.filesystem_locations),
+            tuple(
+                (fav["app_instance"], fav["name"])
+                for fav in self._engine.get_setting("menu_favourites")
+            ),
+            tuple((cmd.get_key(), cmd.get_app_name()) for cmd in menu_items),
+        )
+
+    def _update_menu(self):
+        """
+        Updates the entries of the menu already rendered with the current
+        context and commands.
+        """
+        self._context_menu.setTitle(str(self._engine.context))
+        if self._context_switch_action:
+            self._context_switch_action.setChecked(
+                self._engine.active_package_context_switch
+            )
+
+        for (key, actions) in self._command_actions.items():
+            cmd = self._commands[key]
+            for (action, callback) in actions:
+                # the engine registers new callbacks on every context change
+                callback.callback = cmd.callback
+                cmd.update_action(action)
+
+    def _build_menu(self, menu_items):
+        """
+        Renders the whole menu from scratch.
+        """
+        self._clear_menu()
+
+        # now add the context item on top of the main menu
+        self._context_menu = self._add_context_menu(
+            [cmd.get_key() for cmd in menu_items if cmd.get_type() == "context_menu"]
+        )
+
+        # add menu divider
+        self._add_divider(self._handle)
+
         # now add favourites
+        commands_by_instance = dict(
+            ((cmd.get_app_instance_name(), cmd.name), cmd) for cmd in menu_items
+        )
         for fav in self._engine.get_setting("menu_favourites"):
-            app_instance_name = fav["app_instance"]
-            menu_name = fav["name"]
-
-            # scan through all menu items
-            for cmd in menu_items:
-                self._engine.log_debug("cmd: %s" % cmd.name)
-                if (
-                    cmd.get_app_instance_name() == app_instance_name
-                    and cmd.name == menu_name
-                ):
-                    # found our match!
-                    cmd.add_command_to_menu(self._handle)
-                    # mark as a favourite item
-                    cmd.favourite = True
+            cmd = commands_by_instance.get((fav["app_instance"], fav["name"]))
+            if cmd:
+                cmd.add_command_to_menu(self._handle)
+                # mark as a favourite item
+                cmd.favourite = True
 
         # add menu divider
         self._add_divider(self._handle)
@@ -180,11 +450,7 @@ class MenuGenerator(object):
         commands_by_app = {}
 
         for cmd in menu_items:
-            if cmd.get_type() == "context_menu":
-                # context menu!
-                cmd.add_command_to_menu(self._context_menu)
-
-            else:
+            if cmd.get_type() != "context_menu":
                 # normal menu
                 app_name = cmd.get_app_name()
                 if app_name is None:
@@ -198,7 +464,40 @@ class MenuGenerator(object):
         # now add all apps to main menu
         self._add_app_menu(commands_by_app)
 
-        self._handle.setEnabled(True)
+    def _register_command_action(self, cmd, menu, action, callback):
+        """
+        Keeps track of the actions created for a command, so they can be
+        updated later on.
+        """
+        key = cmd.get_key()
+        self._command_actions.setdefault(key, []).append((action, callback))
+        self._menu_commands.setdefault(menu, []).append((key, action))
+
+    def _connect_about_to_show(self, menu):
+        menu.aboutToShow.connect(partial(self._on_about_to_show, menu))
+
+    def _on_about_to_show(self, menu):
+        """
+        Fills in a menu the first time it is shown, and enables or disables
+        its commands according to their current state.
+        """
+        populate = self._pending_menus.pop(menu, None)
+        if populate:
+            populate()
+
+        for (key, action) in self._menu_commands.get(menu, []):
+            cmd = self._commands.get(key)
+            if cmd:
+                cmd.update_enabled_state(action)
+
+    def _populate_menu(self, menu, keys):
+        """
+        Adds the current commands with the given keys to a menu.
+        """
+        for key in keys:
+            cmd = self._commands.get(key)
+            if cmd:
+                cmd.add_command_to_menu(menu)
 
     def _add_divider(self, parent_menu):
         divider = QtGui.QAction(parent_menu)
@@ -209,29 +508,28 @@ class MenuGenerator(object):
     def _add_sub_menu(self, menu_name, parent_menu):
         sub_menu = QtGui.QMenu(title=menu_name, parent=parent_menu)
         parent_menu.addMenu(sub_menu)
+        self._connect_about_to_show(sub_menu)
         return sub_menu
 
     def _add_menu_item(self, name, parent_menu, callback, properties=None):
         action = QtGui.QAction(name, parent_menu)
         parent_menu.addAction(action)
         if callback:
-            action.triggered.connect(Callback(callback))
+            if not isinstance(callback, Callback):
+                callback = Callback(callback)
+            action.triggered.connect(callback)
 
         if properties:
-            if "tooltip" in properties:
-                action.setTooltip(properties["tooltip"])
-                action.setStatustip(properties["tooltip"])
-            if "enable_callback" in properties:
-                action.setEnabled(properties["enable_callback"]())
-            if "checkable" in properties:
-                action.setCheckable(True)
-                action.setChecked(properties.get("checkable"))
+            apply_action_properties(action, properties)
 
         return action
 
-    def _add_context_menu(self):
+    def _add_context_menu(self, keys):
         """
-        Adds a context menu which displays the current context
+        Adds a context menu which displays the current context. Its entries
+        are added the first time it is shown.
+
+        :param keys: Keys of the commands registered for the context menu.
         """
 
         ctx = self._engine.context
@@ -242,8 +540,17 @@ class MenuGenerator(object):
         # context may contain info with non-ascii characters
 
         ctx_menu = self._add_sub_menu(ctx_name, self._handle)
+        self._pending_menus[ctx_menu] = partial(
+            self._populate_context_menu, ctx_menu, keys
+        )
 
-        self._add_menu_item(
+        return ctx_menu
+
+    def _populate_context_menu(self, ctx_menu, keys):
+        """
+        Adds the entries of the context menu.
+        """
+        self._context_switch_action = self._add_menu_item(
             "Update Menu on Active Package change",
             ctx_menu,
             self._toggle_multi_document,
@@ -255,13 +562,13 @@ class MenuGenerator(object):
         self._add_menu_item("Jump to Shotgun", ctx_menu, self._jump_to_sg)
 
         # Add the menu item only when there are some file system locations.
-        if ctx.filesystem_locations:
+        if self._engine.context.filesystem_locations:
             self._add_menu_item("Jump to File System", ctx_menu, self._jump_to_fs)
 
         # divider (apps may register entries below this divider)
         self._add_divider(ctx_menu)
 
-        return ctx_menu
+        self._populate_menu(ctx_menu, keys)
 
     def _toggle_multi_document(self):
         """
@@ -281,26 +588,11 @@ class MenuGenerator(object):
         """
         Jump from context to FS
         """
-        # launch one window for each location on disk
-        paths = self._engine.context.filesystem_locations
-        for disk_location in paths:
-
-            # get the setting
-            system = sys.platform
-
-            # run the app
-            if is_linux():
-                args = ["xdg-open", disk_location]
-            elif is_macos():
-                args = ['open "%s"', disk_location]
-            elif is_windows():
-                args = ["cmd.exe", "/C", "start", '"Folder %s"' % disk_location]
-            else:
-                raise Exception("Platform '%s' is not supported." % system)
-
-            exit_code = subprocess.check_output(args, shell=False)
-            if exit_code != 0:
-                self._engine.logger.error("Failed to launch '%s'!", args)
+        # launch one window for each location on disk, without waiting for
+        # the file browser to come up
+        if not self._filesystem_launcher:
+            self._filesystem_launcher = FileSystemLauncher(self._engine.logger)
+        self._filesystem_launcher.open(self._engine.context.filesystem_locations)
 
     def _add_app_menu(self, commands_by_app):
         """
@@ -317,8 +609,10 @@ class MenuGenerator(object):
                 # make sure it is in alphabetical order
                 cmds.sort(key=lambda x: x.name)
 
-                for cmd in cmds:
-                    cmd.add_command_to_menu(app_menu)
+                # the commands are added when the menu is first shown
+                self._pending_menus[app_menu] = partial(
+                    self._populate_menu, app_menu, [cmd.get_key() for cmd in cmds]
+                )
             else:
                 # this app only has a single entry.
                 # display that on the menu
@@ -342,7 +636,8 @@ class AppCommand(object):
         self.favourite = False
         self.logger = logger
 
-        engine = self.parent._engine
+        app = self.properties.get("app")
+        self._app_instance_name = parent.get_app_instance_name(app) if app else None
 
     def get_app_name(self):
         """
@@ -357,28 +652,16 @@ class AppCommand(object):
         Returns the name of the app instance, as defined in the environment.
         Returns None if not found.
         """
-        if "app" not in self.properties:
-            return None
-
-        app_instance = self.properties["app"]
-        engine = app_instance.engine
-
-        for (app_instance_name, app_instance_obj) in engine.apps.items():
-            if app_instance_obj == app_instance:
-                # found our app!
-                return app_instance_name
-
-        return None
+        return self._app_instance_name
 
     def get_documentation_url_str(self):
         """
         Returns the documentation as a str
         """
         if "app" in self.properties:
-            app = self.properties["app"]
-            doc_url = app.documentation_url
+            doc_url = self.parent.get_documentation_url(self.properties["app"])
             # deal with nuke's inability to handle unicode. #fail
-            if doc_url.__class__ == unicode:
+            if doc_url and not isinstance(doc_url, str):
                 doc_url = unicodedata.normalize("NFKD", doc_url).encode(
                     "ascii", "ignore"
                 )
@@ -392,6 +675,28 @@ class AppCommand(object):
         """
         return self.properties.get("type", "default")
 
+    def get_key(self):
+        """
+        Returns the key identifying this command between menu updates.
+        """
+        return (self.get_app_instance_name(), self.name, self.get_type())
+
+    def update_action(self, action):
+        """
+        Updates an action previously created for this command.
+        """
+        action.setText(self.name.split("/")[-1])
+        apply_action_properties(action, self.properties)
+
+    def update_enabled_state(self, action):
+        """
+        Enables or disables the action of this command according to its
+        enable_callback, if it has one.
+        """
+        enable_callback = self.properties.get("enable_callback")
+        if enable_callback:
+            action.setEnabled(enable_callback())
+
     def add_command_to_menu(self, menu):
         """
         Adds an app command to the menu
@@ -412,6 +717,18 @@ class AppCommand(object):
                 parent_menu = self.parent._add_sub_menu(item_label, parent_menu)
 
         # self._execute_deferred)
-        self.parent._add_menu_item(
-            parts[-1], parent_menu, self.callback, self.properties
+        callback = Callback(self.callback)
+        action = self.parent._add_menu_item(
+            parts[-1], parent_menu, callback, self.properties
         )
+        self.parent._register_command_action(self, parent_menu, action, callback)
+
+    def _find_sub_menu_item(self, menu, label):
+        """
+        Returns the sub menu of the given menu with the given label, or None.
+        """
+        for action in menu.actions():
+            if action.menu() and action.text() == label:
+                return action.menu()
+
+        return None
@@ -0,0 +1,93 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Registry of the panels docked by this engine
+
+"""
+
+from functools import partial
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+class PanelRegistry(object):
+    """
+    Keeps track of the dock widget and the widget instance of every panel
+    shown by the engine, so they can be found again without searching the
+    application widgets.
+
+    The dock widgets are owned by the application, so their python wrappers
+    would be collected as soon as they are no longer used. Strong references
+    are therefore kept, and entries are removed as soon as Qt destroys the
+    widgets. Closing a panel only hides it, so it is shown again from the
+    registry. Since the destroyed signal of a widget might not reach python,
+    ie. while the application shuts down, the widgets are also checked to be
+    alive when looked up.
+    """
+
+    def __init__(self):
+        self._dock_widgets = {}
+        self._widget_instances = {}
+
+    def get_dock_widget(self, panel_id):
+        """
+        Returns the dock widget registered for a panel or None.
+        """
+        return self._get(self._dock_widgets, panel_id)
+
+    def get_widget_instance(self, panel_id):
+        """
+        Returns the widget instance registered for a panel or None.
+        """
+        return self._get(self._widget_instances, panel_id)
+
+    def register_dock_widget(self, panel_id, dock_widget):
+        """
+        Registers the dock widget for a panel.
+        """
+        self._register(self._dock_widgets, panel_id, dock_widget)
+
+    def register_widget_instance(self, panel_id, widget_instance):
+        """
+        Registers the widget instance for a panel.
+        """
+        self._register(self._widget_instances, panel_id, widget_instance)
+
+    def _get(self, widgets, panel_id):
+        widget = widgets.get(panel_id)
+        if widget is None:
+            return None
+
+        try:
+            widget.objectName()
+        except RuntimeError:
+            # the C++ object was deleted without telling us
+            del widgets[panel_id]
+            return None
+
+        return widget
+
+    def _register(self, widgets, panel_id, widget):
+        if widgets.get(panel_id) is widget:
+            return
+
+        widgets[panel_id] = widget
+
+        # the slot must not hold the widget, or its wrapper would outlive it
+        widget.destroyed.connect(
+            partial(self._on_destroyed, widgets, panel_id, id(widget))
+        )
+
+    def _on_destroyed(self, widgets, panel_id, widget_id, *_):
+        # only forget the entry if it was not replaced in the meantime
+        if id(widgets.get(panel_id)) == widget_id:
+            del widgets[panel_id]
@@ -0,0 +1,224 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Performance metrics of this engine and the panel to display them
+
+"""
+
+import os
+import sys
+import time
+import threading
+import contextlib
+import collections
+
+from tank.platform.qt import QtGui, QtCore
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+# number of samples kept for every timing
+MAX_SAMPLES = 20
+
+# the panel never refreshes faster than this, in ms
+REFRESH_INTERVAL = 1000
+
+
+def get_process_rss():
+    """
+    Returns the resident memory of this process in bytes, or None if it
+    cannot be determined. On macOS this is the peak resident memory.
+    """
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/statm") as statm:
+                pages = int(statm.read().split()[1])
+            return pages * os.sysconf("SC_PAGE_SIZE")
+
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            ctypes.windll.psapi.GetProcessMemoryInfo(
+                ctypes.windll.kernel32.GetCurrentProcess(),
+                ctypes.byref(counters),
+                counters.cb,
+            )
+            return counters.WorkingSetSize
+
+        import resource
+
+        # reported in bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except Exception:
+        return None
+
+
+class PerformanceMetrics(object):
+    """
+    Collects the duration of the last few runs of the operations of the
+    engine we care about, and callbacks to sample other values on demand.
+
+    Recording is cheap and thread safe, the values are only looked at when
+    they are displayed.
+    """
+
+    def __init__(self, max_samples=MAX_SAMPLES):
+        self._max_samples = max_samples
+        self._timings = {}
+        self._gauges = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, name, duration):
+        """
+        Records the duration of an operation.
+
+        :param str name: Name of the operation.
+        :param float duration: Duration in seconds.
+        """
+        with self._lock:
+            samples = self._timings.get(name)
+            if samples is None:
+                samples = collections.deque(maxlen=self._max_samples)
+                self._timings[name] = samples
+            samples.append(duration)
+
+    @contextlib.contextmanager
+    def timed(self, name):
+        """
+        Context manager that records the duration of the code it wraps.
+        """
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.record(name, time.time() - start)
+
+    def add_gauge(self, name, callback, formatter=None):
+        """
+        Adds a value sampled when the metrics are displayed.
+
+        :param str name: Name of the value.
+        :param callback: Callable returning the current value.
+        :param formatter: Optional callable to convert the value to text.
+        """
+        with self._lock:
+            self._gauges[name] = (callback, formatter or str)
+
+    def get_timings(self):
+        """
+        Returns a list of (name, durations) sorted by name.
+        """
+        with self._lock:
+            return sorted(
+                (name, list(samples)) for (name, samples) in self._timings.items()
+            )
+
+    def get_gauges(self):
+        """
+        Returns a list of (name, value as text) sampled right now.
+        """
+        with self._lock:
+            gauges = list(self._gauges.items())
+
+        values = []
+        for name, (callback, formatter) in gauges:
+            try:
+                value = callback()
+                values.append((name, "-" if value is None else formatter(value)))
+            except Exception as e:
+                values.append((name, "error: %s" % e))
+
+        return values
+
+
+def format_bytes(value):
+    """
+    Returns a number of bytes as text.
+    """
+    return "%.1f MB" % (value / (1024.0 * 1024.0))
+
+
+class PerformanceHud(QtGui.QWidget):
+    """
+    Panel that displays the engine performance metrics. It only refreshes
+    while it is visible, once per second.
+    """
+
+    COLUMNS = ["Metric", "Last", "Average", "Max", "Samples"]
+
+    def __init__(self, metrics, parent=None):
+        super(PerformanceHud, self).__init__(parent)
+
+        self._metrics = metrics
+
+        layout = QtGui.QVBoxLayout(self)
+        self._tree = QtGui.QTreeWidget(self)
+        self._tree.setColumnCount(len(self.COLUMNS))
+        self._tree.setHeaderLabels(self.COLUMNS)
+        self._tree.setRootIsDecorated(False)
+        layout.addWidget(self._tree)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(REFRESH_INTERVAL)
+        self._timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self._timer.start()
+        super(PerformanceHud, self).showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super(PerformanceHud, self).hideEvent(event)
+
+    def refresh(self):
+        """
+        Displays the current metrics.
+        """
+        self._tree.clear()
+
+        for name, value in self._metrics.get_gauges():
+            QtGui.QTreeWidgetItem(self._tree, [name, value, "", "", ""])
+
+        for name, samples in self._metrics.get_timings():
+            if not samples:
+                continue
+            QtGui.QTreeWidgetItem(
+                self._tree,
+                [
+                    name,
+                    "%.1f ms" % (samples[-1] * 1000.0),
+                    "%.1f ms" % (sum(samples) * 1000.0 / len(samples)),
+                    "%.1f ms" % (max(samples) * 1000.0),
+                    str(len(samples)),
+                ],
+            )
+
+        for column in range(len(self.COLUMNS)):
+            self._tree.resizeColumnToContents(column)
@@ -0,0 +1,133 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Scheduling of the commands run at startup by this engine
+
+"""
+
+import time
+import collections
+
+from tank.platform.qt import QtCore
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+# the command runs right away, before the engine finishes starting up
+BLOCKING = "blocking"
+# the command runs in the main thread once the application is idle, one
+# command per event loop iteration
+IDLE = "idle"
+# the command is handed over to the event loop, so the engine does not wait
+# for it. It still runs in the main thread, since commands usually create
+# widgets.
+BACKGROUND = "background"
+
+MODES = (BLOCKING, IDLE, BACKGROUND)
+
+
+class StartupCommandScheduler(QtCore.QObject):
+    """
+    Runs the commands listed in the 'run_at_startup' setting according to
+    their mode, logging how long each one of them took.
+    """
+
+    # emitted to run a background command in the main thread
+    _background_command_requested = QtCore.Signal(str, object)
+
+    def __init__(self, logger, parent=None):
+        super(StartupCommandScheduler, self).__init__(parent)
+
+        self._logger = logger
+        self._idle_commands = collections.deque()
+        self._cancelled = False
+
+        self._idle_timer = QtCore.QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(0)
+        self._idle_timer.timeout.connect(self._run_next_idle_command)
+
+        # queued, so the command runs once control is back in the event loop
+        self._background_command_requested.connect(
+            self._run_background_command, QtCore.Qt.QueuedConnection
+        )
+
+    def schedule(self, name, command_function, mode=BLOCKING):
+        """
+        Runs a command according to its mode.
+
+        :param str name: Name of the command, used for logging.
+        :param command_function: Callable to run.
+        :param str mode: One of blocking, idle or background.
+        """
+        if mode not in MODES:
+            self._logger.warning(
+                "Unknown startup mode '%s' for command '%s', running it right away.",
+                mode,
+                name,
+            )
+            mode = BLOCKING
+
+        if mode == IDLE:
+            self._idle_commands.append((name, command_function))
+            self._idle_timer.start()
+        elif mode == BACKGROUND:
+            self._background_command_requested.emit(name, command_function)
+        else:
+            self._run(name, command_function, mode)
+
+    def cancel(self):
+        """
+        Forgets the idle and background commands that did not run yet.
+        """
+        self._idle_timer.stop()
+        self._idle_commands.clear()
+        self._cancelled = True
+
+    def _run_next_idle_command(self):
+        """
+        Runs one idle command, leaving the rest for later event loop
+        iterations so the application stays responsive.
+        """
+        if not self._idle_commands:
+            return
+
+        name, command_function = self._idle_commands.popleft()
+        self._run(name, command_function, IDLE)
+
+        if self._idle_commands:
+            self._idle_timer.start()
+
+    def _run_background_command(self, name, command_function):
+        """
+        Runs a background command in the main thread.
+        """
+        if self._cancelled:
+            return
+        self._run(name, command_function, BACKGROUND)
+
+    def _run(self, name, command_function, mode):
+        """
+        Runs a command and logs how long it took.
+        """
+        start = time.time()
+        try:
+            command_function()
+        except Exception:
+            self._logger.exception("Startup command '%s' failed.", name)
+        finally:
+            self._logger.debug(
+                "Startup command '%s' (%s) took %.3f seconds.",
+                name,
+                mode,
+                time.time() - start,
+            )
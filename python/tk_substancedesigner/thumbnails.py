@@ -0,0 +1,267 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Thumbnails of the graphs of the packages, rendered from their outputs
+
+"""
+
+import os
+import uuid
+import ctypes
+import hashlib
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from tank.platform.qt import QtCore, QtGui
+
+from sd.api.sdproperty import SDPropertyCategory
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+# size in pixels of the longest side of the thumbnails
+THUMBNAIL_SIZE = 256
+
+# number of threads scaling down and saving thumbnails
+THUMBNAIL_WORKERS = 2
+
+# formats of the pixels of the output textures, by bytes per pixel: 8 bit
+# grayscale, 16 bit grayscale, 8 bit RGBA and 16 bit RGBA. Floating point
+# textures are not rendered.
+TEXTURE_FORMATS = dict(
+    (bytes_per_pixel, getattr(QtGui.QImage, format_name))
+    for (bytes_per_pixel, format_name) in (
+        (1, "Format_Grayscale8"),
+        (2, "Format_Grayscale16"),
+        (4, "Format_RGBA8888"),
+        (8, "Format_RGBA64"),
+    )
+    if hasattr(QtGui.QImage, format_name)
+)
+
+
+def get_output_texture(graph):
+    """
+    Returns the texture of the first output of a graph that was computed
+    already, or None if there is none. The graph is never computed for this.
+    """
+    for node in graph.getOutputNodes():
+        for prop in node.getProperties(SDPropertyCategory.Output):
+            value = node.getPropertyValue(prop)
+            if value is not None:
+                return value.get()
+
+    return None
+
+
+def get_texture_pixels(texture):
+    """
+    Returns a copy of the pixels of a texture, along with what is needed to
+    read them: (buffer, width, height, bytes per pixel, QImage format). None
+    is returned if the pixel format is not supported.
+
+    Only the copy happens here, in the main thread, so the texture does not
+    have to be encoded for the thumbnail to be rendered in another thread.
+    """
+    size = texture.getSize()
+    width, height = int(size.x), int(size.y)
+    bytes_per_pixel = texture.getBytesPerPixel()
+
+    image_format = TEXTURE_FORMATS.get(bytes_per_pixel)
+    if image_format is None or not width or not height:
+        return None
+
+    buffer = ctypes.string_at(
+        texture.getPixelBufferAddress(), width * height * bytes_per_pixel
+    )
+    return (buffer, width, height, bytes_per_pixel, image_format)
+
+
+def get_thumbnail_cache_key(graph_id, pck_filepath):
+    """
+    Returns the key the thumbnail of a graph is cached with, or None if the
+    package is not saved and so the thumbnail cannot be reused.
+    """
+    if not pck_filepath:
+        return None
+
+    try:
+        mtime = os.path.getmtime(pck_filepath)
+    except OSError:
+        return None
+
+    key = "%s|%s|%s" % (os.path.normcase(pck_filepath), graph_id, mtime)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class ThumbnailGenerator(QtCore.QObject):
+    """
+    Generates the thumbnails of graphs in the background.
+
+    Requests are queued and the pixels of the textures copied from Designer
+    one at a time whenever the application is idle, since its API can only be
+    used from the main thread. Building the images, scaling them down and
+    saving them happens in a small pool of threads, and the callback of each
+    request is called back in the main thread with the path to the thumbnail.
+
+    Only one request is queued per thumbnail, a repeated request replacing
+    the callback of the pending one, so collecting again before the queue is
+    done does not render the same graphs twice.
+
+    Thumbnails are cached on disk by package file, graph identifier and
+    package modification time, so they are only rendered again once the
+    package is saved. The thumbnails of unsaved packages are temporary files,
+    kept until the generator is cancelled since the publisher uploads them
+    from their path, and rendered again on every request.
+
+    Graphs are never computed for a thumbnail, so graphs whose outputs were
+    not computed yet get none, and neither do floating point outputs.
+    """
+
+    _ready = QtCore.Signal(object, str)
+
+    def __init__(self, cache_root, logger, max_workers=THUMBNAIL_WORKERS):
+        """
+        :param cache_root: Folder the thumbnails are cached in.
+        :param logger: Logger to report failures to.
+        :param max_workers: Number of threads scaling down the thumbnails.
+        """
+        super(ThumbnailGenerator, self).__init__()
+
+        self._cache_root = cache_root
+        self._logger = logger
+        self._max_workers = max_workers
+        self._executor = None
+        self._requests = OrderedDict()
+        self._temporary_paths = set()
+        self._scheduled = False
+
+        self._ready.connect(self._on_ready, QtCore.Qt.QueuedConnection)
+
+    def request(self, graph, graph_id, pck_filepath, callback, pck_handle=None):
+        """
+        Requests the thumbnail of a graph, calling callback with its path once
+        it is available. Graphs without any computed output are skipped.
+
+        :param pck_handle: Handle of the package in Designer, used to name the
+                           thumbnail of a package that was never saved.
+        """
+        cache_key = get_thumbnail_cache_key(graph_id, pck_filepath)
+        if cache_key:
+            cache_path = os.path.join(self._cache_root, cache_key + ".png")
+            if os.path.exists(cache_path):
+                callback(cache_path)
+                return
+        else:
+            if pck_handle is None:
+                temporary_key = uuid.uuid4().hex
+            else:
+                temporary_key = hashlib.sha1(
+                    ("%s|%s" % (pck_handle, graph_id)).encode("utf-8")
+                ).hexdigest()
+            cache_path = os.path.join(
+                tempfile.gettempdir(),
+                "sgtk_thumb_%s_%s.png" % (os.getpid(), temporary_key),
+            )
+            self._temporary_paths.add(cache_path)
+
+        # only the last item asking for a thumbnail still pending gets it
+        self._requests[cache_path] = (graph, callback)
+        if not self._scheduled:
+            self._scheduled = True
+            QtCore.QTimer.singleShot(0, self._process_next)
+
+    def cancel(self):
+        """
+        Drops the pending requests, stops the threads and removes the
+        thumbnails of the unsaved packages.
+        """
+        self._requests.clear()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+        for cache_path in self._temporary_paths:
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+        self._temporary_paths.clear()
+
+    def _process_next(self):
+        if not self._requests:
+            self._scheduled = False
+            return
+
+        (cache_path, (graph, callback)) = self._requests.popitem(last=False)
+        try:
+            self._render(graph, cache_path, callback)
+        except Exception as e:
+            # the graph might be gone already
+            self._logger.debug("Could not render the thumbnail of %s: %s", graph, e)
+
+        QtCore.QTimer.singleShot(0, self._process_next)
+
+    def _render(self, graph, cache_path, callback):
+        """
+        Copies the pixels of the first computed output of a graph, in the
+        main thread, and leaves the rest of the work to the threads.
+        """
+        texture = get_output_texture(graph)
+        if texture is None:
+            return
+
+        pixels = get_texture_pixels(texture)
+        if pixels is None:
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        self._executor.submit(self._scale, pixels, cache_path, callback)
+
+    def _scale(self, pixels, cache_path, callback):
+        (buffer, width, height, bytes_per_pixel, image_format) = pixels
+        try:
+            image = QtGui.QImage(
+                buffer, width, height, width * bytes_per_pixel, image_format
+            )
+            if image.isNull():
+                raise Exception("cannot read the pixels")
+
+            thumbnail = image.scaled(
+                THUMBNAIL_SIZE,
+                THUMBNAIL_SIZE,
+                QtCore.Qt.KeepAspectRatio,
+                QtCore.Qt.SmoothTransformation,
+            )
+
+            folder = os.path.dirname(cache_path)
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+
+            # written aside and renamed so no one picks up a partial file
+            partial_path = "%s.%s.png" % (cache_path, uuid.uuid4().hex)
+            if not thumbnail.save(partial_path, "PNG"):
+                raise Exception("cannot write %s" % partial_path)
+            os.replace(partial_path, cache_path)
+        except Exception as e:
+            self._logger.debug("Could not scale the thumbnail %s: %s", cache_path, e)
+            return
+
+        self._ready.emit(callback, cache_path)
+
+    def _on_ready(self, callback, cache_path):
+        try:
+            callback(cache_path)
+        except Exception as e:
+            self._logger.debug("Could not set the thumbnail %s: %s", cache_path, e)
@@ -18,11 +18,16 @@ import sd
 #
 
 import os
-import imp
 import sys
+import importlib.util
 
 import logging
 
+from . import tracing
+
+# record the imports from now on, until the engine is up
+tracing.trace_imports()
+
 __author__ = "Diego Garcia Huerta"
 __contact__ = "https://www.linkedin.com/in/diegogh/"
 
@@ -30,9 +35,13 @@ __contact__ = "https://www.linkedin.com/in/diegogh/"
 # Create a logger.
 logger = logging.getLogger("shotgun_bridge")
 
-# Add a handler to redirect logging to Designer's console panel.
-ctx = sd.getContext()
-logger.addHandler(ctx.createRuntimeLogHandler())
+# Add a handler to redirect logging to Designer's console panel, only once
+# since Designer can reload the plugin.
+if not any(
+    isinstance(handler, sd.logger.SDRuntimeLogHandler) for handler in logger.handlers
+):
+    ctx = sd.getContext()
+    logger.addHandler(ctx.createRuntimeLogHandler())
 
 # Do not propagate log messages to Python's root logger.
 logger.propagate = False
@@ -42,15 +51,19 @@ logger.setLevel(logging.DEBUG)
 
 
 SGTK_MODULE_PATH = os.environ.get("SGTK_SUBSTANCEDESIGNER_SGTK_MODULE_PATH")
-if SGTK_MODULE_PATH and SGTK_MODULE_PATH not in sys.path:
-    sys.path.insert(0, SGTK_MODULE_PATH)
+
+# name of the module the engine startup script is loaded as
+ENGINE_STARTUP_MODULE = "sgtk_substancedesigner_engine_startup"
 
 
 def start_plugin():
     # only bootstrap if we are in a shotgun environment
     if SGTK_MODULE_PATH:
+        if SGTK_MODULE_PATH not in sys.path:
+            sys.path.insert(0, SGTK_MODULE_PATH)
         bootstrap()
     else:
+        tracing.stop_tracing_imports()
         logger.warning(
             "[SubstanceDesigner Shotgun Engine] "
             "SubstanceDesigner was not run within a Shotgun Environment. "
@@ -62,11 +75,34 @@ def close_plugin():
     pass
 
 
+def load_engine_startup(engine_startup_path):
+    """
+    Imports the engine startup script, reusing its bytecode like any other
+    module does. The module is kept in sys.modules, so it is only executed
+    once even if Designer reloads this plugin.
+    """
+    engine_startup = sys.modules.get(ENGINE_STARTUP_MODULE)
+    if engine_startup and engine_startup.__file__ == engine_startup_path:
+        return engine_startup
+
+    spec = importlib.util.spec_from_file_location(
+        ENGINE_STARTUP_MODULE, engine_startup_path
+    )
+    engine_startup = importlib.util.module_from_spec(spec)
+    sys.modules[ENGINE_STARTUP_MODULE] = engine_startup
+    try:
+        spec.loader.exec_module(engine_startup)
+    except Exception:
+        del sys.modules[ENGINE_STARTUP_MODULE]
+        raise
+
+    return engine_startup
+
+
+@tracing.traced("shotgun_bridge.bootstrap")
 def bootstrap():
     engine_startup_path = os.environ.get("SGTK_SUBSTANCEDESIGNER_ENGINE_STARTUP")
-    engine_startup = imp.load_source(
-        "sgtk_substancedesigner_engine_startup", engine_startup_path
-    )
+    engine_startup = load_engine_startup(engine_startup_path)
 
     # Fire up Toolkit and the environment engine when there's time.
     engine_startup.start_toolkit()
@@ -0,0 +1,231 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Startup tracing for the Substance Designer engine.
+
+When the SGTK_SUBSTANCEDESIGNER_TRACE environment variable is set, the
+startup phases and the imports of modules are recorded as nested spans with
+their wall and CPU time, and can be written as a JSON file that
+chrome://tracing (or Perfetto) can load. Nothing is recorded otherwise.
+"""
+
+import os
+import sys
+import json
+import time
+import functools
+import threading
+import contextlib
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+# environment variable that enables the tracing
+TRACE_ENV = "SGTK_SUBSTANCEDESIGNER_TRACE"
+
+# environment variable used by the launcher to hand its own events over to
+# the Substance Designer process.
+TRACE_EVENTS_ENV = "SGTK_SUBSTANCEDESIGNER_TRACE_EVENTS"
+
+TRACE_FILENAME = "tk-substancedesigner_trace_%s.json"
+
+# imports faster than this are left out of the trace, in seconds
+MIN_IMPORT_DURATION = 0.0005
+
+_events = []
+_lock = threading.Lock()
+_untraced_import = None
+
+
+def is_enabled():
+    """
+    Returns True if the startup tracing is enabled.
+    """
+    return os.environ.get(TRACE_ENV, "0") not in ("", "0")
+
+
+def _get_cpu_time():
+    # thread_time is only available from python 3.7
+    if hasattr(time, "thread_time"):
+        return time.thread_time()
+    return time.process_time()
+
+
+def create_event(name, category, start, end, cpu, args=None):
+    """
+    Returns a chrome trace complete event.
+
+    :param str name: Name of the span.
+    :param str category: Category of the span.
+    :param float start: Wall clock start time, in seconds since the epoch.
+    :param float end: Wall clock end time, in seconds since the epoch.
+    :param float cpu: CPU time spent, in seconds.
+    :param dict args: Extra information to show with the span.
+    """
+    event_args = {"cpu_ms": round(cpu * 1000.0, 3)}
+    event_args.update(args or {})
+
+    return {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": int(start * 1000000),
+        "dur": int((end - start) * 1000000),
+        "pid": os.getpid(),
+        "tid": threading.current_thread().ident,
+        "args": event_args,
+    }
+
+
+def add_event(event):
+    """
+    Records an already built event.
+    """
+    with _lock:
+        _events.append(event)
+
+
+@contextlib.contextmanager
+def trace(name, category="startup", **args):
+    """
+    Context manager that records the code it wraps as a span.
+    """
+    if not is_enabled():
+        yield
+        return
+
+    start = time.time()
+    start_cpu = _get_cpu_time()
+    try:
+        yield
+    finally:
+        add_event(
+            create_event(
+                name, category, start, time.time(), _get_cpu_time() - start_cpu, args
+            )
+        )
+
+
+def traced(name, category="startup"):
+    """
+    Decorator that records every call to the decorated function as a span.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace(name, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_imports():
+    """
+    Records the first import of every module as a span, including the
+    imports it triggers, like python -X importtime does. The spans are nested
+    in the trace, so the cost of each module is visible on its own.
+    """
+    global _untraced_import
+
+    if _untraced_import is not None or not is_enabled():
+        return
+
+    import builtins
+    import importlib.util
+
+    untraced_import = builtins.__import__
+
+    def traced_import(name, globals=None, locals=None, fromlist=(), level=0):
+        modules_count = len(sys.modules)
+        start = time.time()
+        start_cpu = _get_cpu_time()
+        try:
+            return untraced_import(name, globals, locals, fromlist, level)
+        finally:
+            end = time.time()
+            new_modules = len(sys.modules) - modules_count
+            if new_modules > 0 and end - start >= MIN_IMPORT_DURATION:
+                if level and globals:
+                    try:
+                        name = importlib.util.resolve_name(
+                            "." * level + name, globals.get("__package__")
+                        )
+                    except (ImportError, ValueError):
+                        pass
+                event = create_event(
+                    "import %s" % name,
+                    "import",
+                    start,
+                    end,
+                    _get_cpu_time() - start_cpu,
+                    {"new_modules": new_modules},
+                )
+                add_event(event)
+
+    _untraced_import = untraced_import
+    builtins.__import__ = traced_import
+
+
+def stop_tracing_imports():
+    """
+    Stops recording the imports.
+    """
+    global _untraced_import
+
+    if _untraced_import is None:
+        return
+
+    import builtins
+
+    builtins.__import__ = _untraced_import
+    _untraced_import = None
+
+
+def get_slowest_events(category, count=10):
+    """
+    Returns the slowest events recorded so far for a category.
+    """
+    with _lock:
+        events = [event for event in _events if event["cat"] == category]
+
+    return sorted(events, key=lambda event: event["dur"], reverse=True)[:count]
+
+
+def write(folder):
+    """
+    Writes all the events recorded so far into a chrome trace file.
+
+    :param str folder: Folder to write the trace file to.
+    :returns: The path to the trace file, or None if tracing is disabled.
+    """
+    if not is_enabled():
+        return None
+
+    with _lock:
+        events = list(_events)
+
+    path = os.path.join(folder, TRACE_FILENAME % os.getpid())
+    with open(path, "w") as trace_file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file)
+
+    return path
+
+
+# pick up the events recorded by the launcher before this process existed.
+if is_enabled() and os.environ.get(TRACE_EVENTS_ENV):
+    try:
+        _events.extend(json.loads(os.environ[TRACE_EVENTS_ENV]))
+    except ValueError:
+        pass
@@ -9,8 +9,14 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import re
 import sys
+import json
+import time
 import cgitb
+import glob
+import socket
+import plistlib
 
 
 import sgtk
@@ -30,6 +36,41 @@ logger = sgtk.LogManager.get_logger(__name__)
 # Let's enable cool and detailed tracebacks
 cgitb.enable(format="text")
 
+# environment variables used by the startup tracer, see
+# resources/plugins/shotgun_bridge/shotgun_bridge/tracing.py
+TRACE_ENV = "SGTK_SUBSTANCEDESIGNER_TRACE"
+TRACE_EVENTS_ENV = "SGTK_SUBSTANCEDESIGNER_TRACE_EVENTS"
+
+# per user cache of the executables found by scan_software. Bump the version
+# whenever the way executables and versions are discovered changes, so the
+# entries written by older versions of the engine are ignored.
+SOFTWARE_CACHE_FILENAME = "tk-substancedesigner_software_cache.json"
+SOFTWARE_CACHE_VERSION = 3
+
+# set to 0 to always search the file system, ie. while installing a new
+# version of the application in a way the cache cannot notice.
+SOFTWARE_CACHE_ENV = "SGTK_SUBSTANCEDESIGNER_SOFTWARE_CACHE"
+
+# characters that make a path component a pattern rather than a folder name
+PATTERN_CHARACTERS = "{}*?["
+
+# named keys of the executable templates, ie. {install_suffix}
+TEMPLATE_KEY_REGEX = re.compile(r"\{[^}]*\}")
+
+# maximum number of executable templates searched at the same time
+SCAN_WORKERS = 4
+
+# files next to the linux executable that could contain its version, in the
+# order they are tried
+LINUX_VERSION_FILES = [
+    "version.txt",
+    "VERSION",
+    "resources/version.txt",
+    "resources/VERSION",
+]
+
+VERSION_REGEX = re.compile(r"\d+(?:\.\d+)+")
+
 
 # adapted from:
 # https://stackoverflow.com/questions/2270345/finding-the-version-of-an-application-from-python
@@ -40,6 +81,10 @@ def get_file_info(filename, info):
     import array
     from ctypes import windll, create_string_buffer, c_uint, string_at, byref
 
+    # the ANSI version of the functions are used, so they need byte strings
+    if not isinstance(filename, bytes):
+        filename = filename.encode("mbcs")
+
     # Get size needed for buffer (0 if no info)
     size = windll.version.GetFileVersionInfoSizeA(filename, None)
     # If no info in file -> empty string
@@ -53,7 +98,9 @@ def get_file_info(filename, info):
     r = c_uint()
     l = c_uint()
     # Look for codepages
-    windll.version.VerQueryValueA(res, "\\VarFileInfo\\Translation", byref(r), byref(l))
+    windll.version.VerQueryValueA(
+        res, b"\\VarFileInfo\\Translation", byref(r), byref(l)
+    )
     # If no codepage -> empty string
     if not l.value:
         return ""
@@ -63,10 +110,232 @@ def get_file_info(filename, info):
     codepage = tuple(codepages[:2].tolist())
 
     # Extract information
-    windll.version.VerQueryValueA(
-        res, ("\\StringFileInfo\\%04x%04x\\" + info) % codepage, byref(r), byref(l)
-    )
-    return string_at(r.value, l.value)
+    query = ("\\StringFileInfo\\%04x%04x\\" + info) % codepage
+    windll.version.VerQueryValueA(res, query.encode("mbcs"), byref(r), byref(l))
+    if not l.value:
+        return ""
+
+    return string_at(r.value, l.value).decode("mbcs")
+
+
+def read_version_file(path):
+    """
+    Returns the first version number found in a file, or None.
+    """
+    try:
+        with open(path) as version_file:
+            match = VERSION_REGEX.search(version_file.read(4096))
+    except (IOError, OSError, UnicodeDecodeError):
+        return None
+
+    return match.group(0) if match else None
+
+
+def get_executable_version(executable_path):
+    """
+    Returns the version of a Substance Designer installation from its
+    metadata, without running it.
+
+    :param str executable_path: Path to the executable, or to the application
+                                bundle on macOS.
+    :returns: The version as a string, or " " if it could not be found.
+    """
+    version = None
+
+    if sgtk.util.is_windows():
+        version = get_file_info(executable_path, "FileVersion").strip("\x00")
+    elif sgtk.util.is_macos():
+        plist_path = os.path.join(executable_path, "Contents", "Info.plist")
+        try:
+            with open(plist_path, "rb") as plist_file:
+                info = plistlib.load(plist_file)
+            version = info.get("CFBundleShortVersionString") or info.get(
+                "CFBundleVersion"
+            )
+        except Exception:
+            pass
+    else:
+        install_folder = os.path.dirname(os.path.realpath(executable_path))
+        for version_file in LINUX_VERSION_FILES:
+            version = read_version_file(os.path.join(install_folder, version_file))
+            if version:
+                break
+
+    if not version:
+        # side by side installations usually have the version in the name
+        # of the installation folder
+        match = VERSION_REGEX.search(os.path.realpath(executable_path))
+        version = match.group(0) if match else None
+
+    # no version is available to display
+    return version or " "
+
+
+def get_stat_token(path):
+    """
+    Returns a value that changes whenever the given path is modified,
+    replaced or removed.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return [stat.st_mtime, stat.st_ino, stat.st_size]
+
+
+def get_template_root(template):
+    """
+    Returns the deepest folder of an executable template that does not
+    contain any pattern. Adding or removing a folder or an executable
+    matching the first pattern of the template changes the modification
+    time of this folder.
+    """
+    components = template.replace("\\", "/").split("/")
+    for (index, component) in enumerate(components):
+        if any(character in component for character in PATTERN_CHARACTERS):
+            return "/".join(components[:index]) or "/"
+
+    return os.path.dirname(template)
+
+
+def get_template_folders(template):
+    """
+    Returns the folders matching the first pattern of an executable template,
+    ie. every installation folder, whether it contains an executable or not.
+    Installing an executable into one of them changes its modification time.
+    """
+    components = template.replace("\\", "/").split("/")
+    for (index, component) in enumerate(components[:-1]):
+        if any(character in component for character in PATTERN_CHARACTERS):
+            pattern = "/".join(components[: index + 1])
+            pattern = TEMPLATE_KEY_REGEX.sub("*", pattern)
+            return sorted(path for path in glob.glob(pattern) if os.path.isdir(path))
+
+    return []
+
+
+class SoftwareCache(object):
+    """
+    Cache on disk of the executables found for every executable template,
+    so Shotgun Desktop does not have to search the file system (and read the
+    version of every executable) each time it refreshes its launchers.
+
+    An entry is reused as long as the folder the template lives in, the
+    folders matching the first pattern of the template and each one of the
+    executables found are unchanged, which only costs a few stats. Changes
+    deeper in an installation folder, other than to the executable itself,
+    are not noticed; the cache can be disabled by setting
+    SGTK_SUBSTANCEDESIGNER_SOFTWARE_CACHE=0.
+    """
+
+    def __init__(self, path, logger):
+        self._path = path
+        self._logger = logger
+        self._entries = None
+        self._dirty = False
+
+    @classmethod
+    def get_default_path(cls):
+        """
+        Returns the path to the cache file of the current user.
+        """
+        cache_root = sgtk.util.LocalFileStorageManager.get_global_root(
+            sgtk.util.LocalFileStorageManager.CACHE
+        )
+        return os.path.join(cache_root, SOFTWARE_CACHE_FILENAME)
+
+    def get(self, template):
+        """
+        Returns the list of (executable path, version) cached for the given
+        template, or None if there is no entry or it is out of date.
+        """
+        entry = self._get_entries().get(self._get_key(template))
+        if not entry:
+            return None
+
+        if get_stat_token(entry["root"]) != entry["root_token"]:
+            self._logger.debug("Software cache entry out of date: %s", template)
+            return None
+
+        for (folder, token) in entry["folders"]:
+            if get_stat_token(folder) != token:
+                self._logger.debug("Software cache entry out of date: %s", folder)
+                return None
+
+        executables = []
+        for (executable_path, token, version) in entry["executables"]:
+            if get_stat_token(executable_path) != token:
+                self._logger.debug(
+                    "Software cache entry out of date: %s", executable_path
+                )
+                return None
+            executables.append((executable_path, version))
+
+        return executables
+
+    def set(self, template, executables):
+        """
+        Stores the list of (executable path, version) found for the given
+        template.
+        """
+        root = get_template_root(template)
+        self._get_entries()[self._get_key(template)] = {
+            "root": root,
+            "root_token": get_stat_token(root),
+            "folders": [
+                [folder, get_stat_token(folder)]
+                for folder in get_template_folders(template)
+            ],
+            "executables": [
+                [executable_path, get_stat_token(executable_path), version]
+                for (executable_path, version) in executables
+            ],
+        }
+        self._dirty = True
+
+    def save(self):
+        """
+        Writes the cache to disk if anything changed.
+        """
+        if not self._dirty:
+            return
+
+        cache = {"version": SOFTWARE_CACHE_VERSION, "entries": self._entries}
+        temp_path = "%s.%s.tmp" % (self._path, os.getpid())
+        try:
+            sgtk.util.filesystem.ensure_folder_exists(os.path.dirname(self._path))
+            with open(temp_path, "w") as cache_file:
+                json.dump(cache, cache_file)
+            # several launchers could be scanning at the same time, so only
+            # ever replace the cache with a complete file
+            os.replace(temp_path, self._path)
+        except Exception as e:
+            self._logger.debug("Could not write software cache %s: %s", self._path, e)
+        else:
+            self._dirty = False
+
+    def _get_key(self, template):
+        # the home folder could be shared by several hosts with different
+        # installations
+        return "%s|%s" % (socket.gethostname(), os.path.realpath(template))
+
+    def _get_entries(self):
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        try:
+            with open(self._path) as cache_file:
+                cache = json.load(cache_file)
+            if cache.get("version") == SOFTWARE_CACHE_VERSION:
+                self._entries = cache["entries"]
+        except (IOError, OSError):
+            pass
+        except Exception as e:
+            self._logger.debug("Ignoring software cache %s: %s", self._path, e)
+
+        return self._entries
 
 
 class SubstanceDesignerLauncher(SoftwareLauncher):
@@ -83,6 +352,7 @@ class SubstanceDesignerLauncher(SoftwareLauncher):
     COMPONENT_REGEX_LOOKUP = {
         "platform": r"\(x86\)|\(x64\)",
         "platform_version": r"\(x86\)|\(x64\)",
+        "install_suffix": r"[^/\\]*",
     }
 
     # This dictionary defines a list of executable template strings for each
@@ -95,17 +365,17 @@ class SubstanceDesignerLauncher(SoftwareLauncher):
     EXECUTABLE_TEMPLATES = {
         "darwin": [
             "$SUBSTANCEDESIGNER_BIN",
-            "/Applications/Allegorithmic/Substance Designer.app",
+            "/Applications/Allegorithmic/Substance Designer{install_suffix}.app",
         ],
         "win32": [
             "$SUBSTANCEDESIGNER_BIN",
-            "C:/Program Files/Allegorithmic/Substance Designer/Substance Designer.exe",
+            "C:/Program Files/Allegorithmic/Substance Designer{install_suffix}/Substance Designer.exe",
         ],
         "linux2": [
             "$SUBSTANCEDESIGNER_BIN",
-            "/usr/Allegorithmic/Substance_Designer/Substance Designer",
+            "/usr/Allegorithmic/Substance_Designer{install_suffix}/Substance Designer",
             "/usr/Allegorithmic/Substance Designer",
-            "/opt/Allegorithmic/Substance_Designer/Substance Designer",
+            "/opt/Allegorithmic/Substance_Designer{install_suffix}/Substance Designer",
         ],
     }
 
@@ -120,6 +390,9 @@ class SubstanceDesignerLauncher(SoftwareLauncher):
                                             launch.
         :returns: :class:`LaunchInformation` instance
         """
+        trace_start = time.time()
+        trace_start_cpu = time.process_time()
+
         required_env = {}
 
         resources_plugins_path = os.path.join(
@@ -149,7 +422,55 @@ class SubstanceDesignerLauncher(SoftwareLauncher):
             # Add the file name to open to the launch environment
             required_env["SGTK_FILE_TO_OPEN"] = file_to_open
 
+        # Defer the start of the engine until the menu is first opened or
+        # the application becomes idle. Blocking commands that must run at
+        # startup need the apps to be initialized as soon as possible, so in
+        # that case the engine is always started eagerly.
+        if self.get_setting("lazy_startup", False):
+            blocking_commands = [
+                command
+                for command in self.get_setting("run_at_startup", [])
+                if (command.get("mode") or "blocking") == "blocking"
+            ]
+            if blocking_commands:
+                self.logger.debug(
+                    "Ignoring lazy_startup since there are blocking "
+                    "run_at_startup commands."
+                )
+            else:
+                required_env["SGTK_SUBSTANCEDESIGNER_LAZY_STARTUP"] = "1"
+                required_env["SGTK_SUBSTANCEDESIGNER_LAZY_STARTUP_DELAY"] = str(
+                    self.get_setting("lazy_startup_delay", 10)
+                )
+                menu_name = "Shotgun"
+                if self.get_setting("use_sgtk_as_menu_name", False):
+                    menu_name = "Sgtk"
+                required_env["SGTK_SUBSTANCEDESIGNER_MENU_NAME"] = menu_name
+
         os.chdir(os.path.dirname(os.path.dirname(exec_path)))
+
+        # hand the time spent here over to the startup tracer running in the
+        # application, since this runs in a different process.
+        if os.environ.get(TRACE_ENV, "0") not in ("", "0"):
+            required_env[TRACE_EVENTS_ENV] = json.dumps(
+                [
+                    {
+                        "name": "SubstanceDesignerLauncher.prepare_launch",
+                        "cat": "startup",
+                        "ph": "X",
+                        "ts": int(trace_start * 1000000),
+                        "dur": int((time.time() - trace_start) * 1000000),
+                        "pid": os.getpid(),
+                        "tid": 0,
+                        "args": {
+                            "cpu_ms": round(
+                                (time.process_time() - trace_start_cpu) * 1000.0, 3
+                            )
+                        },
+                    }
+                ]
+            )
+
         return LaunchInformation(path=exec_path, environ=required_env)
 
     def _icon_from_engine(self):
@@ -189,44 +510,68 @@ class SubstanceDesignerLauncher(SoftwareLauncher):
             if sgtk.util.is_macos()
             else "win32"
             if sgtk.util.is_windows()
-            else "linux"
+            else "linux2"
             if sgtk.util.is_linux()
-            else []
+            else [],
+            [],
         )
 
-        # all the discovered executables
-        found = False
-        sw_versions = []
+        software_cache = None
+        if os.environ.get(SOFTWARE_CACHE_ENV, "1") != "0":
+            software_cache = SoftwareCache(
+                SoftwareCache.get_default_path(), self.logger
+            )
 
+        # expand the templates and pick the cached executables
+        templates = []
+        executables_by_template = {}
         for executable_template in executable_templates:
             self.logger.debug("PreProcessing template %s.", executable_template)
             executable_template = os.path.expanduser(executable_template)
             executable_template = os.path.expandvars(executable_template)
 
-            self.logger.debug("Processing template %s.", executable_template)
-
-            executable_matches = self._glob_and_match(
-                executable_template, self.COMPONENT_REGEX_LOOKUP
-            )
+            # an unset environment variable is left as it is
+            if executable_template.startswith("$"):
+                continue
 
-            # Extract all products from that executable.
-            for (executable_path, key_dict) in executable_matches:
-                # extract the matched keys form the key_dict (default to None
-                # if not included)
+            templates.append(executable_template)
+            if not software_cache:
+                continue
+            executables = software_cache.get(executable_template)
+            if executables is not None:
                 self.logger.debug(
-                    "Processing executable_path: %s | dict %s",
-                    executable_path,
-                    key_dict,
+                    "Using cached executables for template %s.", executable_template
                 )
-
-                if sgtk.util.is_windows():
-                    executable_version = get_file_info(executable_path, "FileVersion")
-                    # make sure we remove those pesky \x00 characters
-                    executable_version = executable_version.strip("\x00")
-                else:
-                    # no way to extract the version from this application, so no
-                    # version is available to display
-                    executable_version = " "
+                executables_by_template[executable_template] = executables
+
+        # search the file system for the rest of them
+        missing_templates = [
+            template
+            for template in templates
+            if template not in executables_by_template
+        ]
+        for (executable_template, executables) in self._scan_templates(
+            missing_templates
+        ):
+            if software_cache:
+                software_cache.set(executable_template, executables)
+            executables_by_template[executable_template] = executables
+
+        if software_cache:
+            software_cache.save()
+
+        # all the discovered executables, in the order of the templates.
+        # The same installation can be matched by several templates or links.
+        sw_versions = []
+        found_paths = set()
+        for executable_template in templates:
+            for (executable_path, executable_version) in executables_by_template[
+                executable_template
+            ]:
+                real_path = os.path.normcase(os.path.realpath(executable_path))
+                if real_path in found_paths:
+                    continue
+                found_paths.add(real_path)
 
                 sw_versions.append(
                     SoftwareVersion(
@@ -236,13 +581,60 @@ class SubstanceDesignerLauncher(SoftwareLauncher):
                         self._icon_from_engine(),
                     )
                 )
-                # TBR DGH010720
-                # break here if you found one executable, at least until we
-                # find a way to track different versions of Substance Designer.
-                found = True
-                break
-
-            if found:
-                break
 
         return sw_versions
+
+    def _scan_templates(self, executable_templates):
+        """
+        Searches the file system for the executables matching several
+        templates at the same time, since most of the time is spent waiting
+        for the file system.
+
+        :returns: List of (template, list of (executable path, version)).
+        """
+        try:
+            from concurrent.futures import ThreadPoolExecutor
+        except ImportError:
+            # python 2 without the futures backport
+            ThreadPoolExecutor = None
+
+        if ThreadPoolExecutor is None or len(executable_templates) < 2:
+            return [
+                (template, self._scan_template(template))
+                for template in executable_templates
+            ]
+
+        workers = min(SCAN_WORKERS, len(executable_templates))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(self._scan_template, executable_templates)
+            return list(zip(executable_templates, results))
+
+    def _scan_template(self, executable_template):
+        """
+        Searches the file system for the executables matching a template.
+
+        :returns: List of (executable path, version) tuples.
+        """
+        self.logger.debug("Processing template %s.", executable_template)
+
+        executable_matches = self._glob_and_match(
+            executable_template, self.COMPONENT_REGEX_LOOKUP
+        )
+
+        executables = []
+
+        # Extract all products from that executable.
+        for (executable_path, key_dict) in executable_matches:
+            # extract the matched keys form the key_dict (default to None
+            # if not included)
+            self.logger.debug(
+                "Processing executable_path: %s | dict %s",
+                executable_path,
+                key_dict,
+            )
+
+            executables.append(
+                (executable_path, get_executable_version(executable_path))
+            )
+
+        return executables
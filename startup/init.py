@@ -23,9 +23,15 @@ __contact__ = "https://www.linkedin.com/in/diegogh/"
 
 ENGINE_NAME = "tk-substancedesigner"
 
-import sgtk
+# milliseconds waited before starting the engine in lazy mode, unless the
+# menu is opened first, and before checking again if the user is busy.
+LAZY_STARTUP_DELAY = 10000
+LAZY_STARTUP_RETRY_DELAY = 1000
 
-logger = sgtk.LogManager.get_logger(__name__)
+from shotgun_bridge import tracing
+
+# toolkit is only imported once the engine is started, see start_toolkit
+logger = None
 
 
 def display_error(msg):
@@ -47,6 +53,8 @@ def start_toolkit_classic():
     the engine and environment.
     """
 
+    import sgtk
+
     logger.debug("Launching toolkit in classic mode.")
 
     # Get the name of the engine to start from the environment
@@ -80,7 +88,8 @@ def start_toolkit_classic():
         logger.debug(
             "Launching engine instance '%s' for context %s" % (env_engine, env_context)
         )
-        engine = sgtk.platform.start_engine(env_engine, context.sgtk, context)
+        with tracing.trace("start_engine", engine=env_engine):
+            engine = sgtk.platform.start_engine(env_engine, context.sgtk, context)
     except Exception as e:
         msg = "Shotgun: Could not start engine. Details: %s" % e
         etype, value, tb = sys.exc_info()
@@ -89,11 +98,111 @@ def start_toolkit_classic():
         return
 
 
+def create_placeholder_menu(callback):
+    """
+    Creates the Shotgun menu entry in the menu bar before the engine is
+    started, calling the callback the first time the menu is about to show.
+    The engine reuses this same menu once it is running.
+    """
+    import sd
+    from PySide2 import QtWidgets
+
+    ctx = sd.getContext()
+    app = ctx.getSDApplication()
+    uiMgr = app.getQtForPythonUIMgr()
+
+    main_window = uiMgr.getMainWindow()
+    if not main_window or not main_window.menuBar():
+        return None
+
+    menu_name = os.environ.get("SGTK_SUBSTANCEDESIGNER_MENU_NAME", "Shotgun")
+    menu_id = "Pfx.Editor.Menu.%s" % menu_name
+    menu = uiMgr.findMenuFromObjectName(menu_id)
+
+    if not menu:
+        help_menu = uiMgr.findMenuFromObjectName("Pfx.Editor.Menu.Help")
+        menu_bar = main_window.menuBar()
+        menu = QtWidgets.QMenu(menu_name, menu_bar)
+        menu.setObjectName(menu_id)
+        if help_menu:
+            menu_bar.insertMenu(help_menu.menuAction(), menu)
+        else:
+            menu_bar.addMenu(menu)
+
+    loading_action = menu.addAction("Loading Shotgun...")
+    loading_action.setEnabled(False)
+    menu.aboutToShow.connect(callback)
+
+    return menu
+
+
+def start_toolkit_lazy():
+    """
+    Defers the start of the engine until the Shotgun menu is first opened or
+    a while after launch, once the user is not busy with the application,
+    whatever happens first.
+    """
+    import sgtk
+    from PySide2 import QtCore, QtWidgets
+
+    logger.debug("Deferring the start of toolkit.")
+
+    state = {"started": False, "menu": None}
+
+    def deferred_start():
+        if state["started"]:
+            return
+        state["started"] = True
+
+        menu = state["menu"]
+        if menu:
+            menu.aboutToShow.disconnect(deferred_start)
+
+        try:
+            start_toolkit_eager()
+        except Exception as e:
+            display_error("Could not start the engine: %s" % e)
+
+        if menu and not sgtk.platform.current_engine():
+            menu.clear()
+            error_action = menu.addAction(
+                "Shotgun failed to start, see the Toolkit log for details."
+            )
+            error_action.setEnabled(False)
+
+    def idle_start():
+        # the user is busy with the application, try again a bit later
+        app = QtWidgets.QApplication.instance()
+        if app and (
+            app.mouseButtons() != QtCore.Qt.NoButton
+            or app.activePopupWidget()
+            or app.activeModalWidget()
+        ):
+            QtCore.QTimer.singleShot(LAZY_STARTUP_RETRY_DELAY, idle_start)
+            return
+        deferred_start()
+
+    try:
+        state["menu"] = create_placeholder_menu(deferred_start)
+    except Exception as e:
+        logger.debug("Could not create the placeholder menu: %s", e)
+
+    # a zero timer would fire as soon as the event loop starts, blocking the
+    # application right after launch anyway, so give the user a head start.
+    delay = os.environ.get("SGTK_SUBSTANCEDESIGNER_LAZY_STARTUP_DELAY")
+    try:
+        delay = int(float(delay) * 1000)
+    except (TypeError, ValueError):
+        delay = LAZY_STARTUP_DELAY
+    QtCore.QTimer.singleShot(delay, idle_start)
+
+
 def start_toolkit():
     """
     Import Toolkit and start up the engine based on
     environment variables.
     """
+    global logger
 
     # Verify sgtk can be loaded.
     try:
@@ -103,6 +212,31 @@ def start_toolkit():
         display_error(msg)
         return
 
+    logger = sgtk.LogManager.get_logger(__name__)
+
+    # Designer can reload the plugin, never start the engine twice
+    if sgtk.platform.current_engine():
+        logger.debug("The engine is already running.")
+        return
+
+    if os.environ.get("SGTK_SUBSTANCEDESIGNER_LAZY_STARTUP") == "1":
+        start_toolkit_lazy()
+    else:
+        start_toolkit_eager()
+
+
+@tracing.traced("start_toolkit")
+def start_toolkit_eager():
+    """
+    Import Toolkit and start up the engine right away.
+    """
+
+    import sgtk
+
+    if sgtk.platform.current_engine():
+        logger.debug("The engine is already running.")
+        return
+
     # start up toolkit logging to file
     sgtk.LogManager().initialize_base_file_handler(ENGINE_NAME)
 
@@ -123,7 +257,14 @@ def start_toolkit():
         doc.waitForDone()
 
     # Clean up temp env variables.
-    del_vars = ["SGTK_ENGINE", "SGTK_CONTEXT", "SGTK_FILE_TO_OPEN"]
+    del_vars = [
+        "SGTK_ENGINE",
+        "SGTK_CONTEXT",
+        "SGTK_FILE_TO_OPEN",
+        "SGTK_SUBSTANCEDESIGNER_LAZY_STARTUP",
+        "SGTK_SUBSTANCEDESIGNER_LAZY_STARTUP_DELAY",
+        "SGTK_SUBSTANCEDESIGNER_MENU_NAME",
+    ]
     for var in del_vars:
         if var in os.environ:
             del os.environ[var]
@@ -0,0 +1,189 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Test configuration. The modules tested only run inside toolkit, so when
+toolkit is not available, ie. on CI, minimal stand-ins of the parts of
+sgtk they use are installed instead, along with one of QtCore when no Qt
+binding is installed either.
+"""
+
+import os
+import re
+import sys
+import glob
+import types
+import logging
+import importlib.util
+import collections
+
+import pytest
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+ENGINE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeSoftwareLauncher(object):
+    """
+    Stand-in for sgtk.platform.SoftwareLauncher.
+    """
+
+    def __init__(self, disk_location=ENGINE_ROOT):
+        self.disk_location = disk_location
+        self.logger = logging.getLogger("tests.launcher")
+
+    def _glob_and_match(self, match_template, template_key_expressions):
+        """
+        Simplified version of the toolkit one: every {key} of the template
+        matches anything but a path separator.
+        """
+        glob_pattern = re.sub(r"\{\w+\}", "*", match_template)
+        regex = re.escape(match_template.replace("\\", "/"))
+        for key in template_key_expressions:
+            regex = regex.replace(re.escape("{%s}" % key), "(?P<%s>[^/]*)" % key)
+
+        matches = []
+        for path in sorted(glob.glob(glob_pattern)):
+            match = re.match(regex + "$", path.replace("\\", "/"))
+            if match:
+                matches.append((path, match.groupdict()))
+        return matches
+
+
+class FakeBoundSignal(object):
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot, connection_type=None):
+        self._slots.append(slot)
+
+    def emit(self, *args):
+        for slot in self._slots:
+            slot(*args)
+
+
+class FakeSignal(object):
+    """
+    Stand-in for QtCore.Signal. There is no event loop, the slots are called
+    right away in the thread emitting it, whatever the type of connection.
+    """
+
+    def __init__(self, *types):
+        self._name = None
+
+    def __set_name__(self, owner, name):
+        self._name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.__dict__.setdefault(self._name, FakeBoundSignal())
+
+
+class FakeQObject(object):
+    """
+    Stand-in for QtCore.QObject.
+    """
+
+    def __init__(self, parent=None):
+        self._parent = parent
+
+
+def _install_toolkit_stand_ins():
+    util = types.ModuleType("sgtk.util")
+    util.is_windows = lambda: sys.platform == "win32"
+    util.is_macos = lambda: sys.platform == "darwin"
+    util.is_linux = lambda: sys.platform.startswith("linux")
+    util.filesystem = types.SimpleNamespace(
+        ensure_folder_exists=lambda path: os.makedirs(path, exist_ok=True)
+    )
+
+    platform = types.ModuleType("sgtk.platform")
+    platform.SoftwareLauncher = FakeSoftwareLauncher
+    platform.SoftwareVersion = collections.namedtuple(
+        "SoftwareVersion", ["version", "product", "path", "icon"]
+    )
+    platform.LaunchInformation = collections.namedtuple(
+        "LaunchInformation", ["path", "environ"]
+    )
+
+    pipelineconfig_utils = types.ModuleType("sgtk.pipelineconfig_utils")
+    pipelineconfig_utils.get_sgtk_module_path = lambda: ""
+
+    toolkit = types.ModuleType("sgtk")
+    toolkit.util = util
+    toolkit.platform = platform
+    toolkit.pipelineconfig_utils = pipelineconfig_utils
+    toolkit.LogManager = types.SimpleNamespace(get_logger=logging.getLogger)
+
+    sys.modules.update(
+        {
+            "sgtk": toolkit,
+            "sgtk.util": util,
+            "sgtk.platform": platform,
+            "sgtk.pipelineconfig_utils": pipelineconfig_utils,
+            "tank": toolkit,
+            "tank.util": util,
+            "tank.platform": platform,
+        }
+    )
+
+    # the Qt bindings are only available on some machines
+    for qt_module in ("PySide2", "PySide6"):
+        try:
+            qt = importlib.import_module(qt_module)
+            importlib.import_module(qt_module + ".QtCore")
+        except ImportError:
+            continue
+        qt_stand_in = types.ModuleType("sgtk.platform.qt")
+        qt_stand_in.QtCore = qt.QtCore
+        platform.qt = qt_stand_in
+        sys.modules["sgtk.platform.qt"] = qt_stand_in
+        sys.modules["tank.platform.qt"] = qt_stand_in
+        break
+    else:
+        # just enough of QtCore to import the modules using it, ie. on CI
+        qt_stand_in = types.ModuleType("sgtk.platform.qt")
+        qt_stand_in.QtCore = types.SimpleNamespace(
+            QObject=FakeQObject,
+            Signal=FakeSignal,
+            Qt=types.SimpleNamespace(QueuedConnection=2),
+        )
+        platform.qt = qt_stand_in
+        sys.modules["sgtk.platform.qt"] = qt_stand_in
+        sys.modules["tank.platform.qt"] = qt_stand_in
+
+
+if importlib.util.find_spec("sgtk") is None:
+    _install_toolkit_stand_ins()
+
+
+def load_engine_module(name, relative_path):
+    """
+    Imports a module of the engine from its path, without going through the
+    package it belongs to, which needs a running application.
+    """
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(ENGINE_ROOT, relative_path)
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def startup_module():
+    """
+    The launcher module, startup.py.
+    """
+    return load_engine_module("tk_substancedesigner_startup", "startup.py")
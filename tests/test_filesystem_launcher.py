@@ -0,0 +1,203 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tests of the launcher behind 'Jump to File System', using a stand-in opener
+command instead of the file browser of the OS.
+"""
+
+import os
+import sys
+import time
+import threading
+
+import pytest
+
+from conftest import load_engine_module
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+from tank.platform.qt import QtCore
+
+# without a Qt binding QtCore is a stand-in with no event loop, see conftest
+requires_qt = pytest.mark.skipif(
+    not hasattr(QtCore, "QCoreApplication"), reason="Needs PySide2 or PySide6."
+)
+
+# seconds to wait for the launcher to do its work
+TIMEOUT = 10.0
+
+
+@pytest.fixture(scope="module")
+def filesystem_launcher():
+    return load_engine_module(
+        "tk_substancedesigner_filesystem_launcher",
+        os.path.join("python", "tk_substancedesigner", "filesystem_launcher.py"),
+    )
+
+
+@pytest.fixture(scope="module")
+def application():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+class RecordingLogger(object):
+    def __init__(self):
+        self.errors = []
+        self.threads = []
+
+    def error(self, msg, *args):
+        self.errors.append(msg % args)
+        self.threads.append(threading.current_thread())
+
+
+def wait_for(condition):
+    """
+    Processes the events of the main thread until the condition is met.
+    """
+    deadline = time.time() + TIMEOUT
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("Timed out waiting for the launcher.")
+        QtCore.QCoreApplication.processEvents()
+        time.sleep(0.01)
+
+
+def opener(record_folder):
+    """
+    Returns a stand-in for the file browser command line, that records the
+    folders it was asked to open in the given folder.
+    """
+    counter = [0]
+
+    def get_args(path):
+        counter[0] += 1
+        record_path = os.path.join(str(record_folder), "opened_%s" % counter[0])
+        script = "import sys; open(sys.argv[1], 'w').write(sys.argv[2])"
+        return [sys.executable, "-c", script, record_path, path]
+
+    return get_args
+
+
+def opened_folders(record_folder):
+    folders = []
+    for filename in sorted(os.listdir(str(record_folder))):
+        with open(os.path.join(str(record_folder), filename)) as record:
+            folders.append(record.read())
+    return folders
+
+
+@requires_qt
+def test_folders_opened(filesystem_launcher, application, tmp_path_factory):
+    records = tmp_path_factory.mktemp("records")
+    first = tmp_path_factory.mktemp("first")
+    second = tmp_path_factory.mktemp("second")
+    logger = RecordingLogger()
+    launcher = filesystem_launcher.FileSystemLauncher(logger, opener(records))
+
+    # the same folder twice is only opened once
+    launcher.open([str(first), str(second), str(first)])
+
+    wait_for(lambda: len(os.listdir(str(records))) == 2)
+    # give a chance to any extra process to show up
+    time.sleep(0.5)
+    assert sorted(opened_folders(records)) == sorted([str(first), str(second)])
+    assert logger.errors == []
+
+
+def test_open_returns_right_away(filesystem_launcher, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        filesystem_launcher, "stat_with_timeout", lambda path: time.sleep(1.0)
+    )
+    launcher = filesystem_launcher.FileSystemLauncher(
+        RecordingLogger(), opener(tmp_path)
+    )
+
+    start = time.time()
+    launcher.open([str(tmp_path)])
+    assert time.time() - start < 0.5
+
+
+@requires_qt
+def test_missing_folder_reported(filesystem_launcher, application, tmp_path):
+    records = tmp_path / "records"
+    records.mkdir()
+    missing = tmp_path / "missing"
+    logger = RecordingLogger()
+    launcher = filesystem_launcher.FileSystemLauncher(logger, opener(records))
+
+    launcher.open([str(missing)])
+
+    wait_for(lambda: logger.errors)
+    assert str(missing) in logger.errors[0]
+    assert "does not exist or is not reachable" in logger.errors[0]
+    assert os.listdir(str(records)) == []
+
+
+def test_repeated_folders_skipped(filesystem_launcher, tmp_path):
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    opened = []
+    launcher = filesystem_launcher.FileSystemLauncher(RecordingLogger())
+    launcher._start_detached = lambda args: opened.append(args)
+
+    # the same folder through another path is only opened once too
+    launcher._open(
+        [
+            str(first),
+            str(second),
+            str(first),
+            os.path.join(str(second), os.pardir, "first"),
+        ]
+    )
+
+    assert opened == [
+        filesystem_launcher.get_file_browser_args(str(first)),
+        filesystem_launcher.get_file_browser_args(str(second)),
+    ]
+
+
+def test_stat_with_timeout(filesystem_launcher, tmp_path):
+    assert filesystem_launcher.stat_with_timeout(str(tmp_path)) == os.path.realpath(
+        str(tmp_path)
+    )
+    assert filesystem_launcher.stat_with_timeout(str(tmp_path / "missing")) is None
+
+
+def test_unreachable_folder_times_out(filesystem_launcher, tmp_path, monkeypatch):
+    def hanging_realpath(path):
+        time.sleep(5.0)
+        return path
+
+    monkeypatch.setattr(filesystem_launcher.os.path, "realpath", hanging_realpath)
+
+    start = time.time()
+    assert filesystem_launcher.stat_with_timeout(str(tmp_path), timeout=0.2) is None
+    assert time.time() - start < 2.0
+
+
+@requires_qt
+def test_failing_opener_reported(filesystem_launcher, application, tmp_path):
+    logger = RecordingLogger()
+    launcher = filesystem_launcher.FileSystemLauncher(
+        logger, lambda path: [str(tmp_path / "no-such-opener"), path]
+    )
+
+    launcher.open([str(tmp_path)])
+
+    wait_for(lambda: logger.errors)
+    assert logger.errors[0].startswith("Jump to File System | Failed to open")
+    assert str(tmp_path) in logger.errors[0]
+    # reported through the queued signal, in the main thread
+    assert logger.threads == [threading.main_thread()]
@@ -0,0 +1,227 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tests of the discovery of Substance Designer installations, run against fake
+installation trees.
+"""
+
+import os
+import sys
+import time
+import plistlib
+
+import pytest
+
+__author__ = "Diego Garcia Huerta"
+__contact__ = "https://www.linkedin.com/in/diegogh/"
+
+
+EXECUTABLE_NAME = "Substance Designer"
+
+needs_symlinks = pytest.mark.skipif(
+    sys.platform == "win32", reason="symlinks need privileges on Windows"
+)
+
+
+@pytest.fixture
+def platform(startup_module, monkeypatch):
+    """
+    Pretends to run on the given platform, linux by default.
+    """
+
+    def set_platform(name="linux"):
+        util = startup_module.sgtk.util
+        monkeypatch.setattr(util, "is_windows", lambda: name == "windows")
+        monkeypatch.setattr(util, "is_macos", lambda: name == "macos")
+        monkeypatch.setattr(util, "is_linux", lambda: name == "linux")
+
+    set_platform()
+    return set_platform
+
+
+@pytest.fixture
+def launcher(startup_module, platform, tmp_path_factory, monkeypatch):
+    """
+    A launcher whose software cache lives in its own temp folder, so writing
+    it does not change the installation folders.
+    """
+    cache_path = str(tmp_path_factory.mktemp("cache") / "software_cache.json")
+    monkeypatch.setattr(
+        startup_module.SoftwareCache, "get_default_path", lambda: cache_path
+    )
+    monkeypatch.delenv(startup_module.SOFTWARE_CACHE_ENV, raising=False)
+    return startup_module.SubstanceDesignerLauncher()
+
+
+def make_install(root, folder, version_file=None, version=None):
+    """
+    Creates a fake linux installation, returning the path to its executable.
+    """
+    install_folder = os.path.join(str(root), folder)
+    os.makedirs(install_folder)
+    executable_path = os.path.join(install_folder, EXECUTABLE_NAME)
+    open(executable_path, "w").close()
+
+    if version_file:
+        version_path = os.path.join(install_folder, version_file)
+        if not os.path.isdir(os.path.dirname(version_path)):
+            os.makedirs(os.path.dirname(version_path))
+        with open(version_path, "w") as version_handle:
+            version_handle.write("Substance Designer %s\n" % version)
+
+    return executable_path
+
+
+def set_templates(launcher, *templates):
+    launcher.EXECUTABLE_TEMPLATES = {"linux2": [str(t) for t in templates]}
+
+
+def found_versions(launcher):
+    return [
+        (os.path.basename(os.path.dirname(sw.path)), sw.version)
+        for sw in launcher.scan_software()
+    ]
+
+
+@pytest.mark.parametrize(
+    "version_file", ["version.txt", "VERSION", "resources/version.txt"]
+)
+def test_version_from_version_file(startup_module, platform, tmp_path, version_file):
+    executable = make_install(tmp_path, "install", version_file, "10.1.2")
+    assert startup_module.get_executable_version(executable) == "10.1.2"
+
+
+def test_version_file_takes_precedence_over_folder_name(
+    startup_module, platform, tmp_path
+):
+    executable = make_install(tmp_path, "Designer-2019.3", "version.txt", "10.1.2")
+    assert startup_module.get_executable_version(executable) == "10.1.2"
+
+
+def test_version_from_folder_name(startup_module, platform, tmp_path):
+    executable = make_install(tmp_path, "Substance_Designer-2019.3.2")
+    assert startup_module.get_executable_version(executable) == "2019.3.2"
+
+
+def test_version_unknown(startup_module, platform, tmp_path):
+    executable = make_install(tmp_path, "Substance_Designer")
+    assert startup_module.get_executable_version(executable) == " "
+
+
+@needs_symlinks
+def test_version_read_from_the_linked_installation(startup_module, platform, tmp_path):
+    make_install(tmp_path, "Substance_Designer-10.1", "version.txt", "10.1.3")
+    link = tmp_path / "current"
+    os.symlink(str(tmp_path / "Substance_Designer-10.1"), str(link))
+
+    executable = os.path.join(str(link), EXECUTABLE_NAME)
+    assert startup_module.get_executable_version(executable) == "10.1.3"
+
+
+def test_version_from_macos_bundle(startup_module, platform, tmp_path):
+    platform("macos")
+    bundle = tmp_path / "Substance Designer.app"
+    (bundle / "Contents").mkdir(parents=True)
+    with open(str(bundle / "Contents" / "Info.plist"), "wb") as plist_file:
+        plistlib.dump(
+            {"CFBundleShortVersionString": "11.2.1", "CFBundleVersion": "4915"},
+            plist_file,
+        )
+
+    assert startup_module.get_executable_version(str(bundle)) == "11.2.1"
+
+
+def test_all_installations_found(launcher, tmp_path):
+    make_install(tmp_path, "Substance_Designer-10.1", "version.txt", "10.1.3")
+    make_install(tmp_path, "Substance_Designer-11.2")
+    make_install(tmp_path, "Substance_Designer-empty")
+    os.remove(os.path.join(str(tmp_path), "Substance_Designer-empty", EXECUTABLE_NAME))
+    set_templates(
+        launcher,
+        os.path.join(
+            str(tmp_path), "Substance_Designer{install_suffix}", EXECUTABLE_NAME
+        ),
+    )
+
+    assert found_versions(launcher) == [
+        ("Substance_Designer-10.1", "10.1.3"),
+        ("Substance_Designer-11.2", "11.2"),
+    ]
+
+
+@needs_symlinks
+def test_installations_deduplicated_by_real_path(launcher, tmp_path):
+    opt = tmp_path / "opt"
+    usr = tmp_path / "usr"
+    opt.mkdir()
+    usr.mkdir()
+    make_install(opt, "Substance_Designer-10.1", "version.txt", "10.1.3")
+    make_install(usr, "Substance_Designer-11.2")
+    os.symlink(
+        str(opt / "Substance_Designer-10.1"), str(usr / "Substance_Designer-10.1")
+    )
+    set_templates(
+        launcher,
+        os.path.join(str(usr), "Substance_Designer{install_suffix}", EXECUTABLE_NAME),
+        os.path.join(str(opt), "Substance_Designer{install_suffix}", EXECUTABLE_NAME),
+    )
+
+    software = launcher.scan_software()
+    assert sorted(sw.version for sw in software) == ["10.1.3", "11.2"]
+
+
+def test_environment_template_ignored_when_unset(launcher, tmp_path, monkeypatch):
+    monkeypatch.delenv("SUBSTANCEDESIGNER_BIN", raising=False)
+    make_install(tmp_path, "Substance_Designer-11.2")
+    set_templates(
+        launcher,
+        "$SUBSTANCEDESIGNER_BIN",
+        os.path.join(
+            str(tmp_path), "Substance_Designer{install_suffix}", EXECUTABLE_NAME
+        ),
+    )
+
+    assert found_versions(launcher) == [("Substance_Designer-11.2", "11.2")]
+
+
+def test_cached_installations_reused(launcher, tmp_path, monkeypatch):
+    make_install(tmp_path, "Substance_Designer-11.2")
+    set_templates(
+        launcher,
+        os.path.join(
+            str(tmp_path), "Substance_Designer{install_suffix}", EXECUTABLE_NAME
+        ),
+    )
+    assert found_versions(launcher) == [("Substance_Designer-11.2", "11.2")]
+
+    def fail(*args):
+        raise AssertionError("The file system was searched again.")
+
+    monkeypatch.setattr(launcher, "_scan_template", fail)
+    assert found_versions(launcher) == [("Substance_Designer-11.2", "11.2")]
+
+
+def test_install_into_existing_folder_found(launcher, tmp_path):
+    install_folder = tmp_path / "Substance_Designer-11.2"
+    install_folder.mkdir()
+    set_templates(
+        launcher,
+        os.path.join(
+            str(tmp_path), "Substance_Designer{install_suffix}", EXECUTABLE_NAME
+        ),
+    )
+    assert found_versions(launcher) == []
+
+    # make sure the folder modification time changes
+    time.sleep(0.01)
+    open(str(install_folder / EXECUTABLE_NAME), "w").close()
+
+    assert found_versions(launcher) == [("Substance_Designer-11.2", "11.2")]